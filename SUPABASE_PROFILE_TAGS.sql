@@ -0,0 +1,42 @@
+-- AI role and interest tags back-filled from profile free text
+-- (written by backend/scripts/backfill_profile_tags.py)
+ALTER TABLE public.landing_student ADD COLUMN IF NOT EXISTS ai_role TEXT NULL;
+ALTER TABLE public.landing_student ADD COLUMN IF NOT EXISTS ai_tags TEXT[] NULL;
+ALTER TABLE public.landing_student ADD COLUMN IF NOT EXISTS ai_tagged_at TIMESTAMP WITH TIME ZONE NULL;
+
+ALTER TABLE public.landing_founders ADD COLUMN IF NOT EXISTS ai_role TEXT NULL;
+ALTER TABLE public.landing_founders ADD COLUMN IF NOT EXISTS ai_tags TEXT[] NULL;
+ALTER TABLE public.landing_founders ADD COLUMN IF NOT EXISTS ai_tagged_at TIMESTAMP WITH TIME ZONE NULL;
+
+ALTER TABLE public.landing_mentors ADD COLUMN IF NOT EXISTS ai_role TEXT NULL;
+ALTER TABLE public.landing_mentors ADD COLUMN IF NOT EXISTS ai_tags TEXT[] NULL;
+ALTER TABLE public.landing_mentors ADD COLUMN IF NOT EXISTS ai_tagged_at TIMESTAMP WITH TIME ZONE NULL;
+
+-- Keyset indexes for the back-fill scan (WHERE user_id > last ORDER BY user_id)
+CREATE INDEX IF NOT EXISTS idx_landing_student_user_id ON public.landing_student(user_id);
+CREATE INDEX IF NOT EXISTS idx_landing_founders_user_id ON public.landing_founders(user_id);
+CREATE INDEX IF NOT EXISTS idx_landing_mentors_user_id ON public.landing_mentors(user_id);
+
+-- Bulk update: one call applies a batch of {user_id, ai_role, ai_tags} rows to one table
+CREATE OR REPLACE FUNCTION apply_profile_tags(target TEXT, tags JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    updated INTEGER;
+BEGIN
+    IF target NOT IN ('landing_student', 'landing_founders', 'landing_mentors') THEN
+        RAISE EXCEPTION 'apply_profile_tags: unsupported table %', target;
+    END IF;
+    EXECUTE format(
+        'UPDATE public.%I AS t
+            SET ai_role = x.ai_role, ai_tags = x.ai_tags, ai_tagged_at = now()
+           FROM jsonb_to_recordset($1) AS x(user_id TEXT, ai_role TEXT, ai_tags TEXT[])
+          WHERE t.user_id = x.user_id',
+        target
+    ) USING tags;
+    GET DIAGNOSTICS updated = ROW_COUNT;
+    RETURN updated;
+END;
+$$ LANGUAGE plpgsql SECURITY INVOKER;
+
+-- Only the backend (service role) runs the back-fill
+REVOKE ALL ON FUNCTION apply_profile_tags(TEXT, JSONB) FROM PUBLIC, anon, authenticated;
@@ -8,6 +8,10 @@ CREATE TABLE IF NOT EXISTS public.user_sessions (
     ip_address TEXT NULL,
     user_agent TEXT NULL,
     device_info TEXT NULL,
+    browser SMALLINT NULL,
+    os SMALLINT NULL,
+    device_class SMALLINT NULL,
+    device_fingerprint TEXT NULL,
     is_active BOOLEAN NOT NULL DEFAULT true,
     created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
     updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
@@ -21,6 +25,18 @@ CREATE INDEX IF NOT EXISTS idx_user_sessions_user_id ON public.user_sessions(use
 CREATE INDEX IF NOT EXISTS idx_user_sessions_active ON public.user_sessions(is_active);
 CREATE INDEX IF NOT EXISTS idx_user_sessions_login_time ON public.user_sessions(login_time);
 
+-- Compact device columns (codes defined in backend/app/core/user_agent.py) for existing tables
+ALTER TABLE public.user_sessions ADD COLUMN IF NOT EXISTS browser SMALLINT NULL;
+ALTER TABLE public.user_sessions ADD COLUMN IF NOT EXISTS os SMALLINT NULL;
+ALTER TABLE public.user_sessions ADD COLUMN IF NOT EXISTS device_class SMALLINT NULL;
+ALTER TABLE public.user_sessions ADD COLUMN IF NOT EXISTS device_fingerprint TEXT NULL;
+
+-- Per-device grouping for "active sessions" screens
+CREATE INDEX IF NOT EXISTS idx_user_sessions_device ON public.user_sessions(user_id, device_fingerprint) WHERE is_active;
+
+-- Keyset index for paginated session history (ORDER BY login_time DESC, id DESC per user)
+CREATE INDEX IF NOT EXISTS idx_user_sessions_user_history ON public.user_sessions(user_id, login_time DESC, id DESC);
+
 -- Enable Row Level Security (RLS)
 ALTER TABLE public.user_sessions ENABLE ROW LEVEL SECURITY;
 
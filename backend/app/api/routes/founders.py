@@ -3,12 +3,15 @@ from app.schemas.founder import FounderCreate, FounderUpdate, FounderResponse
 from app.services.founder_service import founder_service
 from app.core.auth import get_current_user
 from app.schemas.user import TokenData
+from app.core.performance import ResponseCodec
 from typing import List
 import uuid
 from datetime import datetime
 
 router = APIRouter()
 
+founder_codec = ResponseCodec(FounderResponse)
+
 @router.post("/", response_model=FounderResponse)
 async def create_founder(founder_data: FounderCreate):
     """Create a new founder record"""
@@ -30,7 +33,7 @@ async def create_founder(founder_data: FounderCreate):
                 detail="Failed to create founder record"
             )
         
-        return FounderResponse(**created_founder)
+        return founder_codec.response(created_founder)
         
     except Exception as e:
         raise HTTPException(
@@ -50,7 +53,7 @@ async def get_founder(user_id: str):
                 detail="Founder not found"
             )
         
-        return FounderResponse(**founder)
+        return founder_codec.response(founder)
         
     except Exception as e:
         raise HTTPException(
@@ -82,7 +85,7 @@ async def update_founder(
                 detail="Founder not found"
             )
         
-        return FounderResponse(**updated_founder)
+        return founder_codec.response(updated_founder)
         
     except Exception as e:
         raise HTTPException(
@@ -95,7 +98,7 @@ async def get_all_founders():
     """Get all founders"""
     try:
         founders = await founder_service.get_all_founders()
-        return [FounderResponse(**founder) for founder in founders]
+        return founder_codec.list_response(founders)
         
     except Exception as e:
         raise HTTPException(
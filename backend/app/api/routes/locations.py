@@ -1,42 +1,45 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Dict, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from typing import List, Dict
+import asyncio
+from app.core.auth import require_admin_token
+from app.core.performance import precomputed_json_response
 from app.services.location_service import location_service
 
 router = APIRouter(tags=["locations"])
 
+# Countries, states, cities, popular cities and the hierarchy are pre-encoded at load
+# time by LocationService and served as raw bytes with a data-version ETag. A reload
+# swaps in new data (and so a new ETag) without restarting the worker.
+
 @router.get("/countries", response_model=List[str])
-async def get_countries():
+async def get_countries(request: Request):
     """Get all available countries"""
     try:
-        countries = await location_service.get_countries()
-        return countries
+        return precomputed_json_response(request, location_service.get_response("countries"))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch countries: {str(e)}")
 
 @router.get("/states", response_model=List[str])
-async def get_states(country: str = Query(..., description="Country name")):
+async def get_states(request: Request, country: str = Query(..., description="Country name")):
     """Get states for a specific country"""
     try:
-        states = await location_service.get_states(country)
-        return states
+        return precomputed_json_response(request, location_service.get_response("states", country))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch states: {str(e)}")
 
 @router.get("/cities", response_model=List[str])
-async def get_cities(state: str = Query(..., description="State name")):
+async def get_cities(request: Request, state: str = Query(..., description="State name")):
     """Get cities for a specific state"""
     try:
-        cities = await location_service.get_cities(state)
-        return cities
+        return precomputed_json_response(request, location_service.get_response("cities", state))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch cities: {str(e)}")
 
 @router.get("/popular-cities", response_model=List[str])
-async def get_popular_cities():
+async def get_popular_cities(request: Request):
     """Get popular cities for quick selection"""
     try:
-        cities = await location_service.get_popular_cities()
-        return cities
+        return precomputed_json_response(request, location_service.get_response("popular-cities"))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch popular cities: {str(e)}")
 
@@ -52,11 +55,48 @@ async def search_locations(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to search locations: {str(e)}")
 
+@router.get("/nearby", response_model=List[Dict])
+async def get_nearby_locations(
+    lat: float = Query(..., description="Latitude", ge=-90, le=90),
+    lon: float = Query(..., description="Longitude", ge=-180, le=180),
+    radius_km: float = Query(50, description="Search radius in kilometres", gt=0, le=500),
+    limit: int = Query(10, description="Maximum number of results", ge=1, le=50)
+):
+    """Get cities within radius_km of a point, nearest first"""
+    try:
+        return await location_service.nearby_locations(lat, lon, radius_km, limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to find nearby locations: {str(e)}")
+
+@router.get("/reverse-geocode", response_model=Dict)
+async def reverse_geocode(
+    lat: float = Query(..., description="Latitude", ge=-90, le=90),
+    lon: float = Query(..., description="Longitude", ge=-180, le=180),
+    max_distance_km: float = Query(100, description="Give up beyond this distance", gt=0, le=500)
+):
+    """Get the nearest city to a point"""
+    try:
+        city = await location_service.reverse_geocode(lat, lon, max_distance_km)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to reverse geocode: {str(e)}")
+    if city is None:
+        raise HTTPException(status_code=404, detail=f"No city within {max_distance_km:g} km")
+    return city
+
 @router.get("/hierarchy", response_model=Dict)
-async def get_location_hierarchy():
+async def get_location_hierarchy(request: Request):
     """Get the complete location hierarchy (for admin use)"""
     try:
-        hierarchy = await location_service.get_location_hierarchy()
-        return hierarchy
+        return precomputed_json_response(request, location_service.get_response("hierarchy"))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to fetch location hierarchy: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Failed to fetch location hierarchy: {str(e)}")
+
+@router.post("/reload", response_model=Dict, dependencies=[Depends(require_admin_token)])
+async def reload_locations():
+    """Reload location data from disk (admin use). Only reloads the worker handling the request;
+    set LOCATION_RELOAD_INTERVAL to have every worker pick up file changes."""
+    # Indexes are rebuilt in a worker thread; requests keep being served from the old data until the swap
+    result = await asyncio.get_running_loop().run_in_executor(None, location_service.reload)
+    if not result["success"]:
+        raise HTTPException(status_code=500, detail=f"Failed to reload locations: {result['error']}")
+    return result
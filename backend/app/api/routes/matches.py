@@ -0,0 +1,125 @@
+from fastapi import APIRouter, HTTPException, Query, status
+from pydantic import BaseModel
+from typing import List, Optional
+from app.services.matching_service import matching_service
+from app.services.opportunity_service import opportunity_service
+
+router = APIRouter()
+
+class MentorMatch(BaseModel):
+    user_id: str
+    name: Optional[str] = None
+    organisation: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    incubator_type: Optional[str] = None
+    focus_areas: Optional[List[str]] = None
+    preferred_startup_stage: Optional[List[str]] = None
+    linkedin: Optional[str] = None
+    url: Optional[str] = None
+    score: float
+    shared_sectors: List[str]
+    stage_match: bool
+    program_match: bool
+    same_city: bool
+    same_state: bool
+
+class FounderMatchesResponse(BaseModel):
+    founder_id: str
+    matches: List[MentorMatch]
+    mentors_scored: int
+    took_ms: float
+
+class StartupMatch(BaseModel):
+    user_id: str
+    name: Optional[str] = None
+    startup_name: Optional[str] = None
+    startup_status: Optional[str] = None
+    startup_url: Optional[str] = None
+    category: Optional[List[str]] = None
+    help_needed: Optional[List[str]] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    score: float
+    shared_opportunities: List[str]
+    shared_functions: List[str]
+    same_city: bool
+
+class StudentStartupsResponse(BaseModel):
+    student_id: str
+    matches: List[StartupMatch]
+    startups_indexed: int
+    took_ms: float
+
+class StudentMatch(BaseModel):
+    user_id: str
+    name: Optional[str] = None
+    college: Optional[str] = None
+    course: Optional[str] = None
+    year: Optional[int] = None
+    city: Optional[str] = None
+    career_goals: Optional[List[str]] = None
+    interest_area: Optional[List[str]] = None
+    availability: Optional[str] = None
+    payment_terms: Optional[str] = None
+    location_preference: Optional[str] = None
+    score: float
+    shared_opportunities: List[str]
+    shared_functions: List[str]
+    same_city: bool
+
+class FounderStudentsResponse(BaseModel):
+    founder_id: str
+    matches: List[StudentMatch]
+    students_indexed: int
+    took_ms: float
+
+@router.get("/founder/{user_id}", response_model=FounderMatchesResponse)
+async def match_founder(user_id: str, limit: int = Query(10, ge=1, le=100)):
+    """
+    Mentors for a founder, best first: shared sectors (category vs focus areas),
+    stage fit, programme fit for the help they need, and same city/state.
+    """
+    try:
+        result = await matching_service.match_founder(user_id, limit)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to match founder: {str(e)}"
+        )
+    if not result["success"]:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=result["error"])
+    return result
+
+@router.get("/student/{user_id}/startups", response_model=StudentStartupsResponse)
+async def match_student_startups(user_id: str, limit: int = Query(10, ge=1, le=100)):
+    """
+    Startups for a student, best first. Startups that offer none of the
+    opportunity types the student wants, can't pay a paid-only student, or are
+    in another city for an on-site-only student are filtered out; the rest
+    rank by shared functions, shared opportunity types and same city.
+    """
+    try:
+        result = await opportunity_service.startups_for_student(user_id, limit)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to match student: {str(e)}"
+        )
+    if not result["success"]:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=result["error"])
+    return result
+
+@router.get("/founder/{user_id}/students", response_model=FounderStudentsResponse)
+async def match_founder_students(user_id: str, limit: int = Query(10, ge=1, le=100)):
+    """Students for a founder's startup, best first, with the same filters and ranking"""
+    try:
+        result = await opportunity_service.students_for_founder(user_id, limit)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to match founder: {str(e)}"
+        )
+    if not result["success"]:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=result["error"])
+    return result
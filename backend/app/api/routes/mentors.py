@@ -3,12 +3,15 @@ from app.schemas.mentor import MentorCreate, MentorUpdate, MentorResponse
 from app.services.mentor_service import mentor_service
 from app.core.auth import get_current_user
 from app.schemas.user import TokenData
+from app.core.performance import ResponseCodec
 from typing import List
 from datetime import datetime
 from pydantic import ValidationError
 
 router = APIRouter()
 
+mentor_codec = ResponseCodec(MentorResponse)
+
 @router.post("/", response_model=MentorResponse)
 async def create_mentor(mentor_data: MentorCreate):
     """Create a new mentor record"""
@@ -19,10 +22,6 @@ async def create_mentor(mentor_data: MentorCreate):
         mentor_dict = mentor_data.model_dump(exclude_unset=True)
         mentor_dict["created_at"] = datetime.utcnow().isoformat()
         
-        # Ensure phone is a string
-        if 'phone' in mentor_dict and mentor_dict['phone'] is not None:
-            mentor_dict['phone'] = str(mentor_dict['phone'])
-        
         print(f"📝 Prepared mentor dict: {mentor_dict}")
         
         # Create mentor record
@@ -34,11 +33,7 @@ async def create_mentor(mentor_data: MentorCreate):
                 detail="Failed to create mentor record"
             )
         
-        # Ensure phone is string in response
-        if created_mentor.get('phone') is not None:
-            created_mentor['phone'] = str(created_mentor['phone'])
-        
-        return MentorResponse(**created_mentor)
+        return mentor_codec.response(created_mentor)
         
     except ValidationError as e:
         print(f"❌ Validation error: {e}")
@@ -67,7 +62,7 @@ async def get_mentor(user_id: str):
                 detail="Mentor not found"
             )
         
-        return MentorResponse(**mentor)
+        return mentor_codec.response(mentor)
         
     except Exception as e:
         raise HTTPException(
@@ -99,7 +94,7 @@ async def update_mentor(
                 detail="Mentor not found"
             )
         
-        return MentorResponse(**updated_mentor)
+        return mentor_codec.response(updated_mentor)
         
     except Exception as e:
         raise HTTPException(
@@ -112,7 +107,7 @@ async def get_all_mentors():
     """Get all mentors"""
     try:
         mentors = await mentor_service.get_all_mentors()
-        return [MentorResponse(**mentor) for mentor in mentors]
+        return mentor_codec.list_response(mentors)
         
     except Exception as e:
         raise HTTPException(
@@ -0,0 +1,38 @@
+from fastapi import APIRouter, HTTPException, Query, status
+from pydantic import BaseModel
+from typing import List, Literal, Optional
+from app.services.search_service import search_service
+
+router = APIRouter()
+
+class SearchHit(BaseModel):
+    type: str
+    user_id: str
+    name: str
+    title: str
+    score: float
+
+class SearchResults(BaseModel):
+    query: str
+    results: List[SearchHit]
+    docs_indexed: int
+    took_ms: float
+
+@router.get("", response_model=SearchResults)
+async def search_profiles(
+    q: str = Query(..., min_length=1, max_length=200),
+    type: Optional[Literal["founder", "mentor", "student", "working_professional"]] = None,
+    limit: int = Query(20, ge=1, le=100)
+):
+    """
+    Profiles ranked by BM25 for any of the query words: founder startup name,
+    elevator pitch and description, mentor organisation, student college and
+    course, working professional role and company. `type` limits the kind.
+    """
+    try:
+        return await search_service.search(q, limit, type)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to search: {str(e)}"
+        )
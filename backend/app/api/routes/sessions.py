@@ -1,6 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, Header
-from typing import Dict, Any, Optional
-from app.services.session_service import session_service
+from fastapi import APIRouter, Depends, HTTPException, Request, Header, Query
+from fastapi.responses import StreamingResponse
+from typing import Dict, Any, List, Optional
+import json
+from datetime import datetime
+from app.services.session_service import (
+    session_service, MAX_HISTORY_PAGE_SIZE, history_select_columns
+)
 from app.services.user_profile_service import user_profile_service
 from app.core.auth import verify_firebase_token
 
@@ -60,8 +65,7 @@ async def create_session_auto(request: Request, user_data: Dict[str, Any] = Depe
         result = session_service.create_session(
             user_id=user_id,
             ip_address=client_ip,
-            user_agent=user_agent,
-            device_info=f"IP: {client_ip}, User-Agent: {user_agent}"
+            user_agent=user_agent
         )
         
         if result["success"]:
@@ -95,8 +99,7 @@ async def login_session(request: Request, user_data: Dict[str, Any] = Depends(ge
         result = session_service.create_session(
             user_id=user_id,
             ip_address=client_ip,
-            user_agent=user_agent,
-            device_info=f"IP: {client_ip}, User-Agent: {user_agent}"
+            user_agent=user_agent
         )
         
         if result["success"]:
@@ -160,30 +163,111 @@ async def get_active_sessions(user_data: Dict[str, Any] = Depends(get_firebase_u
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _parse_columns(columns: Optional[str]) -> Optional[List[str]]:
+    """Split a comma-separated ?columns= value"""
+    if not columns:
+        return None
+    return [c.strip() for c in columns.split(",") if c.strip()]
+
+def _parse_time(value: Optional[str], name: str) -> Optional[str]:
+    """Validate an ISO 8601 ?start_time=/?end_time= value before it reaches the query"""
+    if value is None:
+        return None
+    try:
+        return datetime.fromisoformat(value).isoformat()
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {name}: expected an ISO 8601 timestamp")
+
 @router.get("/history")
-async def get_session_history(user_data: Dict[str, Any] = Depends(get_firebase_user_data)):
+async def get_session_history(
+    user_data: Dict[str, Any] = Depends(get_firebase_user_data),
+    limit: int = Query(10, ge=1, le=MAX_HISTORY_PAGE_SIZE, description="Page size"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    start_time: Optional[str] = Query(None, description="Only sessions with login_time >= this ISO timestamp"),
+    end_time: Optional[str] = Query(None, description="Only sessions with login_time < this ISO timestamp"),
+    ip_address: Optional[str] = Query(None, description="Only sessions from this IP"),
+    is_active: Optional[bool] = Query(None, description="Filter on active/inactive sessions"),
+    columns: Optional[str] = Query(None, description="Comma-separated list of columns to return")
+):
     """
-    Get session history for the current user
+    Get a page of session history for the current user
     """
     try:
         user_id = user_data.get("uid")
         if not user_id:
             raise HTTPException(status_code=400, detail="User ID not found in token")
         
-        result = session_service.get_session_history(user_id)
+        try:
+            result = session_service.get_session_history(
+                user_id,
+                limit=limit,
+                cursor=cursor,
+                start_time=_parse_time(start_time, "start_time"),
+                end_time=_parse_time(end_time, "end_time"),
+                ip_address=ip_address,
+                is_active=is_active,
+                columns=_parse_columns(columns)
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
         if result["success"]:
             return {
                 "success": True,
                 "sessions": result["sessions"],
-                "count": len(result["sessions"])
+                "count": len(result["sessions"]),
+                "next_cursor": result["next_cursor"]
             }
         else:
             raise HTTPException(status_code=500, detail=result["error"])
             
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/history/export")
+async def export_session_history(
+    user_data: Dict[str, Any] = Depends(get_firebase_user_data),
+    start_time: Optional[str] = Query(None, description="Only sessions with login_time >= this ISO timestamp"),
+    end_time: Optional[str] = Query(None, description="Only sessions with login_time < this ISO timestamp"),
+    ip_address: Optional[str] = Query(None, description="Only sessions from this IP"),
+    is_active: Optional[bool] = Query(None, description="Filter on active/inactive sessions"),
+    columns: Optional[str] = Query(None, description="Comma-separated list of columns to return")
+):
+    """
+    Stream the full session history for the current user as NDJSON
+    """
+    user_id = user_data.get("uid")
+    if not user_id:
+        raise HTTPException(status_code=400, detail="User ID not found in token")
+    
+    # Validate the filters and projection up front; errors after streaming starts can't change the status code
+    start_time = _parse_time(start_time, "start_time")
+    end_time = _parse_time(end_time, "end_time")
+    selected = _parse_columns(columns)
+    try:
+        history_select_columns(selected)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    def generate():
+        for session in session_service.iter_session_history(
+            user_id,
+            start_time=start_time,
+            end_time=end_time,
+            ip_address=ip_address,
+            is_active=is_active,
+            columns=selected
+        ):
+            yield json.dumps(session, default=str) + "\n"
+    
+    return StreamingResponse(
+        generate(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="session-history.ndjson"'}
+    )
+
 @router.post("/logout-all")
 async def logout_all_sessions(user_data: Dict[str, Any] = Depends(get_firebase_user_data)):
     """
@@ -3,12 +3,15 @@ from app.schemas.student import StudentCreate, StudentUpdate, StudentResponse
 from app.services.student_service import student_service
 from app.core.auth import get_current_user
 from app.schemas.user import TokenData
+from app.core.performance import ResponseCodec
 from typing import List, Dict, Any
 import uuid
 from datetime import datetime
 
 router = APIRouter()
 
+student_codec = ResponseCodec(StudentResponse)
+
 @router.post("/", response_model=StudentResponse)
 async def create_student(student_data: StudentCreate):
     """Create a new student record"""
@@ -23,16 +26,6 @@ async def create_student(student_data: StudentCreate):
         student_dict["user_id"] = user_id
         student_dict["created_at"] = datetime.utcnow().isoformat()
         
-        # Convert phone to bigint if it's a string (required by the database schema)
-        if isinstance(student_dict.get("phone"), str):
-            try:
-                student_dict["phone"] = int(student_dict["phone"])
-            except ValueError:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Phone number must be a valid integer"
-                )
-        
         print(f"Prepared student dict: {student_dict}")
         
         # Create student record
@@ -44,7 +37,7 @@ async def create_student(student_data: StudentCreate):
                 detail="Failed to create student record"
             )
         
-        return StudentResponse(**created_student)
+        return student_codec.response(created_student)
         
     except Exception as e:
         raise HTTPException(
@@ -64,7 +57,7 @@ async def get_student(user_id: str):
                 detail="Student not found"
             )
         
-        return StudentResponse(**student)
+        return student_codec.response(student)
         
     except Exception as e:
         raise HTTPException(
@@ -96,7 +89,7 @@ async def update_student(
                 detail="Student not found"
             )
         
-        return StudentResponse(**updated_student)
+        return student_codec.response(updated_student)
         
     except Exception as e:
         raise HTTPException(
@@ -145,7 +138,7 @@ async def get_all_students():
     """Get all students"""
     try:
         students = await student_service.get_all_students()
-        return [StudentResponse(**student) for student in students]
+        return student_codec.list_response(students)
         
     except Exception as e:
         raise HTTPException(
@@ -1,13 +1,17 @@
-from fastapi import APIRouter, HTTPException, status, Depends
-from app.schemas.vendor import VendorCreate, VendorUpdate, VendorResponse
+from fastapi import APIRouter, HTTPException, Query, status, Depends
+from app.schemas.vendor import VendorCreate, VendorUpdate, VendorResponse, VendorSearchResponse
 from app.services.vendor_service import vendor_service
+from app.services.vendor_search_service import vendor_search_service
 from app.core.auth import get_current_user
 from app.schemas.user import TokenData
-from typing import List
+from app.core.performance import ResponseCodec
+from typing import List, Optional
 from datetime import datetime
 
 router = APIRouter()
 
+vendor_codec = ResponseCodec(VendorResponse)
+
 @router.post("/", response_model=VendorResponse)
 async def create_vendor(vendor_data: VendorCreate):
     """Create a new vendor record"""
@@ -25,7 +29,7 @@ async def create_vendor(vendor_data: VendorCreate):
                 detail="Failed to create vendor record"
             )
         
-        return VendorResponse(**created_vendor)
+        return vendor_codec.response(created_vendor)
         
     except Exception as e:
         raise HTTPException(
@@ -33,6 +37,29 @@ async def create_vendor(vendor_data: VendorCreate):
             detail=f"Failed to create vendor: {str(e)}"
         )
 
+@router.get("/search", response_model=VendorSearchResponse)
+async def search_vendors(
+    category: List[str] = Query([]),
+    location: List[str] = Query([]),
+    team_size: List[str] = Query([]),
+    min_years: Optional[int] = Query(None, ge=0),
+    max_years: Optional[int] = Query(None, ge=0),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100)
+):
+    """
+    Vendors matching any selected value of each filter (repeat a parameter to
+    select several) and every filter given, newest first, one page at a time,
+    with counts for each category, location and team size.
+    """
+    try:
+        return await vendor_search_service.search(category, location, team_size, min_years, max_years, offset, limit)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to search vendors: {str(e)}"
+        )
+
 @router.get("/{user_id}", response_model=VendorResponse)
 async def get_vendor(user_id: str):
     """Get vendor by user_id"""
@@ -45,7 +72,7 @@ async def get_vendor(user_id: str):
                 detail="Vendor not found"
             )
         
-        return VendorResponse(**vendor)
+        return vendor_codec.response(vendor)
         
     except Exception as e:
         raise HTTPException(
@@ -77,7 +104,7 @@ async def update_vendor(
                 detail="Vendor not found"
             )
         
-        return VendorResponse(**updated_vendor)
+        return vendor_codec.response(updated_vendor)
         
     except Exception as e:
         raise HTTPException(
@@ -90,7 +117,7 @@ async def get_all_vendors():
     """Get all vendors"""
     try:
         vendors = await vendor_service.get_all_vendors()
-        return [VendorResponse(**vendor) for vendor in vendors]
+        return vendor_codec.list_response(vendors)
         
     except Exception as e:
         raise HTTPException(
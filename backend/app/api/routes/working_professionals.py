@@ -3,12 +3,15 @@ from app.schemas.working_professional import WorkingProfessionalCreate, WorkingP
 from app.services.working_professional_service import working_professional_service
 from app.core.auth import get_current_user
 from app.schemas.user import TokenData
+from app.core.performance import ResponseCodec
 from typing import List
 from datetime import datetime
 from pydantic import ValidationError
 
 router = APIRouter()
 
+working_professional_codec = ResponseCodec(WorkingProfessionalResponse)
+
 @router.post("/", response_model=WorkingProfessionalResponse)
 async def create_working_professional(professional_data: WorkingProfessionalCreate):
     """Create a new working professional record"""
@@ -19,10 +22,6 @@ async def create_working_professional(professional_data: WorkingProfessionalCrea
         professional_dict = professional_data.model_dump(exclude_unset=True)
         professional_dict["created_at"] = datetime.utcnow().isoformat()
         
-        # Ensure phone is a string
-        if 'phone' in professional_dict and professional_dict['phone'] is not None:
-            professional_dict['phone'] = str(professional_dict['phone'])
-        
         print(f"📝 Prepared professional dict: {professional_dict}")
         
         # Create working professional record
@@ -34,11 +33,7 @@ async def create_working_professional(professional_data: WorkingProfessionalCrea
                 detail="Failed to create working professional record"
             )
         
-        # Ensure phone is string in response
-        if created_professional.get('phone') is not None:
-            created_professional['phone'] = str(created_professional['phone'])
-        
-        return WorkingProfessionalResponse(**created_professional)
+        return working_professional_codec.response(created_professional)
         
     except ValidationError as e:
         print(f"❌ Validation error: {e}")
@@ -67,7 +62,7 @@ async def get_working_professional(user_id: str):
                 detail="Working professional not found"
             )
         
-        return WorkingProfessionalResponse(**professional)
+        return working_professional_codec.response(professional)
         
     except Exception as e:
         raise HTTPException(
@@ -99,7 +94,7 @@ async def update_working_professional(
                 detail="Working professional not found"
             )
         
-        return WorkingProfessionalResponse(**updated_professional)
+        return working_professional_codec.response(updated_professional)
         
     except Exception as e:
         raise HTTPException(
@@ -112,7 +107,7 @@ async def get_all_working_professionals():
     """Get all working professionals"""
     try:
         professionals = await working_professional_service.get_all_working_professionals()
-        return [WorkingProfessionalResponse(**professional) for professional in professionals]
+        return working_professional_codec.list_response(professionals)
         
     except Exception as e:
         raise HTTPException(
@@ -2,12 +2,13 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.core.config import settings
 from app.schemas.user import TokenData
-import firebase_admin
-from firebase_admin import auth, credentials
+import hmac
+import os
+import threading
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -15,30 +16,58 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 # JWT token security
 security = HTTPBearer()
 
-# Initialize Firebase Admin SDK
-try:
-    print(f"Initializing Firebase Admin SDK...")
-    print(f"Service account key path: {settings.FIREBASE_SERVICE_ACCOUNT_KEY}")
-    
-    # Check if file exists
-    import os
-    if not os.path.exists(settings.FIREBASE_SERVICE_ACCOUNT_KEY):
-        print(f"ERROR: Firebase service account key file not found at {settings.FIREBASE_SERVICE_ACCOUNT_KEY}")
-        raise FileNotFoundError(f"Firebase service account key file not found")
-    
-    print(f"Firebase service account key file exists")
-    cred = credentials.Certificate(settings.FIREBASE_SERVICE_ACCOUNT_KEY)
-    print(f"Firebase credentials loaded successfully")
-    
-    firebase_admin.initialize_app(cred)
-    print(f"Firebase Admin SDK initialized successfully")
-    
-except Exception as e:
-    print(f"Firebase Admin SDK initialization error: {e}")
-    print(f"Error type: {type(e)}")
-    print(f"Error class: {e.__class__.__name__}")
-    # For development, we'll handle this gracefully
-    pass
+_firebase_lock = threading.Lock()
+_firebase_ready: Optional[bool] = None
+
+def init_firebase() -> bool:
+    """
+    Initialize the Firebase Admin SDK once, on first token verification or
+    during the startup warm-up rather than at import. True if it is ready.
+    """
+    global _firebase_ready
+    if _firebase_ready is not None:
+        return _firebase_ready
+    with _firebase_lock:
+        if _firebase_ready is None:
+            try:
+                import firebase_admin
+                from firebase_admin import credentials
+                
+                if not os.path.exists(settings.FIREBASE_SERVICE_ACCOUNT_KEY):
+                    raise FileNotFoundError(f"Firebase service account key file not found at {settings.FIREBASE_SERVICE_ACCOUNT_KEY}")
+                try:
+                    firebase_admin.get_app()
+                except ValueError:
+                    firebase_admin.initialize_app(credentials.Certificate(settings.FIREBASE_SERVICE_ACCOUNT_KEY))
+                print("Firebase Admin SDK initialized successfully")
+                _firebase_ready = True
+            except Exception as e:
+                # For development, token verification fails and everything else works
+                print(f"Firebase Admin SDK initialization error ({e.__class__.__name__}): {e}")
+                _firebase_ready = False
+    return _firebase_ready
+
+def prefetch_firebase_keys() -> int:
+    """
+    Fetch the public keys ID tokens are signed with into the SDK's own HTTP
+    cache, so the first verify_id_token does not wait on Google. Returns the
+    number of keys; 0 when Firebase is not configured.
+    """
+    if not init_firebase():
+        return 0
+    from firebase_admin import auth, _token_gen
+    from google.oauth2 import id_token
+
+    # The verifier auth.verify_id_token uses, and the request object whose cache it reads
+    verifier = auth._get_client(None)._token_verifier
+    return len(id_token._fetch_certs(verifier.request, _token_gen.ID_TOKEN_CERT_URI))
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None)):
+    """Dependency for admin endpoints: the X-Admin-Token header must match LOCATION_ADMIN_TOKEN"""
+    if not settings.LOCATION_ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, settings.LOCATION_ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
@@ -55,16 +84,14 @@ def verify_firebase_token(token: str) -> Optional[Dict[str, Any]]:
     print(f"Token type: {type(token)}")
     
     # Check if Firebase Admin SDK is initialized
-    try:
-        # Try to get the default app
-        app = firebase_admin.get_app()
-        print(f"Firebase Admin SDK is initialized")
-    except ValueError:
+    if not init_firebase():
         print(f"ERROR: Firebase Admin SDK is not initialized")
         print(f"Firebase token verification will fail")
         return None
     
     try:
+        from firebase_admin import auth
+        
         # Verify the token with Firebase Admin SDK
         print(f"Calling auth.verify_id_token...")
         decoded_token = auth.verify_id_token(token)
@@ -11,6 +11,34 @@ class Settings:
     PORT: int = 8000
     DEBUG: bool = True
     
+    # Production server (gunicorn.conf.py); SERVER_WORKERS 0 means one worker per CPU
+    SERVER_WORKERS: int = int(os.getenv("SERVER_WORKERS", os.getenv("WEB_CONCURRENCY", "0")))
+    # Pending connections the kernel queues per listening socket while workers are busy
+    SERVER_BACKLOG: int = int(os.getenv("SERVER_BACKLOG", "2048"))
+    # Idle keep-alive seconds; keep it above the idle timeout of the proxy or load balancer in front
+    SERVER_KEEPALIVE: int = int(os.getenv("SERVER_KEEPALIVE", "65"))
+    # Connections plus in-flight requests per worker before new ones get 503 (0 disables)
+    SERVER_LIMIT_CONCURRENCY: int = int(os.getenv("SERVER_LIMIT_CONCURRENCY", "1000"))
+    # Requests after which a worker is replaced (plus up to the jitter, so they do not all restart together)
+    SERVER_MAX_REQUESTS: int = int(os.getenv("SERVER_MAX_REQUESTS", "20000"))
+    SERVER_MAX_REQUESTS_JITTER: int = int(os.getenv("SERVER_MAX_REQUESTS_JITTER", "2000"))
+    # Seconds a stopping worker gets to finish in-flight requests before it is killed
+    SERVER_GRACEFUL_TIMEOUT: int = int(os.getenv("SERVER_GRACEFUL_TIMEOUT", "30"))
+    # Seconds without a heartbeat before gunicorn kills and replaces a stuck worker
+    SERVER_TIMEOUT: int = int(os.getenv("SERVER_TIMEOUT", "60"))
+    
+    # /readyz: dependencies are probed in the background every HEALTH_PROBE_INTERVAL seconds, each
+    # bounded by HEALTH_PROBE_TIMEOUT; a result older than HEALTH_CACHE_TTL reports not ready
+    HEALTH_PROBE_INTERVAL: float = float(os.getenv("HEALTH_PROBE_INTERVAL", "5"))
+    HEALTH_PROBE_TIMEOUT: float = float(os.getenv("HEALTH_PROBE_TIMEOUT", "2"))
+    HEALTH_CACHE_TTL: float = float(os.getenv("HEALTH_CACHE_TTL", "15"))
+    # Dependencies that make the worker not ready when configured but down (supabase, firebase, openai)
+    HEALTH_REQUIRED: str = os.getenv("HEALTH_REQUIRED", "supabase,firebase")
+    # Lifespan warm-up (clients, signing keys, indexes, hot list pages): the worker starts serving after
+    # at most WARMUP_TIMEOUT seconds, and /readyz stays 503 until every step has finished
+    WARMUP_ENABLED: bool = os.getenv("WARMUP_ENABLED", "true").lower() in ("1", "true", "yes")
+    WARMUP_TIMEOUT: float = float(os.getenv("WARMUP_TIMEOUT", "10"))
+    
     # Security
     SECRET_KEY: str = os.getenv("SECRET_KEY", "3N1pDveoc2uR2oZJmD/mnTlNq8Xk2YkUReVkzQxq+aY=")
     ALGORITHM: str = "HS256"
@@ -29,5 +57,39 @@ class Settings:
     SUPABASE_URL: str = os.getenv("SUPABASE_URL", "https://recomfgqqgmebqwoybdk.supabase.co")
     SUPABASE_ANON_KEY: str = os.getenv("SUPABASE_ANON_KEY")
     SUPABASE_SERVICE_ROLE_KEY: str = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+    
+    # Location data (the compiled store from scripts/build_location_db.py is used when present)
+    LOCATION_DATA_PATH: str = os.getenv("LOCATION_DATA_PATH", os.path.join(os.path.dirname(__file__), "..", "data", "locations.json"))
+    LOCATION_DB_PATH: str = os.getenv("LOCATION_DB_PATH", os.path.join(os.path.dirname(__file__), "..", "data", "locations.db"))
+    # Seconds between checks for changed location files (0 disables)
+    LOCATION_RELOAD_INTERVAL: float = float(os.getenv("LOCATION_RELOAD_INTERVAL", "0"))
+    # X-Admin-Token for admin endpoints (POST /api/locations/reload, GET /api/ai-search/stats); unset disables them
+    LOCATION_ADMIN_TOKEN: Optional[str] = os.getenv("LOCATION_ADMIN_TOKEN")
+    
+    # OpenAI (AI search); OPENAI_BASE_URL points the client at any OpenAI-compatible server
+    OPENAI_API_KEY: Optional[str] = os.getenv("OPENAI_API_KEY")
+    OPENAI_BASE_URL: Optional[str] = os.getenv("OPENAI_BASE_URL")
+    AI_SEARCH_MODEL: str = os.getenv("AI_SEARCH_MODEL", "gpt-3.5-turbo")
+    # Hard deadline per classification (queueing included) before falling back to the default role
+    AI_SEARCH_TIMEOUT: float = float(os.getenv("AI_SEARCH_TIMEOUT", "3.0"))
+    # Concurrent upstream calls per worker; also the size of the connection pool
+    AI_SEARCH_MAX_CONCURRENCY: int = int(os.getenv("AI_SEARCH_MAX_CONCURRENCY", "16"))
+    # Requests allowed to queue for a slot; beyond this they get the fallback role immediately
+    AI_SEARCH_MAX_QUEUE: int = int(os.getenv("AI_SEARCH_MAX_QUEUE", "64"))
+    # Classification cache: entries, seconds before a hit is refreshed, and near-duplicate cosine threshold (>1 disables)
+    AI_CACHE_SIZE: int = int(os.getenv("AI_CACHE_SIZE", "10000"))
+    AI_CACHE_TTL: float = float(os.getenv("AI_CACHE_TTL", "86400"))
+    AI_CACHE_SIMILARITY: float = float(os.getenv("AI_CACHE_SIMILARITY", "0.88"))
+    # Local role classifier answering confident inputs without OpenAI (scripts/train_role_classifier.py)
+    AI_CLASSIFIER_PATH: str = os.getenv("AI_CLASSIFIER_PATH", os.path.join(os.path.dirname(__file__), "..", "data", "role_classifier.json"))
+    AI_CLASSIFIER_THRESHOLD: float = float(os.getenv("AI_CLASSIFIER_THRESHOLD", "0.75"))
+    # Optional JSONL log of OpenAI-labelled inputs, used as extra training data
+    AI_SEARCH_LOG_PATH: Optional[str] = os.getenv("AI_SEARCH_LOG_PATH")
+    
+    # Seconds between background rebuilds of the in-memory matching indexes from the tables
+    # (picks up writes made through other workers; 0 disables)
+    MATCHING_REFRESH_INTERVAL: float = float(os.getenv("MATCHING_REFRESH_INTERVAL", "300"))
+    # Full-text search index (/api/search), saved after every rebuild and loaded on startup (empty disables)
+    SEARCH_SNAPSHOT_PATH: str = os.getenv("SEARCH_SNAPSHOT_PATH", os.path.join(os.path.dirname(__file__), "..", "data", "search_index.npz"))
 
 settings = Settings() 
\ No newline at end of file
@@ -0,0 +1,151 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+import orjson
+from fastapi.responses import Response
+
+from app.core.auth import init_firebase
+from app.core.config import settings
+from app.core.startup import warm_up_complete
+from app.services.ai_search_service import ai_search_service
+from app.services.supabase_service import supabase_service
+
+# Public keys Firebase ID tokens are signed with; verify_firebase_token needs them
+FIREBASE_CERTS_URL = "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+
+OK = "ok"
+DISABLED = "disabled"  # not configured here; the app runs without it (mock data, no auth, local AI fallback)
+DOWN = "down"
+
+_LIVE_BODY = orjson.dumps({"status": "alive"})
+_WARMING_UP_BODY = orjson.dumps({"status": "warming_up"})
+
+class HealthMonitor:
+    """
+    Dependency checks for /readyz, run by a background task every
+    HEALTH_PROBE_INTERVAL seconds rather than per request. Each round's result
+    is encoded once; the probe endpoints return those bytes. A result older
+    than HEALTH_CACHE_TTL (the prober stalled or was never started), or a
+    lifespan warm-up still running, reads as not ready.
+    """
+
+    def __init__(self):
+        self._probes: List[Tuple[str, Callable[[], Awaitable[Dict]]]] = [
+            ("supabase", self._probe_supabase),
+            ("firebase", self._probe_firebase),
+            ("openai", self._probe_openai),
+        ]
+        self._required = {name.strip() for name in settings.HEALTH_REQUIRED.split(",") if name.strip()}
+        self._task: Optional[asyncio.Task] = None
+        self._http: Optional[httpx.AsyncClient] = None
+        # A blocking probe that outlived its timeout keeps running in its thread; never start a second one
+        self._pending: Dict[str, asyncio.Future] = {}
+        self.checks: Dict[str, Dict] = {}
+        self.ready = False
+        self._checked_at = 0.0
+        self._body = orjson.dumps({"status": "starting", "checks": {}})
+
+    async def _in_thread(self, name: str, fn: Callable[[], Any]) -> Any:
+        pending = self._pending.get(name)
+        if pending is None or pending.done():
+            pending = self._pending[name] = asyncio.ensure_future(asyncio.to_thread(fn))
+        return await asyncio.wait_for(asyncio.shield(pending), settings.HEALTH_PROBE_TIMEOUT)
+
+    async def _probe_supabase(self) -> Dict:
+        if not settings.SUPABASE_SERVICE_ROLE_KEY:
+            return {"status": DISABLED}
+        client = await self._in_thread("supabase_client", lambda: supabase_service.supabase)
+        if client is None:
+            return {"status": DOWN, "error": "client could not be created"}
+        await self._in_thread("supabase", lambda: client.table("landing_page_user_profiles").select("id").limit(1).execute())
+        return {"status": OK}
+
+    async def _probe_firebase(self) -> Dict:
+        if not await self._in_thread("firebase_init", init_firebase):
+            return {"status": DISABLED}
+        response = await self._http.get(FIREBASE_CERTS_URL)
+        response.raise_for_status()
+        return {"status": OK, "keys": len(response.json())}
+
+    async def _probe_openai(self) -> Dict:
+        # Configuration only: a request to OpenAI per probe would cost money and rate limit
+        if not settings.OPENAI_API_KEY:
+            return {"status": DISABLED, "model": settings.AI_SEARCH_MODEL}
+        await self._in_thread("openai", ai_search_service.warm_up)
+        return {"status": OK, "model": settings.AI_SEARCH_MODEL, "base_url": settings.OPENAI_BASE_URL}
+
+    async def _run(self, name: str, probe: Callable[[], Awaitable[Dict]]) -> Dict:
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(probe(), settings.HEALTH_PROBE_TIMEOUT)
+        except asyncio.TimeoutError:
+            result = {"status": DOWN, "error": f"timed out after {settings.HEALTH_PROBE_TIMEOUT}s"}
+        except Exception as e:
+            result = {"status": DOWN, "error": f"{e.__class__.__name__}: {e}"}
+        result["latency_ms"] = round((time.perf_counter() - start) * 1e3, 2)
+        result["required"] = name in self._required
+        return result
+
+    async def check(self) -> Dict[str, Dict]:
+        """Run every probe concurrently and publish the result"""
+        if self._http is None:
+            self._http = httpx.AsyncClient(timeout=settings.HEALTH_PROBE_TIMEOUT)
+        results = await asyncio.gather(*(self._run(name, probe) for name, probe in self._probes))
+        checks = dict(zip((name for name, _ in self._probes), results))
+        ready = all(check["status"] != DOWN for check in checks.values() if check["required"])
+        for name, check in checks.items():
+            previous = self.checks.get(name, {}).get("status")
+            if previous is not None and previous != check["status"]:
+                print(f"Health: {name} {previous} -> {check['status']} {check.get('error') or ''}")
+        self._body = orjson.dumps({
+            "status": "ready" if ready else "not_ready",
+            "checked_at": datetime.now(timezone.utc).isoformat(),
+            "checks": checks,
+        })
+        self.checks, self.ready, self._checked_at = checks, ready, time.monotonic()
+        return checks
+
+    async def _loop(self):
+        while True:
+            try:
+                await self.check()
+            except Exception as e:
+                print(f"Health check round failed: {e}")
+            await asyncio.sleep(settings.HEALTH_PROBE_INTERVAL)
+
+    def start(self):
+        """Start probing in the background; call from the lifespan"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    def liveness(self) -> Response:
+        """The worker's event loop is answering; dependencies are not consulted"""
+        return Response(content=_LIVE_BODY, media_type="application/json")
+
+    def readiness(self) -> Response:
+        """The last probe round, as encoded when it finished: 200 when ready, else 503"""
+        if not warm_up_complete():
+            return Response(content=_WARMING_UP_BODY, status_code=503, media_type="application/json")
+        age = time.monotonic() - self._checked_at
+        if self._checked_at and age > settings.HEALTH_CACHE_TTL:
+            body = orjson.dumps({"status": "stale", "age_seconds": round(age, 1), "checks": self.checks})
+            return Response(content=body, status_code=503, media_type="application/json")
+        return Response(content=self._body, status_code=200 if self.ready and self._checked_at else 503,
+                        media_type="application/json")
+
+health_monitor = HealthMonitor()
@@ -1,7 +1,13 @@
 import time
 import functools
-from typing import Callable, Any
+import typing
+import gzip
+from decimal import Decimal
+from typing import Callable, Any, Dict, Iterable, List, NamedTuple, Optional, Type
+import orjson
 from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, EmailStr, TypeAdapter, create_model
 from starlette.middleware.base import BaseHTTPMiddleware
 import logging
 
@@ -104,4 +110,151 @@ class ResponseOptimizer:
         """Add caching headers to response"""
         response.headers["Cache-Control"] = f"public, max-age={max_age}"
         response.headers["ETag"] = f'"{hash(str(response.body))}"'
-        return response 
\ No newline at end of file
+        return response 
+
+def _orjson_default(obj: Any) -> Any:
+    """Types orjson does not serialise itself (it already handles datetime, date, UUID, Enum and dataclasses)"""
+    if isinstance(obj, BaseModel):
+        # JSON mode, so URLs, bytes and custom serialisers come out exactly as response_model would give them
+        return obj.model_dump(mode="json")
+    if isinstance(obj, Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+def orjson_dumps(content: Any) -> bytes:
+    """Compact UTF-8 JSON, as the API sends it (UTC datetimes end in Z, as Pydantic writes them)"""
+    return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+
+class ORJSONResponse(JSONResponse):
+    """
+    Default response class (see app/main.py): JSON rendered by orjson instead
+    of the stdlib encoder. FastAPI still runs response_model serialisation or
+    jsonable_encoder on a route's return value before it gets here, so the
+    saving is in rendering only. Datetimes, UUIDs and Pydantic models are
+    handled too, for responses a route builds itself with ORJSONResponse(content).
+    """
+    media_type = "application/json"
+    
+    def render(self, content: Any) -> bytes:
+        return orjson_dumps(content)
+
+def _trusted_annotation(annotation: Any) -> Any:
+    """annotation with EmailStr replaced by str, including inside Optional"""
+    if annotation is EmailStr:
+        return str
+    if typing.get_origin(annotation) is typing.Union and EmailStr in typing.get_args(annotation):
+        return typing.Union[tuple(str if arg is EmailStr else arg for arg in typing.get_args(annotation))]
+    return annotation
+
+def trusted_row_model(model: Type[BaseModel]) -> Type[BaseModel]:
+    """
+    Subclass of a response schema for rows read back from our own tables.
+    Email columns were validated by the Create/Update schemas on the way in,
+    and email-validator costs ~100us a value, more than the rest of a row, so
+    they are read as plain str. The JSON is identical.
+    """
+    overrides = {}
+    for name, field in model.model_fields.items():
+        annotation = _trusted_annotation(field.annotation)
+        if annotation is not field.annotation:
+            overrides[name] = (annotation, field)
+    if not overrides:
+        return model
+    return create_model(f"{model.__name__}Row", __base__=model, **overrides)
+
+class ResponseCodec:
+    """
+    Database rows to a response body with one validation pass.
+
+    Returning `Model(**row)` from a route with `response_model=Model` runs
+    every row through Pydantic twice: once building the instance, again when
+    FastAPI validates the return value against response_model. Rows read from
+    our own tables are validated once here, against trusted_row_model(model),
+    by precompiled TypeAdapters and serialised by pydantic-core straight to
+    JSON bytes; FastAPI returns a Response as-is, so nothing is validated
+    again. Keep response_model on the route for the OpenAPI schema.
+    """
+
+    def __init__(self, model: Type[BaseModel]):
+        self.model = model
+        row_model = trusted_row_model(model)
+        self._one = TypeAdapter(row_model)
+        self._many = TypeAdapter(List[row_model])
+
+    def validate(self, row: Dict) -> BaseModel:
+        return self._one.validate_python(row)
+
+    def validate_many(self, rows: Iterable[Dict]) -> List[BaseModel]:
+        return self._many.validate_python(rows)
+
+    def response(self, row: Dict) -> Response:
+        """One row as a JSON response; raises pydantic.ValidationError if it does not fit the schema"""
+        body = self._one.dump_json(self._one.validate_python(row))
+        return Response(content=body, media_type="application/json")
+
+    def list_response(self, rows: Iterable[Dict]) -> Response:
+        """Rows as a JSON array response; raises pydantic.ValidationError if any does not fit the schema"""
+        body = self._many.dump_json(self._many.validate_python(rows))
+        return Response(content=body, media_type="application/json")
+
+# Bodies smaller than this are not worth a precompressed copy
+PRECOMPRESS_MIN_BYTES = 1024
+
+class PrecomputedJSON(NamedTuple):
+    """A JSON response body encoded (and optionally gzipped) once, ahead of any request"""
+    body: bytes
+    gzip_body: Optional[bytes]
+    etag: str
+
+    @classmethod
+    def encode(cls, data: Any, etag: str, compress: bool = True) -> "PrecomputedJSON":
+        body = orjson_dumps(data)
+        gzip_body = None
+        if compress and len(body) >= PRECOMPRESS_MIN_BYTES:
+            gzip_body = gzip.compress(body, compresslevel=9, mtime=0)
+        return cls(body, gzip_body, etag)
+
+    @property
+    def gzip_etag(self) -> str:
+        """The gzip body's own strong validator: the identity ETag with a -gz suffix inside the quotes"""
+        return f'{self.etag[:-1]}-gz"' if self.etag.endswith('"') else f"{self.etag}-gz"
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip: listed (or covered by *) with a q-value above 0"""
+    wildcard = None
+    for coding in accept_encoding.split(","):
+        name, _, params = coding.partition(";")
+        name = name.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name in ("gzip", "x-gzip"):
+            return q > 0
+        if name == "*":
+            wildcard = q > 0
+    return bool(wildcard)
+
+def precomputed_json_response(request: Request, cached: PrecomputedJSON, max_age: int = 300) -> Response:
+    """Serve a PrecomputedJSON, honouring If-None-Match and Accept-Encoding: gzip"""
+    gzipped = cached.gzip_body is not None and _accepts_gzip(request.headers.get("accept-encoding", ""))
+    headers = {"ETag": cached.gzip_etag if gzipped else cached.etag, "Cache-Control": f"public, max-age={max_age}"}
+    if cached.gzip_body is not None:
+        headers["Vary"] = "Accept-Encoding"
+
+    # Either variant's tag revalidates: both stand for the same data version
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or
+                          {cached.etag, cached.gzip_etag} & {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}):
+        return Response(status_code=304, headers=headers)
+
+    if gzipped:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=cached.gzip_body, media_type="application/json", headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
@@ -0,0 +1,19 @@
+from uvicorn.workers import UvicornWorker
+
+from app.core.config import settings
+
+class ProductionWorker(UvicornWorker):
+    """
+    Gunicorn worker class for gunicorn.conf.py. UvicornWorker passes backlog,
+    keep-alive and max_requests through from gunicorn; this adds what it does
+    not: uvloop and httptools when installed ("auto" falls back to asyncio
+    and h11), a per-worker concurrency limit, and a bound on how long a
+    stopping worker waits for in-flight requests.
+    """
+    CONFIG_KWARGS = {
+        "loop": "auto",
+        "http": "auto",
+        "limit_concurrency": settings.SERVER_LIMIT_CONCURRENCY or None,
+        # A little under gunicorn's graceful_timeout, so the worker exits on its own rather than being killed
+        "timeout_graceful_shutdown": max(1, settings.SERVER_GRACEFUL_TIMEOUT - 2),
+    }
@@ -0,0 +1,84 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, Optional, Set
+
+# Where this worker's startup time goes: module imports, then the warm-up steps in
+# the lifespan hook (see app/main.py). benchmarks/bench_startup.py breaks the
+# imports down per module.
+_timings: Dict[str, Any] = {"import_seconds": None, "warm_up_seconds": None, "steps": {}, "background": {}}
+# Foreground steps still running after the warm-up's time bound; readiness waits for them
+_unfinished: Set[asyncio.Task] = set()
+
+def record_imports(started: float):
+    """Call at the end of app.main with the perf_counter() taken at its top"""
+    _timings["import_seconds"] = round(time.perf_counter() - started, 4)
+
+async def warm_up(steps: Dict[str, Callable[[], Any]], background: bool = False,
+                  timeout: Optional[float] = None) -> Dict[str, Dict]:
+    """
+    Run initialisers concurrently, timing each: coroutine functions on the
+    event loop, blocking ones in worker threads. A failing step is reported
+    and skipped, never raised: what it would have initialised is created on
+    first use instead. background=True is for steps run as a task once the
+    worker is already serving.
+
+    With a timeout, returns after at most that many seconds; steps still
+    running carry on, and warm_up_complete() is False until they finish.
+    """
+    group = "background" if background else "steps"
+
+    async def run(name: str, step: Callable[[], Any]) -> Dict:
+        start = time.perf_counter()
+        error: Optional[str] = None
+        try:
+            if asyncio.iscoroutinefunction(step):
+                await step()
+            else:
+                await asyncio.to_thread(step)
+        except Exception as e:
+            error = str(e)
+            print(f"Warm-up step {name} failed: {e}")
+        result = {"seconds": round(time.perf_counter() - start, 4), "error": error}
+        _timings[group][name] = result
+        return result
+
+    start = time.perf_counter()
+    tasks = {name: asyncio.create_task(run(name, step)) for name, step in steps.items()}
+    done, pending = await asyncio.wait(tasks.values(), timeout=timeout) if tasks else (set(), set())
+    elapsed = time.perf_counter() - start
+    results = {name: task.result() for name, task in tasks.items() if task in done}
+    breakdown = ", ".join(f"{name} {result['seconds']:.2f}s" for name, result in results.items())
+    if pending:
+        late = [name for name, task in tasks.items() if task in pending]
+        breakdown += f"; still running after {timeout:g}s: {', '.join(late)}"
+        if not background:
+            _unfinished.update(pending)
+            for task in pending:
+                task.add_done_callback(_unfinished.discard)
+    if background:
+        print(f"Background warm-up {elapsed:.2f}s ({breakdown})")
+    else:
+        _timings["warm_up_seconds"] = round(elapsed, 4)
+        print(f"Startup: imports {_timings['import_seconds'] or 0:.2f}s, warm-up {elapsed:.2f}s ({breakdown})")
+    return results
+
+def warm_up_complete() -> bool:
+    """False while foreground warm-up steps that outlived the time bound are still running"""
+    return not _unfinished
+
+async def cancel_warm_up():
+    """Stop unfinished warm-up steps (on shutdown); steps in worker threads run to completion"""
+    for task in list(_unfinished):
+        task.cancel()
+    await asyncio.gather(*_unfinished, return_exceptions=True)
+    _unfinished.clear()
+
+def startup_report() -> Dict[str, Any]:
+    """Import and warm-up timings for this worker, in seconds"""
+    return {
+        "import_seconds": _timings["import_seconds"],
+        "warm_up_seconds": _timings["warm_up_seconds"],
+        "steps": dict(_timings["steps"]),
+        "background": dict(_timings["background"]),
+        "complete": warm_up_complete(),
+    }
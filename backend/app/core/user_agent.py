@@ -0,0 +1,140 @@
+import hashlib
+import re
+from enum import IntEnum
+from functools import lru_cache
+from typing import Optional, Dict, Any, NamedTuple
+
+class Browser(IntEnum):
+    UNKNOWN = 0
+    CHROME = 1
+    SAFARI = 2
+    FIREFOX = 3
+    EDGE = 4
+    OPERA = 5
+    SAMSUNG = 6
+    IE = 7
+
+class OperatingSystem(IntEnum):
+    UNKNOWN = 0
+    WINDOWS = 1
+    MACOS = 2
+    IOS = 3
+    ANDROID = 4
+    LINUX = 5
+    CHROME_OS = 6
+
+class DeviceClass(IntEnum):
+    UNKNOWN = 0
+    DESKTOP = 1
+    MOBILE = 2
+    TABLET = 3
+    BOT = 4
+
+class DeviceInfo(NamedTuple):
+    browser: Browser
+    browser_version: Optional[int]
+    os: OperatingSystem
+    device_class: DeviceClass
+    fingerprint: str
+
+    def to_row(self) -> Dict[str, Any]:
+        """Columns stored on user_sessions"""
+        return {
+            "browser": int(self.browser),
+            "os": int(self.os),
+            "device_class": int(self.device_class),
+            "device_fingerprint": self.fingerprint
+        }
+
+    def label(self) -> str:
+        """Human readable label for session screens, e.g. 'Chrome on Windows'"""
+        return f"{_BROWSER_LABELS[self.browser]} on {_OS_LABELS[self.os]}"
+
+_BROWSER_LABELS = {
+    Browser.UNKNOWN: "Unknown browser", Browser.CHROME: "Chrome", Browser.SAFARI: "Safari",
+    Browser.FIREFOX: "Firefox", Browser.EDGE: "Edge", Browser.OPERA: "Opera",
+    Browser.SAMSUNG: "Samsung Internet", Browser.IE: "Internet Explorer",
+}
+
+_OS_LABELS = {
+    OperatingSystem.UNKNOWN: "unknown OS", OperatingSystem.WINDOWS: "Windows",
+    OperatingSystem.MACOS: "macOS", OperatingSystem.IOS: "iOS", OperatingSystem.ANDROID: "Android",
+    OperatingSystem.LINUX: "Linux", OperatingSystem.CHROME_OS: "ChromeOS",
+}
+
+# Order matters: Edge, Opera and Samsung Internet all also advertise "Chrome/" and "Safari/"
+_BROWSER_PATTERNS = (
+    (Browser.EDGE, re.compile(r"Edg(?:e|A|iOS)?/(\d+)")),
+    (Browser.OPERA, re.compile(r"(?:OPR|Opera)/(\d+)")),
+    (Browser.SAMSUNG, re.compile(r"SamsungBrowser/(\d+)")),
+    (Browser.FIREFOX, re.compile(r"(?:Firefox|FxiOS)/(\d+)")),
+    (Browser.CHROME, re.compile(r"(?:Chrome|CriOS)/(\d+)")),
+    (Browser.SAFARI, re.compile(r"Version/(\d+)[\d.]* (?:Mobile/\S+ )?Safari/")),
+    (Browser.IE, re.compile(r"(?:MSIE |Trident/.*rv:)(\d+)")),
+)
+
+_OS_PATTERNS = (
+    (OperatingSystem.IOS, re.compile(r"iPhone|iPad|iPod")),
+    (OperatingSystem.ANDROID, re.compile(r"Android")),
+    (OperatingSystem.CHROME_OS, re.compile(r"CrOS")),
+    (OperatingSystem.WINDOWS, re.compile(r"Windows")),
+    (OperatingSystem.MACOS, re.compile(r"Macintosh|Mac OS X")),
+    (OperatingSystem.LINUX, re.compile(r"Linux|X11")),
+)
+
+_BOT_PATTERN = re.compile(r"bot|crawl|spider|slurp|curl/|wget/|python-requests|httpx", re.IGNORECASE)
+
+# The platform token, e.g. "(Linux; Android 14; SM-S918B)", and the version numbers inside it
+_PLATFORM_PATTERN = re.compile(r"\(([^)]*)\)")
+_VERSION_PATTERN = re.compile(r"\d+(?:[._]\d+)+|(?<=Android )\d+")
+
+USER_AGENT_CACHE_SIZE = 4096
+
+def _fingerprint(browser: Browser, os: OperatingSystem, device_class: DeviceClass, user_agent: str = "") -> str:
+    """
+    Stable 64-bit hash of browser family, OS, device class and the UA's
+    platform token with version numbers stripped (architecture, device model),
+    so browser and OS updates keep the same fingerprint.
+    """
+    platform = _PLATFORM_PATTERN.search(user_agent)
+    detail = _VERSION_PATTERN.sub("", platform.group(1)) if platform else ""
+    key = f"{int(browser)}:{int(os)}:{int(device_class)}:{detail}".encode("utf-8")
+    return hashlib.blake2b(key, digest_size=8).hexdigest()
+
+@lru_cache(maxsize=USER_AGENT_CACHE_SIZE)
+def parse_user_agent(user_agent: Optional[str]) -> DeviceInfo:
+    """
+    Parse a User-Agent header into enum-coded browser, OS and device class.
+
+    Real traffic comes from a small set of distinct UA strings, so results are
+    kept in an LRU cache keyed by the raw header.
+    """
+    if not user_agent:
+        return DeviceInfo(Browser.UNKNOWN, None, OperatingSystem.UNKNOWN, DeviceClass.UNKNOWN,
+                          _fingerprint(Browser.UNKNOWN, OperatingSystem.UNKNOWN, DeviceClass.UNKNOWN))
+
+    browser, version = Browser.UNKNOWN, None
+    for candidate, pattern in _BROWSER_PATTERNS:
+        match = pattern.search(user_agent)
+        if match:
+            browser, version = candidate, int(match.group(1))
+            break
+
+    os = OperatingSystem.UNKNOWN
+    for candidate, pattern in _OS_PATTERNS:
+        if pattern.search(user_agent):
+            os = candidate
+            break
+
+    if _BOT_PATTERN.search(user_agent):
+        device_class = DeviceClass.BOT
+    elif "iPad" in user_agent or "Tablet" in user_agent or (os == OperatingSystem.ANDROID and "Mobile" not in user_agent):
+        device_class = DeviceClass.TABLET
+    elif "Mobi" in user_agent or os == OperatingSystem.IOS:
+        device_class = DeviceClass.MOBILE
+    elif os != OperatingSystem.UNKNOWN:
+        device_class = DeviceClass.DESKTOP
+    else:
+        device_class = DeviceClass.UNKNOWN
+
+    return DeviceInfo(browser, version, os, device_class, _fingerprint(browser, os, device_class, user_agent))
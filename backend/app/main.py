@@ -1,3 +1,9 @@
+import time
+
+_import_started = time.perf_counter()
+
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
@@ -11,8 +17,18 @@ import os
 load_dotenv()
 
 from app.api.routes import auth, users, students, founders, mentors, vendors, working_professionals, user_profiles, sessions, ai_search
+from app.core.auth import prefetch_firebase_keys
 from app.core.config import settings
-from app.core.performance import PerformanceMiddleware
+from app.core.health import health_monitor
+from app.core.performance import ORJSONResponse, PerformanceMiddleware
+from app.core.startup import cancel_warm_up, record_imports, warm_up
+from app.services.ai_search_service import ai_search_service
+from app.services.location_service import location_service
+from app.services.matching_service import matching_service
+from app.services.opportunity_service import opportunity_service
+from app.services.search_service import search_service
+from app.services.supabase_service import supabase_service
+from app.services.vendor_search_service import vendor_search_service
 
 # Custom middleware to handle COOP headers
 class COOPMiddleware(BaseHTTPMiddleware):
@@ -37,12 +53,41 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         
         return response
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Nothing external is initialised at import; do it here, concurrently, before serving.
+    # Steps still running after WARMUP_TIMEOUT carry on while the worker serves; /readyz waits for them.
+    # The index steps read every landing table off the loop, which also warms the codec path
+    if settings.WARMUP_ENABLED:
+        await warm_up({
+            "firebase": prefetch_firebase_keys,
+            "supabase": lambda: supabase_service.supabase,
+            "locations": location_service.warm_up,
+            "matching": matching_service.ensure_loaded,
+            "opportunities": opportunity_service.ensure_loaded,
+            "vendors": vendor_search_service.ensure_loaded,
+            "search": search_service.ensure_loaded,
+        }, timeout=settings.WARMUP_TIMEOUT)
+    # Importing openai takes longer than everything above; do it once the worker is serving
+    background = asyncio.create_task(warm_up({"openai": ai_search_service.warm_up}, background=True))
+    location_service.start_watching(settings.LOCATION_RELOAD_INTERVAL)
+    health_monitor.start()
+    yield
+    await health_monitor.stop()
+    await cancel_warm_up()
+    await background
+    location_service.stop_watching()
+    await ai_search_service.close()
+    supabase_service.close()
+
 app = FastAPI(
     title="StartupConnect API",
     description="Backend API for StartupConnect platform connecting founders, investors, mentors, and service providers",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Add security headers middleware first
@@ -107,6 +152,14 @@ app.include_router(sessions.router, prefix="/api/sessions", tags=["Sessions"])
 from app.api.routes import locations
 app.include_router(locations.router, prefix="/api/locations", tags=["Locations"])
 
+from app.api.routes import matches
+app.include_router(matches.router, prefix="/api/matches", tags=["Matching"])
+
+from app.api.routes import search
+app.include_router(search.router, prefix="/api/search", tags=["Search"])
+
+record_imports(_import_started)
+
 @app.get("/")
 async def root():
     return {
@@ -123,6 +176,16 @@ async def health_check():
         "timestamp": "2024-01-01T00:00:00Z"
     }
 
+@app.get("/livez", include_in_schema=False)
+async def liveness_probe():
+    """Liveness probe: answers whenever the worker is up, whatever its dependencies"""
+    return health_monitor.liveness()
+
+@app.get("/readyz", include_in_schema=False)
+async def readiness_probe():
+    """Readiness probe: the cached dependency checks (200 ready, 503 not), with per-dependency latency"""
+    return health_monitor.readiness()
+
 @app.get("/test")
 async def test_endpoint():
     print("=== TEST ENDPOINT CALLED ===")
@@ -135,8 +198,6 @@ async def test_endpoint():
 @app.get("/test-supabase")
 async def test_supabase():
     """Test Supabase connectivity and table structure"""
-    from app.services.supabase_service import supabase_service
-    
     try:
         # Test basic connectivity
         if not supabase_service.supabase:
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 
 class VendorBase(BaseModel):
@@ -22,4 +22,16 @@ class VendorResponse(VendorBase):
 
     model_config = {
         "from_attributes": True
-    } 
\ No newline at end of file
+    }
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+class VendorSearchResponse(BaseModel):
+    total: int
+    offset: int
+    limit: int
+    vendors: List[VendorResponse]
+    facets: Dict[str, List[FacetCount]]
+    took_ms: float
@@ -0,0 +1,192 @@
+import time
+import unicodedata
+import zlib
+from collections import OrderedDict
+from math import sqrt
+from typing import Callable, Dict, NamedTuple, Optional, Set
+
+# Hashed feature space for near-duplicate vectors
+FEATURE_BUCKETS = 1 << 20
+
+# Signatures shared by more cached inputs than this (a lone common word) nominate no candidates
+MAX_SIGNATURE_POSTINGS = 64
+
+def normalize_input(text: str) -> str:
+    """Casefold, turn punctuation into spaces and collapse whitespace: "I'm a  Student!" -> 'i m a student'"""
+    folded = unicodedata.normalize("NFKC", text).casefold()
+    cleaned = "".join(" " if unicodedata.category(c)[0] in "PSZC" else c for c in folded)
+    return " ".join(cleaned.split())
+
+def input_vector(normalized: str) -> Dict[int, float]:
+    """L2-normalised hashed vector of word unigrams and character trigrams"""
+    counts: Dict[int, float] = {}
+    padded = f" {normalized} "
+    features = [f"w:{word}" for word in normalized.split()]
+    features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+    for feature in features:
+        bucket = zlib.crc32(feature.encode("utf-8")) % FEATURE_BUCKETS
+        counts[bucket] = counts.get(bucket, 0.0) + 1.0
+    norm = sqrt(sum(v * v for v in counts.values())) or 1.0
+    return {bucket: v / norm for bucket, v in counts.items()}
+
+def input_signatures(normalized: str) -> Set[int]:
+    """
+    Hashes of the word sequence with each word in turn left out, plus the whole
+    sequence. Inputs one inserted, deleted or changed word apart (a typo, a
+    plural) share at least one signature.
+    """
+    words = normalized.split()
+    signatures = {hash(normalized)}
+    if len(words) > 1:
+        for i in range(len(words)):
+            signatures.add(hash(" ".join(words[:i] + words[i + 1:])))
+    return signatures
+
+def _edit_distance(a: str, b: str) -> int:
+    previous = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        current = [i]
+        for j, y in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (x != y)))
+        previous = current
+    return previous[-1]
+
+def spelling_variant(normalized: str, other: str) -> bool:
+    """
+    Whether two normalised inputs differ at most in the spelling of one word (a
+    typo, a plural), so not by an inserted, dropped or swapped word: 'i am not a
+    student' and 'i want to be a mentor' keep their own classifications.
+    """
+    words, other_words = normalized.split(), other.split()
+    if len(words) != len(other_words):
+        return False
+    changed = [(word, other_word) for word, other_word in zip(words, other_words) if word != other_word]
+    if len(changed) > 1:
+        return False
+    if not changed:
+        return True
+    word, other_word = changed[0]
+    return _edit_distance(word, other_word) <= max(1, min(len(word), len(other_word)) // 4)
+
+class CachedResult(NamedTuple):
+    result: Dict
+    stale: bool
+    near: bool
+
+class _Entry:
+    __slots__ = ("result", "vector", "signatures", "stored_at")
+
+    def __init__(self, result: Dict, vector: Dict[int, float], signatures: Set[int], stored_at: float):
+        self.result = result
+        self.vector = vector
+        self.signatures = signatures
+        self.stored_at = stored_at
+
+class ClassificationCache:
+    """
+    Two-tier cache of role classifications keyed on normalised input.
+
+    The exact tier is an LRU dict. On an exact miss, the near-duplicate tier
+    takes the cached inputs at most one word edit away (via input_signatures),
+    compares their hashed n-gram vectors with the input's and reuses the best
+    result at or above the cosine similarity threshold ('i provide service to
+    startups' -> 'i provide services to startups'). Only spelling variants of
+    one word qualify, and a caller can pass `confirm` to check the cached
+    result against the new input before it is served. Entries are
+    fresh for `ttl` seconds, then served as stale for another `ttl` while the
+    caller refreshes them, then dropped.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, similarity: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity = similarity
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._postings: Dict[int, Set[str]] = {}
+        self.stats = {"exact_hits": 0, "near_hits": 0, "misses": 0, "stale_hits": 0, "evictions": 0,
+                      "near_rejected": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, now: Optional[float] = None,
+            confirm: Optional[Callable[[Dict], bool]] = None) -> Optional[CachedResult]:
+        """Exact or near-duplicate hit for key; near hits are only served when confirm(result) agrees"""
+        now = time.monotonic() if now is None else now
+        entry = self._entries.get(key)
+        near = False
+        if entry is not None and now - entry.stored_at >= 2 * self.ttl:
+            self._remove(key)
+            entry = None
+        if entry is None and self.similarity <= 1.0:
+            entry = self._nearest(key, now)
+            if entry is not None and confirm is not None and not confirm(entry.result):
+                self.stats["near_rejected"] += 1
+                entry = None
+            near = entry is not None
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+
+        if near:
+            self.stats["near_hits"] += 1
+        else:
+            self.stats["exact_hits"] += 1
+            self._entries.move_to_end(key)
+        stale = now - entry.stored_at >= self.ttl
+        if stale:
+            self.stats["stale_hits"] += 1
+        return CachedResult(entry.result, stale, near)
+
+    def _nearest(self, key: str, now: float) -> Optional[_Entry]:
+        candidates: Set[str] = set()
+        for signature in input_signatures(key):
+            posting = self._postings.get(signature)
+            if posting and len(posting) <= MAX_SIGNATURE_POSTINGS:
+                candidates.update(posting)
+        if not candidates:
+            return None
+
+        vector = input_vector(key)
+        best, best_score = None, self.similarity
+        for candidate in candidates:
+            entry = self._entries[candidate]
+            if now - entry.stored_at >= 2 * self.ttl:
+                continue
+            other = entry.vector
+            score = sum(weight * other.get(bucket, 0.0) for bucket, weight in vector.items())
+            if score >= best_score and spelling_variant(key, candidate):
+                best, best_score = entry, score
+        return best
+
+    def put(self, key: str, result: Dict, now: Optional[float] = None):
+        if not key:
+            return
+        now = time.monotonic() if now is None else now
+        if key in self._entries:
+            self._remove(key)
+        entry = _Entry(result, input_vector(key), input_signatures(key), now)
+        self._entries[key] = entry
+        for signature in entry.signatures:
+            self._postings.setdefault(signature, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.stats["evictions"] += 1
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        for signature in entry.signatures:
+            posting = self._postings.get(signature)
+            if posting is not None:
+                posting.discard(key)
+                if not posting:
+                    del self._postings[signature]
+
+    def metrics(self) -> Dict:
+        lookups = self.stats["exact_hits"] + self.stats["near_hits"] + self.stats["misses"]
+        hits = self.stats["exact_hits"] + self.stats["near_hits"]
+        return {
+            **self.stats,
+            "size": len(self._entries),
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,275 @@
+import asyncio
+import json
+import math
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+from app.services.ai_search_cache import ClassificationCache, normalize_input
+from app.services.role_classifier import load_role_classifier
+
+if TYPE_CHECKING:
+    # Importing openai takes longer than the rest of the app together; it is loaded with the client
+    from openai import AsyncOpenAI
+
+# Role mapping
+ROLE_URLS = {
+    "student": "/student",
+    "founder": "/founder", 
+    "mentor": "/mentor",
+    "vendor": "/vendor",
+    "working professional": "/professional"
+}
+
+# Returned whenever the classification is unclear or OpenAI is slow or failing
+DEFAULT_ROLE = "student"
+
+SYSTEM_PROMPT = """You are an AI assistant for The CoFounder Circle, a comprehensive startup ecosystem platform that connects different stakeholders in the startup world.
+
+## PLATFORM OVERVIEW:
+The CoFounder Circle is a unified platform that brings together students, founders, mentors, vendors, and working professionals to create a thriving startup ecosystem. Each user type has access to specific resources, networks, and opportunities tailored to their needs and goals.
+
+## USER CATEGORIES AND THEIR FUNCTIONALITY:
+
+### STUDENTS (/student)
+- **Primary Focus**: Learning, skill development, and career preparation
+- **Key Features**: Mentorship programs, internship opportunities, career guidance, skill development workshops
+- **Ideal For**: Students seeking to learn about entrepreneurship, gain practical experience, find mentors, or prepare for their career journey
+- **Examples**: "I'm a student looking for an internship", "I want to learn about startups", "I need career guidance"
+
+### FOUNDERS (/founder)  
+- **Primary Focus**: Building and scaling startups, finding resources and connections
+- **Key Features**: Investor network, mentorship from experienced entrepreneurs, startup resources, funding opportunities, co-founder matching
+- **Ideal For**: Anyone actively building a startup, seeking funding, looking for co-founders, or needing startup-specific resources
+- **Examples**: "I'm building a startup", "I need investors", "I want to find a co-founder", "I'm starting a business"
+
+### MENTORS (/mentor)
+- **Primary Focus**: Sharing expertise, guiding others, and making investments
+- **Key Features**: Mentorship programs, expert network, knowledge sharing platforms, investment opportunities
+- **Ideal For**: Experienced professionals wanting to mentor, investors looking for opportunities, experts wanting to share knowledge
+- **Examples**: "I want to mentor students", "I'm an investor looking for startups", "I want to share my expertise"
+
+### VENDORS (/vendor)
+- **Primary Focus**: Providing services and growing business with startup clients
+- **Key Features**: Startup network, business growth opportunities, quality leads, service partnerships
+- **Ideal For**: Service providers, suppliers, distributors, and businesses looking to work with startups
+- **Examples**: "I provide services to startups", "I'm looking for startup clients", "I supply products to businesses"
+
+### WORKING PROFESSIONALS (/professional)
+- **Primary Focus**: Career advancement and professional networking
+- **Key Features**: Career growth opportunities, professional network, skill development, global job opportunities
+- **Ideal For**: Professionals seeking career advancement, job opportunities, or professional networking
+- **Examples**: "I'm looking for a new job", "I want to advance my career", "I'm a freelancer"
+
+## CLASSIFICATION GUIDELINES:
+Analyze the user's input holistically, considering:
+1. **Current Status**: What they currently are (student, professional, etc.)
+2. **Primary Goal**: What they want to achieve (learn, build, mentor, provide services, advance career)
+3. **Intent**: Their main motivation and desired outcome
+4. **Context**: The broader context of their needs and aspirations
+
+## DECISION FRAMEWORK:
+- If someone mentions building/starting a business → FOUNDER (regardless of current status)
+- If someone wants to learn/study/develop skills → STUDENT (regardless of current status)  
+- If someone wants to teach/mentor/invest → MENTOR
+- If someone wants to provide services/products → VENDOR
+- If someone wants career advancement/jobs → WORKING PROFESSIONAL
+
+Return only one of these exact categories: "student", "founder", "mentor", "vendor", "working professional"
+Nothing else."""
+
+class AISearchService:
+    """
+    Classifies free-text landing-page input into one of the ROLE_URLS roles.
+    
+    Uses a single pooled async OpenAI client, so classifications never block the
+    event loop. At most AI_SEARCH_MAX_CONCURRENCY upstream calls run at once, and
+    each request, including time spent queueing for a slot, has a hard
+    AI_SEARCH_TIMEOUT deadline after which DEFAULT_ROLE is returned. When
+    AI_SEARCH_MAX_QUEUE requests are already waiting for a slot, new ones get
+    DEFAULT_ROLE straight away instead of queueing into a certain timeout.
+    
+    Successful classifications are cached by normalised input (see
+    ClassificationCache); near-duplicate hits are only served when the local
+    classifier agrees with the cached role. A stale hit is served immediately and refreshed
+    in the background. Concurrent misses for the same normalised input share
+    one upstream call (single flight). On a cache miss the local RoleClassifier answers
+    directly when its probability reaches AI_CLASSIFIER_THRESHOLD, so only
+    ambiguous inputs reach OpenAI. Confidence is the local probability or
+    the probability OpenAI gave its answer (from token logprobs).
+    """
+    
+    def __init__(self):
+        self._client: Optional["AsyncOpenAI"] = None
+        self._semaphore = asyncio.Semaphore(settings.AI_SEARCH_MAX_CONCURRENCY)
+        self._in_flight = 0
+        self._cache = ClassificationCache(settings.AI_CACHE_SIZE, settings.AI_CACHE_TTL, settings.AI_CACHE_SIMILARITY)
+        # Upstream classifications in progress, by cache key; duplicates await these instead of calling again
+        self._flights: Dict[str, asyncio.Task] = {}
+        self._classifier = load_role_classifier(settings.AI_CLASSIFIER_PATH)
+        self._traffic_log = None
+        # coalesced counts requests that joined another's upstream call, i.e. upstream calls saved
+        self.stats = {"requests": 0, "local_answers": 0, "upstream_calls": 0, "timeouts": 0, "errors": 0, "shed": 0, "coalesced": 0}
+    
+    def _get_client(self) -> "AsyncOpenAI":
+        """Create the client on first use, so a missing API key only affects AI search"""
+        if self._client is None:
+            from openai import AsyncOpenAI
+            timeout = httpx.Timeout(settings.AI_SEARCH_TIMEOUT, connect=min(1.0, settings.AI_SEARCH_TIMEOUT))
+            self._client = AsyncOpenAI(
+                api_key=settings.OPENAI_API_KEY,
+                base_url=settings.OPENAI_BASE_URL,
+                timeout=timeout,
+                # Retrying would blow the deadline; the fallback role is the retry
+                max_retries=0,
+                http_client=httpx.AsyncClient(
+                    timeout=timeout,
+                    limits=httpx.Limits(
+                        max_connections=settings.AI_SEARCH_MAX_CONCURRENCY,
+                        max_keepalive_connections=settings.AI_SEARCH_MAX_CONCURRENCY
+                    )
+                )
+            )
+        return self._client
+    
+    def warm_up(self):
+        """Import openai and build the client before the first AI search (startup warm-up; blocking)"""
+        import openai
+        if settings.OPENAI_API_KEY:
+            self._get_client()
+    
+    async def close(self):
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+        if self._traffic_log is not None:
+            self._traffic_log.close()
+            self._traffic_log = None
+    
+    def _log_traffic(self, user_input: str, result: Dict):
+        """Append an OpenAI classification to AI_SEARCH_LOG_PATH, as training data for the local classifier"""
+        if not settings.AI_SEARCH_LOG_PATH:
+            return
+        try:
+            if self._traffic_log is None:
+                self._traffic_log = open(settings.AI_SEARCH_LOG_PATH, "a", encoding="utf-8", buffering=1)
+            self._traffic_log.write(json.dumps(
+                {"user_input": user_input, "role": result["role"], "confidence": result["confidence"]},
+                ensure_ascii=False
+            ) + "\n")
+        except Exception as e:
+            print(f"Error writing AI search log: {str(e)}")
+    
+    def _result(self, role: str, confidence: float) -> Dict:
+        return {"role": role, "redirect_url": ROLE_URLS[role], "confidence": confidence}
+    
+    async def _classify_upstream(self, user_input: str) -> Tuple[str, Optional[float]]:
+        """OpenAI's answer and its probability, if the response carries logprobs"""
+        await self._semaphore.acquire()
+        try:
+            self.stats["upstream_calls"] += 1
+            response = await self._get_client().chat.completions.create(
+                model=settings.AI_SEARCH_MODEL,
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": user_input}
+                ],
+                max_tokens=10,
+                temperature=0.1,
+                logprobs=True
+            )
+        finally:
+            self._semaphore.release()
+        choice = response.choices[0]
+        probability = None
+        if getattr(choice, "logprobs", None) and choice.logprobs.content:
+            probability = math.exp(sum(token.logprob for token in choice.logprobs.content))
+        return choice.message.content.strip().lower(), probability
+    
+    async def _classify_llm(self, user_input: str) -> Dict:
+        """Ask OpenAI, within the concurrency limit and deadline; falls back instead of raising"""
+        if self._in_flight >= settings.AI_SEARCH_MAX_CONCURRENCY + settings.AI_SEARCH_MAX_QUEUE:
+            self.stats["shed"] += 1
+            return self._result(DEFAULT_ROLE, 0.0)
+        
+        self._in_flight += 1
+        try:
+            classified_role, probability = await asyncio.wait_for(self._classify_upstream(user_input), settings.AI_SEARCH_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            print(f"AI search timed out after {settings.AI_SEARCH_TIMEOUT}s, falling back to {DEFAULT_ROLE}")
+            return self._result(DEFAULT_ROLE, 0.0)
+        except Exception as e:
+            self.stats["errors"] += 1
+            print(f"Error in AI search: {str(e)}")
+            return self._result(DEFAULT_ROLE, 0.0)
+        finally:
+            self._in_flight -= 1
+        
+        if classified_role not in ROLE_URLS:
+            print(f"Invalid role '{classified_role}', falling back to {DEFAULT_ROLE}")
+            return self._result(DEFAULT_ROLE, 0.0)
+        if probability is None and self._classifier is not None:
+            probability = self._classifier.probabilities(user_input)[classified_role]
+        result = self._result(classified_role, round(probability, 4) if probability is not None else None)
+        self._log_traffic(user_input, result)
+        return result
+    
+    async def _classify_and_cache(self, key: str, user_input: str) -> Dict:
+        result = await self._classify_llm(user_input)
+        # Fallbacks (confidence 0.0) are not cached, so the next request tries OpenAI again
+        if result["confidence"] != 0.0:
+            self._cache.put(key, result)
+        return result
+    
+    def _flight(self, key: str, user_input: str) -> asyncio.Task:
+        """The in-progress upstream classification for key, starting one if there is none"""
+        task = self._flights.get(key)
+        if task is None:
+            task = asyncio.create_task(self._classify_and_cache(key, user_input))
+            self._flights[key] = task
+            task.add_done_callback(lambda done: self._end_flight(key, done))
+        else:
+            self.stats["coalesced"] += 1
+        return task
+    
+    def _end_flight(self, key: str, task: asyncio.Task):
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        # Retrieve the exception here, in case every waiter was cancelled
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Error in AI search: {str(task.exception())}")
+    
+    def _confirms(self, user_input: str, result: Dict) -> bool:
+        """Whether the local classifier agrees with the role cached for a near-duplicate of user_input"""
+        return self._classifier is not None and self._classifier.predict(user_input)[0] == result["role"]
+    
+    async def classify(self, user_input: str) -> Dict:
+        """Role, redirect URL, confidence and whether it came from the cache; never raises"""
+        self.stats["requests"] += 1
+        key = normalize_input(user_input)
+        
+        cached = self._cache.get(key, confirm=lambda result: self._confirms(user_input, result)) if key else None
+        if cached is not None:
+            if cached.stale and not cached.near and key not in self._flights:
+                self._flight(key, user_input)
+            return {**cached.result, "cached": True}
+        
+        if self._classifier is not None and key:
+            role, probability = self._classifier.predict(user_input)
+            if probability >= settings.AI_CLASSIFIER_THRESHOLD:
+                self.stats["local_answers"] += 1
+                return {**self._result(role, round(probability, 4)), "cached": False}
+        
+        if not key:
+            return {**await self._classify_llm(user_input), "cached": False}
+        # Shielded: a client disconnecting cancels its own wait, not the call other requests share
+        result = await asyncio.shield(self._flight(key, user_input))
+        return {**result, "cached": False}
+    
+    def metrics(self) -> Dict:
+        return {**self.stats, "cache": self._cache.metrics()}
+
+# Create a singleton instance
+ai_search_service = AISearchService()
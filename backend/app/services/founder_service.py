@@ -1,27 +1,31 @@
 from app.services.supabase_service import supabase_service
+from app.services.row_events import row_deleted, row_upserted
+from app.services.table_codecs import TABLE_CODECS
 from typing import Optional, Dict, Any, List
 
 class FounderService:
     def __init__(self):
         self.supabase = supabase_service
+        self.codec = TABLE_CODECS["landing_founders"]
     
     async def create_founder(self, founder_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new founder record"""
         if not self.supabase.supabase:
             print("Warning: Supabase not initialized, returning mock data")
-            return {
+            return self.codec.decode({
                 **founder_data,
                 "user_id": "mock-founder-id",
                 "created_at": "2024-01-01T00:00:00Z"
-            }
+            })
         
         try:
             print(f"Creating founder record in Supabase: {founder_data}")
-            response = self.supabase.supabase.table("landing_founders").insert(founder_data).execute()
+            response = self.supabase.supabase.table("landing_founders").insert(self.codec.encode(founder_data)).execute()
             
             if response.data:
-                result = response.data[0]
+                result = self.codec.decode(response.data[0])
                 print(f"Successfully created founder with ID: {result.get('id')}")
+                row_upserted("landing_founders", result)
                 return result
             else:
                 print("No data returned from insert")
@@ -35,7 +39,7 @@ class FounderService:
         """Get founder by user_id"""
         if not self.supabase.supabase:
             print("Warning: Supabase not initialized, returning mock data")
-            return {
+            return self.codec.decode({
                 "user_id": user_id,
                 "name": "Mock Founder",
                 "email": "mock@founder.com",
@@ -44,12 +48,12 @@ class FounderService:
                 "state": "CA",
                 "linkedin": "https://linkedin.com/in/mockfounder",
                 "created_at": "2024-01-01T00:00:00Z"
-            }
+            })
         
         try:
             response = self.supabase.supabase.table("landing_founders").select("*").eq("user_id", user_id).execute()
             if response.data:
-                return response.data[0]
+                return self.codec.decode(response.data[0])
             return None
         except Exception as e:
             print(f"Error getting founder: {e}")
@@ -59,12 +63,14 @@ class FounderService:
         """Update founder record"""
         if not self.supabase.supabase:
             print("Warning: Supabase not initialized, returning mock data")
-            return {**update_data, "user_id": user_id, "updated_at": "2024-01-01T00:00:00Z"}
+            return self.codec.decode({**update_data, "user_id": user_id, "updated_at": "2024-01-01T00:00:00Z"})
         
         try:
-            response = self.supabase.supabase.table("landing_founders").update(update_data).eq("user_id", user_id).execute()
+            response = self.supabase.supabase.table("landing_founders").update(self.codec.encode(update_data)).eq("user_id", user_id).execute()
             if response.data:
-                return response.data[0]
+                result = self.codec.decode(response.data[0])
+                row_upserted("landing_founders", result)
+                return result
             return None
         except Exception as e:
             print(f"Error updating founder: {e}")
@@ -74,7 +80,7 @@ class FounderService:
         """Get all founders"""
         if not self.supabase.supabase:
             print("Warning: Supabase not initialized, returning mock data")
-            return [
+            return self.codec.decode_many([
                 {
                     "user_id": "founder-1",
                     "name": "John Startup",
@@ -95,11 +101,11 @@ class FounderService:
                     "linkedin": "https://linkedin.com/in/sarahinnovator",
                     "created_at": "2024-01-01T00:00:00Z"
                 }
-            ]
+            ])
         
         try:
             response = self.supabase.supabase.table("landing_founders").select("*").order("created_at", desc=True).execute()
-            return response.data if response.data else []
+            return self.codec.decode_many(response.data or [])
         except Exception as e:
             print(f"Error getting all founders: {e}")
             return []
@@ -112,6 +118,7 @@ class FounderService:
         
         try:
             response = self.supabase.supabase.table("landing_founders").delete().eq("user_id", user_id).execute()
+            row_deleted("landing_founders", user_id)
             return True
         except Exception as e:
             print(f"Error deleting founder: {e}")
@@ -0,0 +1,153 @@
+import heapq
+from array import array
+from bisect import bisect_left
+from math import asin, cos, radians, sin, sqrt
+from operator import itemgetter
+from typing import Dict, Iterable, List, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.195
+
+# Grid cell size; a 50km radius query touches a handful of cells anywhere but the poles
+CELL_DEGREES = 0.5
+_ROWS = int(180 / CELL_DEGREES)
+_COLUMNS = int(360 / CELL_DEGREES)
+
+# nearest() starts with this radius and doubles it until k points are found
+INITIAL_SEARCH_KM = 25.0
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometres"""
+    d_lat = radians(lat2 - lat1)
+    d_lon = radians(lon2 - lon1)
+    a = sin(d_lat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(d_lon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(a)))
+
+def _cell(lat: float, lon: float) -> int:
+    row = min(_ROWS - 1, int((lat + 90) // CELL_DEGREES))
+    column = int(((lon + 180) % 360) // CELL_DEGREES)
+    return row * _COLUMNS + column
+
+class GeoIndex:
+    """
+    Fixed-degree grid over (lat, lon) points for radius and k-nearest queries.
+
+    Points are stored in flat arrays sorted by grid cell, alongside the sorted
+    keys of the occupied cells and where each one starts, so a query only
+    visits the cells overlapping its bounding box (a bisect per grid row) and
+    checks those points by haversine distance. Everything is a flat array, so
+    it serialises to bytes for the compiled location store and loads without
+    rebuilding.
+    """
+
+    def __init__(self, lats: array, lons: array, ids: array, cell_keys: array, cell_starts: array):
+        self._lats = lats
+        self._lons = lons
+        self._ids = ids
+        self._cell_keys = cell_keys
+        # One extra offset so cell i always spans cell_starts[i]:cell_starts[i + 1]
+        self._cell_starts = cell_starts + array("I", [len(ids)])
+
+    @classmethod
+    def build(cls, points: Iterable[Tuple[float, float, int]]) -> "GeoIndex":
+        """Index (lat, lon, id) points"""
+        points = sorted((_cell(lat, lon), lat, lon, entry_id) for lat, lon, entry_id in points)
+        cell_keys = array("I")
+        cell_starts = array("I")
+        for position, (cell, _, _, _) in enumerate(points):
+            if not cell_keys or cell_keys[-1] != cell:
+                cell_keys.append(cell)
+                cell_starts.append(position)
+        return cls(
+            array("d", (p[1] for p in points)),
+            array("d", (p[2] for p in points)),
+            array("I", (p[3] for p in points)),
+            cell_keys,
+            cell_starts,
+        )
+
+    def to_blobs(self) -> Dict[str, bytes]:
+        return {
+            "lats": self._lats.tobytes(),
+            "lons": self._lons.tobytes(),
+            "ids": self._ids.tobytes(),
+            "cell_keys": self._cell_keys.tobytes(),
+            "cell_starts": self._cell_starts[:-1].tobytes(),
+        }
+
+    @classmethod
+    def from_blobs(cls, blobs: Dict[str, bytes]) -> "GeoIndex":
+        return cls(
+            array("d", blobs["lats"]),
+            array("d", blobs["lons"]),
+            array("I", blobs["ids"]),
+            array("I", blobs["cell_keys"]),
+            array("I", blobs["cell_starts"]),
+        )
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _window(self, lat: float, lon: float, radius_km: float) -> List[Tuple[int, int]]:
+        """(start, end) slices of every occupied cell overlapping the query's bounding box"""
+        lat_span = radius_km / KM_PER_DEGREE
+        lo_row = max(0, int((lat - lat_span + 90) // CELL_DEGREES))
+        hi_row = min(_ROWS - 1, int((lat + lat_span + 90) // CELL_DEGREES))
+
+        # Longitude degrees shrink towards the poles; size the box for its widest latitude
+        widest = min(90.0, abs(lat) + lat_span)
+        scale = cos(radians(widest))
+        if scale < 1e-9 or radius_km / (KM_PER_DEGREE * scale) >= 180 - CELL_DEGREES:
+            column_ranges = [(0, _COLUMNS - 1)]
+        else:
+            lon_span = radius_km / (KM_PER_DEGREE * scale)
+            first = int(((lon - lon_span + 180) % 360) // CELL_DEGREES)
+            last = int(((lon + lon_span + 180) % 360) // CELL_DEGREES)
+            # A box crossing the antimeridian wraps around to column 0
+            column_ranges = [(first, last)] if first <= last else [(first, _COLUMNS - 1), (0, last)]
+
+        keys, starts = self._cell_keys, self._cell_starts
+        count = len(keys)
+        spans = []
+        for row in range(lo_row, hi_row + 1):
+            base = row * _COLUMNS
+            for first, last in column_ranges:
+                i = bisect_left(keys, base + first)
+                while i < count and keys[i] <= base + last:
+                    spans.append((starts[i], starts[i + 1]))
+                    i += 1
+        return spans
+
+    def within(self, lat: float, lon: float, radius_km: float) -> List[Tuple[float, int, float, float]]:
+        """(distance_km, id, lat, lon) of every point within radius_km, unordered"""
+        lats, lons, ids = self._lats, self._lons, self._ids
+        lat_span = radius_km / KM_PER_DEGREE
+        found = []
+        for start, end in self._window(lat, lon, radius_km):
+            for i in range(start, end):
+                # Latitude difference alone bounds the distance; skip the trig when it is too far
+                if abs(lats[i] - lat) > lat_span:
+                    continue
+                distance = haversine_km(lat, lon, lats[i], lons[i])
+                if distance <= radius_km:
+                    found.append((distance, ids[i], lats[i], lons[i]))
+        return found
+
+    def nearby(self, lat: float, lon: float, radius_km: float, k: int) -> List[Tuple[float, int, float, float]]:
+        """The k closest points within radius_km, nearest first"""
+        return heapq.nsmallest(k, self.within(lat, lon, radius_km), key=itemgetter(0))
+
+    def nearest(self, lat: float, lon: float, k: int = 1, max_km: float = 2 * KM_PER_DEGREE * 90) -> List[Tuple[float, int, float, float]]:
+        """The k closest points no further than max_km, nearest first"""
+        radius = min(INITIAL_SEARCH_KM, max_km)
+        while True:
+            found = self.within(lat, lon, radius)
+            if len(found) >= k or radius >= max_km:
+                return heapq.nsmallest(k, found, key=itemgetter(0))
+            radius = min(radius * 2, max_km)
+
+def with_coordinates(found: List[Tuple[float, int, float, float]], results: List[Dict]) -> List[Dict]:
+    """Add latitude, longitude and distance_km from nearby()/nearest() hits to their result dicts"""
+    for (distance, _, lat, lon), result in zip(found, results):
+        result.update(latitude=lat, longitude=lon, distance_km=round(distance, 2))
+    return results
@@ -0,0 +1,359 @@
+import heapq
+from collections import Counter
+from itertools import chain
+import unicodedata
+from array import array
+from bisect import bisect_left
+from operator import itemgetter
+from typing import Dict, List, Optional, Tuple
+
+from app.services.location_geo import GeoIndex, with_coordinates
+
+# Upper bound for search limits (mirrors the le=50 on /api/locations/search)
+MAX_RESULTS = 50
+
+# Prefixes up to this length get their top MAX_RESULTS matches precomputed, as do
+# longer prefixes matching more than HEAVY_PREFIX_KEYS keys
+TOP_K_PREFIX_LEN = 3
+HEAVY_PREFIX_KEYS = 256
+
+# Match classes, best first. Fuzzy matches use FUZZY_MATCH + edit distance - 1
+PREFIX_MATCH = 0
+WORD_PREFIX_MATCH = 1
+SUBSTRING_MATCH = 2
+FUZZY_MATCH = 3
+
+# Typo tolerance only kicks in for queries at least this long
+FUZZY_MIN_LENGTH = 4
+
+# Per-query work caps for fuzzy matching: trigram postings scanned and candidates re-ranked
+FUZZY_POSTING_BUDGET = 4000
+FUZZY_CANDIDATES = 32
+
+# Fuzzy hits on popular cities and aliases are promoted by this many match classes,
+# so 'Hydrabad' ranks Hyderabad alongside exact prefix matches
+POPULAR_FUZZY_BOOST = 3
+
+_TYPE_ORDER = {"country": 0, "state": 1, "city": 2}
+_WORD_SEPARATORS = " -,.('/"
+
+def fold(text: str) -> str:
+    """Casefold and strip accents so 'São Paulo' and 'sao paulo' compare equal"""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+def trigrams(text: str) -> set:
+    """Distinct character trigrams of an already folded string"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def max_edit_distance(query: str) -> int:
+    """Typos tolerated for a query: 1 up to 5 chars, 2 up to 8, then 3"""
+    return max(1, min(3, len(query) // 3))
+
+def prefix_edit_distance(query: str, name: str, max_distance: int) -> int:
+    """
+    Smallest edit distance (with adjacent transpositions) between query and any
+    prefix of name, so a partially typed 'banglo' still matches 'bangalore'.
+    Only the diagonal band of width 2 * max_distance + 1 is computed, and
+    max_distance + 1 is returned as soon as the bound is known to be exceeded.
+    """
+    name = name[:len(query) + max_distance]
+    over = max_distance + 1
+    width = len(name)
+    before_previous = None
+    previous = list(range(width + 1))
+    for i in range(1, len(query) + 1):
+        lo = max(1, i - max_distance)
+        hi = min(width, i + max_distance)
+        current = [over] * (width + 1)
+        if lo == 1:
+            current[0] = i
+        q_char = query[i - 1]
+        best = current[0] if lo == 1 else over
+        for j in range(lo, hi + 1):
+            n_char = name[j - 1]
+            value = previous[j - 1] + (q_char != n_char)
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            if (before_previous is not None and j > 1 and q_char == name[j - 2]
+                    and query[i - 2] == n_char and before_previous[j - 2] + 1 < value):
+                value = before_previous[j - 2] + 1
+            current[j] = value
+            if value < best:
+                best = value
+        if best > max_distance:
+            return over
+        before_previous, previous = previous, current
+    return min(min(previous), over)
+
+class LocationIndex:
+    """
+    Read-only search index over countries, states and cities.
+
+    Built once from the location hierarchy. Names are folded up front, kept in a
+    sorted prefix array (names plus every word start, so 'delhi' finds 'New Delhi')
+    and a trigram inverted index for substring matches. The top matches for short
+    prefixes - the first keystrokes of an autocomplete - are precomputed.
+
+    Former names from the hierarchy's "aliases" table ('Gurugram' -> 'Gurgaon')
+    are indexed as extra prefix keys. Typo tolerance works in two tiers: popular
+    cities and aliases are always checked by bounded edit distance (bucketed by
+    first letter), and when exact matching finds fewer than the requested
+    results, trigram candidates are re-ranked by bounded edit distance too.
+
+    Cities listed in the hierarchy's "coordinates" table (by state, then city)
+    are also kept in a GeoIndex grid for nearby() and nearest() (reverse geocoding).
+    """
+
+    def __init__(self, data: Dict):
+        popular = {fold(city) for city in data.get("popular_cities", [])}
+
+        self._results: List[Dict] = []
+        self._names: List[str] = []
+        for country in data.get("countries", []):
+            self._add(country, {"type": "country", "name": country, "value": country})
+        for country, states in data.get("states", {}).items():
+            for state in states:
+                self._add(state, {
+                    "type": "state",
+                    "name": f"{state}, {country}",
+                    "value": state,
+                    "country": country
+                })
+        for state, cities in data.get("cities", {}).items():
+            for city in cities:
+                self._add(city, {
+                    "type": "city",
+                    "name": f"{city}, {state}",
+                    "value": city,
+                    "state": state
+                })
+
+        # Static rank: popular cities, then countries/states/cities, then shorter names
+        count = len(self._names)
+        order = sorted(range(count), key=lambda i: (
+            0 if self._results[i]["type"] == "city" and self._names[i] in popular else 1,
+            _TYPE_ORDER[self._results[i]["type"]],
+            len(self._names[i]),
+            self._names[i]
+        ))
+        self._rank = array("I", [0]) * count
+        for position, entry_id in enumerate(order):
+            self._rank[entry_id] = position
+        self._default = tuple(order[:MAX_RESULTS])
+        self._popular_ids = tuple(i for i in order if self._results[i]["type"] == "city" and self._names[i] in popular)
+
+        self._build_prefix_index(data.get("aliases", {}))
+        self._build_trigram_index()
+
+        # "coordinates" maps state -> city name -> [lat, lon]; cities without one are not geo-searchable
+        coordinates = data.get("coordinates", {})
+        points = []
+        for entry_id, result in enumerate(self._results):
+            if result["type"] == "city":
+                point = coordinates.get(result["state"], {}).get(result["value"])
+                if point:
+                    points.append((point[0], point[1], entry_id))
+        self.geo = GeoIndex.build(points)
+
+    def _add(self, name: str, result: Dict):
+        self._names.append(fold(name))
+        self._results.append(result)
+
+    def _score(self, match_class: int, entry_id: int) -> int:
+        """Single comparable int: match class first, then static rank"""
+        return match_class * len(self._names) + self._rank[entry_id]
+
+    def _build_prefix_index(self, aliases: Dict[str, str]):
+        keys = []
+        ids_by_name: Dict[str, List[int]] = {}
+        for entry_id, name in enumerate(self._names):
+            keys.append((name, entry_id))
+            ids_by_name.setdefault(name, []).append(entry_id)
+            for pos in range(1, len(name)):
+                if name[pos - 1] in _WORD_SEPARATORS and name[pos] not in _WORD_SEPARATORS:
+                    keys.append((name[pos:], entry_id))
+
+        # Popular cities and aliases, bucketed by first letter for the always-on fuzzy tier
+        popular_keys = [(self._names[entry_id], entry_id) for entry_id in self._popular_ids]
+        for alias, canonical in aliases.items():
+            alias = fold(alias)
+            for entry_id in ids_by_name.get(fold(canonical), ()):
+                keys.append((alias, entry_id))
+                popular_keys.append((alias, entry_id))
+        self._popular_by_initial: Dict[str, List[Tuple[str, int]]] = {}
+        for name, entry_id in popular_keys:
+            self._popular_by_initial.setdefault(name[0], []).append((name, entry_id))
+
+        keys.sort()
+        self._prefix_keys = [key for key, _ in keys]
+        self._prefix_ids = array("I", [entry_id for _, entry_id in keys])
+
+        best: Dict[str, Dict[int, int]] = {}
+        for key, entry_id in keys:
+            match_class = PREFIX_MATCH if self._names[entry_id] == key else WORD_PREFIX_MATCH
+            score = self._score(match_class, entry_id)
+            for length in range(1, min(len(key), TOP_K_PREFIX_LEN) + 1):
+                scores = best.setdefault(key[:length], {})
+                if score < scores.get(entry_id, score + 1):
+                    scores[entry_id] = score
+        self._top_by_prefix = {
+            prefix: tuple(entry_id for entry_id, _ in heapq.nsmallest(MAX_RESULTS, scores.items(), key=itemgetter(1)))
+            for prefix, scores in best.items()
+        }
+
+        # Walk down from the precomputed level, keeping top lists for prefixes whose range is large
+        stack = [prefix for prefix in self._top_by_prefix if len(prefix) == TOP_K_PREFIX_LEN]
+        while stack:
+            prefix = stack.pop()
+            lo, hi = self._prefix_range(prefix)
+            if hi - lo <= HEAVY_PREFIX_KEYS:
+                continue
+            if len(prefix) > TOP_K_PREFIX_LEN:
+                scores = self._prefix_scores(prefix, lo, hi)
+                self._top_by_prefix[prefix] = tuple(
+                    entry_id for entry_id, _ in heapq.nsmallest(MAX_RESULTS, scores.items(), key=itemgetter(1))
+                )
+            position = lo
+            while position < hi:
+                key = self._prefix_keys[position]
+                if len(key) == len(prefix):
+                    position += 1
+                    continue
+                child = key[:len(prefix) + 1]
+                stack.append(child)
+                position = bisect_left(self._prefix_keys, child + "\uffff", position, hi)
+
+    def _prefix_range(self, q: str) -> Tuple[int, int]:
+        """Slice of the sorted prefix keys starting with q"""
+        lo = bisect_left(self._prefix_keys, q)
+        return lo, bisect_left(self._prefix_keys, q + "\uffff", lo)
+
+    def _prefix_scores(self, q: str, lo: int, hi: int) -> Dict[int, int]:
+        """Best score per entry over prefix keys[lo:hi]"""
+        scores: Dict[int, int] = {}
+        for position in range(lo, hi):
+            entry_id = self._prefix_ids[position]
+            match_class = PREFIX_MATCH if self._names[entry_id].startswith(q) else WORD_PREFIX_MATCH
+            score = self._score(match_class, entry_id)
+            if score < scores.get(entry_id, score + 1):
+                scores[entry_id] = score
+        return scores
+
+    def _build_trigram_index(self):
+        postings: Dict[str, List[int]] = {}
+        for entry_id, name in enumerate(self._names):
+            # Names too short for a trigram are keyed by themselves so short queries still find them
+            for gram in trigrams(name) if len(name) >= 3 else (name,):
+                postings.setdefault(gram, []).append(entry_id)
+        self._trigrams = {gram: array("I", ids) for gram, ids in postings.items()}
+
+        # Queries shorter than a trigram would union every gram containing them, so their
+        # substring matches are precomputed: the best-ranked entries containing each 1-2
+        # character string. Twice MAX_RESULTS so the prefix matches already scored can't
+        # leave a page short.
+        short: Dict[str, List[int]] = {}
+        full = set()
+        for entry_id in sorted(range(len(self._names)), key=self._rank.__getitem__):
+            name = self._names[entry_id]
+            for gram in set(name).union(map(str.__add__, name, name[1:])).difference(full):
+                ids = short.setdefault(gram, [])
+                ids.append(entry_id)
+                if len(ids) == 2 * MAX_RESULTS:
+                    full.add(gram)
+        self._short_substrings = {gram: array("I", ids) for gram, ids in short.items()}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """Ranked top-`limit` locations whose name contains `query`"""
+        q = fold(query).strip()
+        limit = max(0, min(limit, MAX_RESULTS))
+        if not q:
+            return [dict(self._results[i]) for i in self._default[:limit]]
+
+        top = self._top_by_prefix.get(q, ())
+        if len(top) >= limit:
+            return [dict(self._results[i]) for i in top[:limit]]
+
+        scores: Dict[int, int] = {}
+        if len(q) >= FUZZY_MIN_LENGTH:
+            max_distance = max_edit_distance(q)
+            for name, entry_id in self._popular_by_initial.get(q[0], ()):
+                distance = prefix_edit_distance(q, name, max_distance)
+                if 0 < distance <= max_distance:
+                    match_class = max(PREFIX_MATCH, FUZZY_MATCH + distance - 1 - POPULAR_FUZZY_BOOST)
+                    score = self._score(match_class, entry_id)
+                    if score < scores.get(entry_id, score + 1):
+                        scores[entry_id] = score
+
+        for entry_id, score in self._prefix_scores(q, *self._prefix_range(q)).items():
+            if score < scores.get(entry_id, score + 1):
+                scores[entry_id] = score
+
+        # Mid-word matches only matter when there are not enough prefix matches
+        if len(scores) < limit:
+            for entry_id in self._substring_candidates(q):
+                if entry_id not in scores and q in self._names[entry_id]:
+                    scores[entry_id] = self._score(SUBSTRING_MATCH, entry_id)
+
+        # Likewise typo-tolerant matches on the long tail only fill in behind exact ones
+        if len(scores) < limit and len(q) >= FUZZY_MIN_LENGTH:
+            for entry_id in self._fuzzy_candidates(q):
+                if entry_id in scores:
+                    continue
+                distance = prefix_edit_distance(q, self._names[entry_id], max_distance)
+                if distance <= max_distance:
+                    scores[entry_id] = self._score(FUZZY_MATCH + distance - 1, entry_id)
+
+        best = heapq.nsmallest(limit, scores.items(), key=itemgetter(1))
+        return [dict(self._results[entry_id]) for entry_id, _ in best]
+
+    def _substring_candidates(self, q: str):
+        """Entries that may contain q: the rarest trigram's posting list, or the precomputed top list of a short q"""
+        if len(q) < 3:
+            return self._short_substrings.get(q, ())
+        postings: Optional[array] = None
+        for gram in trigrams(q):
+            posting = self._trigrams.get(gram)
+            if posting is None:
+                return ()
+            if postings is None or len(posting) < len(postings):
+                postings = posting
+        return postings
+
+    def _fuzzy_candidates(self, q: str) -> List[int]:
+        """
+        Entries sharing the most trigrams with q, rarest trigrams first.
+
+        Work is capped by FUZZY_POSTING_BUDGET so very common trigrams on a large
+        dataset cannot make a single keystroke expensive.
+        """
+        postings = sorted(
+            (self._trigrams[gram] for gram in trigrams(q) if gram in self._trigrams),
+            key=len
+        )
+        selected = []
+        budget = FUZZY_POSTING_BUDGET
+        for posting in postings:
+            if len(posting) > budget:
+                break
+            budget -= len(posting)
+            selected.append(posting)
+
+        best = Counter(chain.from_iterable(selected)).most_common(FUZZY_CANDIDATES)
+        return [entry_id for entry_id, _ in best]
+
+    def nearby(self, lat: float, lon: float, radius_km: float, limit: int = 10) -> List[Dict]:
+        """Cities within radius_km of (lat, lon), nearest first"""
+        found = self.geo.nearby(lat, lon, radius_km, max(0, min(limit, MAX_RESULTS)))
+        return with_coordinates(found, [dict(self._results[hit[1]]) for hit in found])
+
+    def nearest(self, lat: float, lon: float, limit: int = 1, max_km: Optional[float] = None) -> List[Dict]:
+        """The closest cities to (lat, lon), optionally no further than max_km"""
+        limit = max(0, min(limit, MAX_RESULTS))
+        found = self.geo.nearest(lat, lon, limit) if max_km is None else self.geo.nearest(lat, lon, limit, max_km)
+        return with_coordinates(found, [dict(self._results[hit[1]]) for hit in found])
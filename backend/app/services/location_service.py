@@ -1,27 +1,256 @@
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+import hashlib
 import json
-from fastapi import HTTPException
 import os
+import threading
+import time
+from app.core.config import settings
+from app.core.performance import PrecomputedJSON
+from app.services.location_index import LocationIndex
+from app.services.location_store import LAZY_CACHE_SIZE, LocationStore
+
+# How long a replaced snapshot's store stays open for requests that picked it up before the swap
+RETIRED_STORE_GRACE_SECONDS = 30
+
+class LocationSnapshot:
+    """
+    Search index and pre-encoded responses for one version of the location data.
+    
+    Never modified once built: LocationService swaps in a whole new snapshot on
+    reload, so a request that has picked one up sees consistent data throughout.
+    """
+    
+    def __init__(self, data: Optional[Dict] = None, store: Optional[LocationStore] = None):
+        self.cache = data if data is not None else {}
+        self.store = store
+        self.index = store if store is not None else LocationIndex(self.cache)
+        if store is not None:
+            self._build_store_responses()
+        else:
+            self._build_responses()
+    
+    def close(self):
+        """Close the compiled store's connection, if this snapshot reads from one"""
+        if self.store is not None:
+            self.store.close()
+    
+    def _build_responses(self):
+        """Sort and pre-encode every static location response once, at load time"""
+        hierarchy = PrecomputedJSON.encode(self.cache, etag="")
+        
+        # The ETag is a version derived from the data itself, shared by every response
+        self.data_version = hashlib.sha1(hierarchy.body).hexdigest()[:16]
+        etag = f'"{self.data_version}"'
+        
+        self.countries: Tuple[str, ...] = tuple(self.cache.get("countries", []))
+        self.popular_cities: Tuple[str, ...] = tuple(self.cache.get("popular_cities", []))
+        self._states: Dict[str, Tuple[str, ...]] = {
+            country: tuple(sorted(states)) for country, states in self.cache.get("states", {}).items()
+        }
+        self._cities: Dict[str, Tuple[str, ...]] = {
+            state: tuple(sorted(cities)) for state, cities in self.cache.get("cities", {}).items()
+        }
+        
+        self._responses: Dict[Tuple[str, Optional[str]], PrecomputedJSON] = {
+            ("countries", None): PrecomputedJSON.encode(self.countries, etag),
+            ("popular-cities", None): PrecomputedJSON.encode(self.popular_cities, etag),
+            ("hierarchy", None): hierarchy._replace(etag=etag),
+        }
+        for country, states in self._states.items():
+            self._responses[("states", country)] = PrecomputedJSON.encode(states, etag)
+        for state, cities in self._cities.items():
+            self._responses[("cities", state)] = PrecomputedJSON.encode(cities, etag)
+        self._empty_response = PrecomputedJSON.encode([], etag)
+    
+    def _build_store_responses(self):
+        """Pre-encode the small responses; states, cities and the hierarchy are encoded on first request"""
+        store = self.store
+        self.data_version = store.version
+        etag = f'"{self.data_version}"'
+        
+        self.countries = store.countries
+        self.popular_cities = store.popular_cities
+        self._responses = {
+            ("countries", None): PrecomputedJSON.encode(self.countries, etag),
+            ("popular-cities", None): PrecomputedJSON.encode(self.popular_cities, etag),
+        }
+        self._empty_response = PrecomputedJSON.encode([], etag)
+        
+        def encode(kind: str, key: Optional[str]) -> Optional[PrecomputedJSON]:
+            if kind == "states":
+                return PrecomputedJSON.encode(store.states(key), etag)
+            if kind == "cities":
+                return PrecomputedJSON.encode(store.cities(key), etag)
+            if kind == "hierarchy":
+                return PrecomputedJSON.encode(store.to_hierarchy(), etag)
+            return None
+        self._lazy_response = lru_cache(maxsize=LAZY_CACHE_SIZE)(encode)
+    
+    def warm(self) -> int:
+        """Encode the lazily built state lists of every country up front; returns how many were built"""
+        if self.store is None:
+            return 0
+        countries = self.countries[:LAZY_CACHE_SIZE // 2]
+        for country in countries:
+            self._lazy_response("states", country)
+        return len(countries)
+    
+    def get_response(self, kind: str, key: Optional[str] = None) -> PrecomputedJSON:
+        response = self._responses.get((kind, key))
+        if response is None and self.store is not None:
+            response = self._lazy_response(kind, key)
+        return response or self._empty_response
+    
+    def states(self, country: str) -> Tuple[str, ...]:
+        if self.store is not None:
+            return self.store.states(country)
+        return self._states.get(country, ())
+    
+    def cities(self, state: str) -> Tuple[str, ...]:
+        if self.store is not None:
+            return self.store.cities(state)
+        return self._cities.get(state, ())
+    
+    def hierarchy(self) -> Dict:
+        if self.store is not None:
+            return self.store.to_hierarchy()
+        return self.cache
 
 class LocationService:
     def __init__(self):
-        self._cache = {}
-        self._load_location_data()
+        self._reload_lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+        self._signature: Optional[Tuple] = None
+        # Loaded on first use or by the startup warm-up, not at import
+        self._snapshot: Optional[LocationSnapshot] = None
+    
+    @property
+    def _data(self) -> LocationSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self.load()
+        return snapshot
     
-    def _load_location_data(self):
-        """Load location data from JSON file or use default data"""
+    def load(self) -> LocationSnapshot:
+        """Load the location data if it is not loaded yet. Blocking"""
+        with self._reload_lock:
+            if self._snapshot is None:
+                self._signature = self._source_signature()
+                self._snapshot = self._load_location_data()
+            return self._snapshot
+    
+    def warm_up(self) -> int:
+        """load(), then pre-encode the responses the snapshot would otherwise build on first request"""
+        return self.load().warm()
+    
+    @property
+    def data_version(self) -> str:
+        return self._data.data_version
+    
+    def get_response(self, kind: str, key: Optional[str] = None) -> PrecomputedJSON:
+        """Pre-encoded body for /countries, /popular-cities, /hierarchy, /states?country= or /cities?state="""
+        return self._data.get_response(kind, key)
+    
+    def _load_location_data(self, fallback: bool = True) -> LocationSnapshot:
+        """
+        Open the compiled location store, or load location data from JSON file or use default data.
+        With fallback=False (reloads) errors are raised instead of falling back to the defaults.
+        """
+        if os.path.exists(settings.LOCATION_DB_PATH):
+            try:
+                return LocationSnapshot(store=LocationStore(settings.LOCATION_DB_PATH))
+            except Exception as e:
+                if not fallback:
+                    raise
+                print(f"Error opening location store, falling back to JSON: {e}")
+        
         try:
             # Try to load from file first
-            data_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'locations.json')
+            data_path = settings.LOCATION_DATA_PATH
             if os.path.exists(data_path):
                 with open(data_path, 'r', encoding='utf-8') as f:
-                    self._cache = json.load(f)
+                    data = json.load(f)
             else:
                 # Use default data if file doesn't exist
-                self._cache = self._get_default_location_data()
+                data = self._get_default_location_data()
         except Exception as e:
+            if not fallback:
+                raise
             print(f"Error loading location data: {e}")
-            self._cache = self._get_default_location_data()
+            data = self._get_default_location_data()
+        return LocationSnapshot(data)
+    
+    def _source_signature(self) -> Tuple:
+        """(mtime, size) of the store and JSON files, to notice when either changes"""
+        signature = []
+        for path in (settings.LOCATION_DB_PATH, settings.LOCATION_DATA_PATH):
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+    
+    def reload(self) -> Dict:
+        """
+        Rebuild indexes and responses from disk, then swap them in with a single
+        assignment. Blocking: call it from a worker thread, never the event loop.
+        On error the current data stays in place.
+        """
+        self.load()
+        with self._reload_lock:
+            start = time.perf_counter()
+            previous_version = self._snapshot.data_version
+            signature = self._source_signature()
+            try:
+                snapshot = self._load_location_data(fallback=False)
+            except Exception as e:
+                print(f"Error reloading location data: {e}")
+                return {"success": False, "error": str(e), "data_version": previous_version}
+            finally:
+                self._signature = signature
+            
+            changed = snapshot.data_version != previous_version
+            if changed:
+                retired, self._snapshot = self._snapshot, snapshot
+                # Requests may still be reading the old store, so close it once they're done
+                closer = threading.Timer(RETIRED_STORE_GRACE_SECONDS, retired.close)
+                closer.daemon = True
+                closer.start()
+            else:
+                snapshot.close()
+            elapsed = time.perf_counter() - start
+            print(f"Location data reloaded in {elapsed:.2f}s: {previous_version} -> {snapshot.data_version}")
+            return {
+                "success": True,
+                "changed": changed,
+                "data_version": snapshot.data_version,
+                "previous_version": previous_version,
+                "seconds": round(elapsed, 3)
+            }
+    
+    def start_watching(self, interval: float):
+        """Poll the location files every `interval` seconds and reload when they change"""
+        if interval <= 0 or self._watcher is not None:
+            return
+        
+        stopping = self._stop_watching = threading.Event()
+        
+        def watch():
+            while not stopping.wait(interval):
+                if self._source_signature() != self._signature:
+                    self.reload()
+        
+        self._watcher = threading.Thread(target=watch, name="location-data-watcher", daemon=True)
+        self._watcher.start()
+    
+    def stop_watching(self):
+        if self._watcher is not None:
+            self._stop_watching.set()
+            self._watcher.join(timeout=1)
+            self._watcher = None
     
     def _get_default_location_data(self) -> Dict:
         """Default location data for India and major countries"""
@@ -110,65 +339,116 @@ class LocationService:
                 "Kolkata", "Pune", "Ahmedabad", "Jaipur", "Surat",
                 "Lucknow", "Kanpur", "Nagpur", "Indore", "Thane",
                 "Bhopal", "Visakhapatnam", "Pimpri-Chinchwad", "Patna", "Vadodara"
-            ]
+            ],
+            # Renamed / alternate city names -> the name used in "cities"
+            "aliases": {
+                "Bengaluru": "Bangalore",
+                "Bombay": "Mumbai",
+                "Madras": "Chennai",
+                "Calcutta": "Kolkata",
+                "Gurugram": "Gurgaon",
+                "Mysuru": "Mysore",
+                "Mangaluru": "Mangalore",
+                "Hubballi": "Hubli",
+                "Belagavi": "Belgaum",
+                "Kalaburagi": "Gulbarga",
+                "Ballari": "Bellary",
+                "Vijayapura": "Bijapur",
+                "Shivamogga": "Shimoga",
+                "Prayagraj": "Allahabad",
+                "Poona": "Pune",
+                "Baroda": "Vadodara",
+                "Trichy": "Tiruchirappalli",
+                "Benares": "Varanasi"
+            },
+            # State -> city name -> [latitude, longitude], used by /nearby and /reverse-geocode;
+            # keyed by state so same-named cities in different states keep their own coordinates
+            "coordinates": {
+                "Maharashtra": {
+                    "Mumbai": [19.076, 72.8777], "Pune": [18.5204, 73.8567], "Nagpur": [21.1458, 79.0882], "Thane": [19.2183, 72.9781],
+                    "Nashik": [19.9975, 73.7898], "Aurangabad": [19.8762, 75.3433], "Solapur": [17.6599, 75.9064], "Kolhapur": [16.705, 74.2433],
+                    "Amravati": [20.9374, 77.7796], "Nanded": [19.1383, 77.321]
+                },
+                "Delhi": {
+                    "New Delhi": [28.6139, 77.209], "Delhi": [28.7041, 77.1025], "Gurgaon": [28.4595, 77.0266], "Noida": [28.5355, 77.391],
+                    "Faridabad": [28.4089, 77.3178], "Ghaziabad": [28.6692, 77.4538], "Greater Noida": [28.4744, 77.504], "Sonipat": [28.9931, 77.0151],
+                    "Panipat": [29.3909, 76.9635], "Karnal": [29.6857, 76.9905]
+                },
+                "Karnataka": {
+                    "Bangalore": [12.9716, 77.5946], "Mysore": [12.2958, 76.6394], "Hubli": [15.3647, 75.124], "Mangalore": [12.9141, 74.856],
+                    "Belgaum": [15.8497, 74.4977], "Gulbarga": [17.3297, 76.8343], "Davanagere": [14.4644, 75.9218], "Bellary": [15.1394, 76.9214],
+                    "Bijapur": [16.8302, 75.71], "Shimoga": [13.9299, 75.5681]
+                },
+                "Tamil Nadu": {
+                    "Chennai": [13.0827, 80.2707], "Coimbatore": [11.0168, 76.9558], "Madurai": [9.9252, 78.1198], "Salem": [11.6643, 78.146],
+                    "Tiruchirappalli": [10.7905, 78.7047], "Vellore": [12.9165, 79.1325], "Erode": [11.341, 77.7172], "Tiruppur": [11.1085, 77.3411],
+                    "Dindigul": [10.3673, 77.9803], "Thanjavur": [10.787, 79.1378]
+                },
+                "Telangana": {
+                    "Hyderabad": [17.385, 78.4867], "Warangal": [17.9689, 79.5941], "Nizamabad": [18.6725, 78.0941], "Karimnagar": [18.4386, 79.1288],
+                    "Ramagundam": [18.755, 79.474], "Khammam": [17.2473, 80.1514], "Mahbubnagar": [16.7488, 78.0035], "Nalgonda": [17.0575, 79.2684],
+                    "Adilabad": [19.6641, 78.532], "Siddipet": [18.1018, 78.852]
+                },
+                "Gujarat": {
+                    "Ahmedabad": [23.0225, 72.5714], "Surat": [21.1702, 72.8311], "Vadodara": [22.3072, 73.1812], "Rajkot": [22.3039, 70.8022],
+                    "Bhavnagar": [21.7645, 72.1519], "Jamnagar": [22.4707, 70.0577], "Gandhinagar": [23.2156, 72.6369], "Anand": [22.5645, 72.9289],
+                    "Bharuch": [21.7051, 72.9959], "Valsad": [20.5992, 72.9342]
+                },
+                "Uttar Pradesh": {
+                    "Lucknow": [26.8467, 80.9462], "Kanpur": [26.4499, 80.3319], "Ghaziabad": [28.6692, 77.4538], "Agra": [27.1767, 78.0081],
+                    "Varanasi": [25.3176, 82.9739], "Meerut": [28.9845, 77.7064], "Allahabad": [25.4358, 81.8463], "Bareilly": [28.367, 79.4304],
+                    "Aligarh": [27.8974, 78.088], "Moradabad": [28.8386, 78.7733]
+                },
+                "West Bengal": {
+                    "Kolkata": [22.5726, 88.3639], "Howrah": [22.5958, 88.2636], "Durgapur": [23.5204, 87.3119], "Asansol": [23.6739, 86.9524],
+                    "Siliguri": [26.7271, 88.3953], "Bardhaman": [23.2324, 87.8615], "Malda": [25.0108, 88.1411], "Baharampur": [24.1047, 88.2515],
+                    "Habra": [22.8333, 88.6333], "Kharagpur": [22.346, 87.232]
+                },
+                "Rajasthan": {
+                    "Jaipur": [26.9124, 75.7873], "Jodhpur": [26.2389, 73.0243], "Kota": [25.2138, 75.8648], "Bikaner": [28.0229, 73.3119],
+                    "Ajmer": [26.4499, 74.6399], "Udaipur": [24.5854, 73.7125], "Bhilwara": [25.3407, 74.6313], "Alwar": [27.553, 76.6346],
+                    "Sri Ganganagar": [29.9038, 73.8772], "Sikar": [27.6094, 75.1399]
+                },
+                "Punjab": {
+                    "Ludhiana": [30.901, 75.8573], "Amritsar": [31.634, 74.8723], "Jalandhar": [31.326, 75.5762], "Patiala": [30.3398, 76.3869],
+                    "Bathinda": [30.211, 74.9455], "Hoshiarpur": [31.5143, 75.9115], "Mohali": [30.7046, 76.7179], "Moga": [30.8165, 75.1717],
+                    "Firozpur": [30.9331, 74.6225], "Sangrur": [30.2458, 75.8421]
+                }
+            }
         }
     
-    async def get_countries(self) -> List[str]:
+    async def get_countries(self) -> Tuple[str, ...]:
         """Get all available countries"""
-        return self._cache.get("countries", [])
+        return self._data.countries
     
-    async def get_states(self, country: str) -> List[str]:
+    async def get_states(self, country: str) -> Tuple[str, ...]:
         """Get states for a specific country"""
-        states = self._cache.get("states", {}).get(country, [])
-        return sorted(states)
+        return self._data.states(country)
     
-    async def get_cities(self, state: str) -> List[str]:
+    async def get_cities(self, state: str) -> Tuple[str, ...]:
         """Get cities for a specific state"""
-        cities = self._cache.get("cities", {}).get(state, [])
-        return sorted(cities)
+        return self._data.cities(state)
     
-    async def get_popular_cities(self) -> List[str]:
+    async def get_popular_cities(self) -> Tuple[str, ...]:
         """Get popular cities for quick selection"""
-        return self._cache.get("popular_cities", [])
+        return self._data.popular_cities
     
     async def search_locations(self, query: str, limit: int = 10) -> List[Dict]:
         """Search for locations by query"""
-        results = []
-        query_lower = query.lower()
-        
-        # Search in countries
-        for country in self._cache.get("countries", []):
-            if query_lower in country.lower():
-                results.append({"type": "country", "name": country, "value": country})
-        
-        # Search in states
-        for country, states in self._cache.get("states", {}).items():
-            for state in states:
-                if query_lower in state.lower():
-                    results.append({
-                        "type": "state",
-                        "name": f"{state}, {country}",
-                        "value": state,
-                        "country": country
-                    })
-        
-        # Search in cities
-        for state, cities in self._cache.get("cities", {}).items():
-            for city in cities:
-                if query_lower in city.lower():
-                    results.append({
-                        "type": "city",
-                        "name": f"{city}, {state}",
-                        "value": city,
-                        "state": state
-                    })
-        
-        # Return limited results
-        return results[:limit]
+        return self._data.index.search(query, limit)
+    
+    async def nearby_locations(self, lat: float, lon: float, radius_km: float = 50, limit: int = 10) -> List[Dict]:
+        """Cities within radius_km of a point, nearest first, with distance_km"""
+        return self._data.index.nearby(lat, lon, radius_km, limit)
+    
+    async def reverse_geocode(self, lat: float, lon: float, max_distance_km: Optional[float] = None) -> Optional[Dict]:
+        """Nearest city to a point, or None if there is none within max_distance_km"""
+        nearest = self._data.index.nearest(lat, lon, 1, max_distance_km)
+        return nearest[0] if nearest else None
     
     async def get_location_hierarchy(self) -> Dict:
         """Get the complete location hierarchy"""
-        return self._cache
+        return self._data.hierarchy()
 
 # Create a singleton instance
 location_service = LocationService() 
\ No newline at end of file
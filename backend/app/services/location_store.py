@@ -0,0 +1,316 @@
+import hashlib
+import heapq
+import json
+import os
+import sqlite3
+from array import array
+from collections import Counter
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
+from typing import Dict, List, Optional, Tuple
+
+from app.core.performance import orjson_dumps
+from app.services.location_geo import GeoIndex, with_coordinates
+from app.services.location_index import (
+    FUZZY_CANDIDATES, FUZZY_MATCH, FUZZY_MIN_LENGTH, FUZZY_POSTING_BUDGET, MAX_RESULTS,
+    POPULAR_FUZZY_BOOST, PREFIX_MATCH, SUBSTRING_MATCH, WORD_PREFIX_MATCH,
+    LocationIndex, fold, max_edit_distance, prefix_edit_distance, trigrams
+)
+
+# Bumped whenever the on-disk layout below changes
+SCHEMA_VERSION = 3
+
+# Map the whole file; pages are shared between every worker that opens it
+MMAP_SIZE = 1 << 30
+
+# Per-country states and per-state cities kept decoded in each worker
+LAZY_CACHE_SIZE = 1024
+
+_TYPES = ("country", "state", "city")
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID;
+CREATE TABLE locations (
+    id INTEGER PRIMARY KEY,
+    type INTEGER NOT NULL,
+    value TEXT NOT NULL,
+    parent TEXT,
+    folded TEXT NOT NULL,
+    rank INTEGER NOT NULL
+);
+CREATE INDEX idx_locations_parent ON locations(type, parent, value);
+CREATE TABLE prefix_keys (
+    key TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    match_class INTEGER NOT NULL,
+    PRIMARY KEY (key, id)
+) WITHOUT ROWID;
+CREATE TABLE top_prefix (prefix TEXT PRIMARY KEY, ids BLOB NOT NULL) WITHOUT ROWID;
+CREATE TABLE trigrams (gram TEXT PRIMARY KEY, count INTEGER NOT NULL, ids BLOB NOT NULL) WITHOUT ROWID;
+CREATE TABLE short_substrings (gram TEXT PRIMARY KEY, ids BLOB NOT NULL) WITHOUT ROWID;
+CREATE TABLE geo (name TEXT PRIMARY KEY, data BLOB NOT NULL) WITHOUT ROWID;
+"""
+
+def location_data_version(data: Dict) -> str:
+    """Content hash of a hierarchy; matches LocationService.data_version for the same data"""
+    return hashlib.sha1(orjson_dumps(data)).hexdigest()[:16]
+
+def build_location_db(data: Dict, path: str):
+    """
+    Compile a location hierarchy (the locations.json shape) into a SQLite store.
+
+    Ranking, prefix keys and trigram postings are taken from a LocationIndex
+    built over the same data, so both backends return identical results.
+    Written to a temporary file and renamed into place, so a running server
+    never opens a half-written store.
+    """
+    index = LocationIndex(data)
+    tmp_path = f"{path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(_SCHEMA)
+        meta = {
+            "schema_version": str(SCHEMA_VERSION),
+            "version": location_data_version(data),
+            "countries": json.dumps(data.get("countries", []), ensure_ascii=False),
+            "popular_cities": json.dumps(data.get("popular_cities", []), ensure_ascii=False),
+            "aliases": json.dumps(data.get("aliases", {}), ensure_ascii=False),
+            "coordinates": json.dumps(data.get("coordinates", {}), ensure_ascii=False),
+            "count": str(len(index._names)),
+            "default": array("I", index._default).tobytes().hex(),
+        }
+        conn.executemany("INSERT INTO meta VALUES (?, ?)", meta.items())
+
+        conn.executemany("INSERT INTO locations VALUES (?, ?, ?, ?, ?, ?)", (
+            (entry_id, _TYPES.index(result["type"]), result["value"],
+             result.get("country") or result.get("state"), index._names[entry_id], index._rank[entry_id])
+            for entry_id, result in enumerate(index._results)
+        ))
+
+        # Full-name keys first so INSERT OR IGNORE keeps the better match class
+        keys = sorted(zip(index._prefix_keys, index._prefix_ids),
+                      key=lambda item: index._names[item[1]] != item[0])
+        conn.executemany("INSERT OR IGNORE INTO prefix_keys VALUES (?, ?, ?)", (
+            (key, entry_id, PREFIX_MATCH if index._names[entry_id] == key else WORD_PREFIX_MATCH)
+            for key, entry_id in keys
+        ))
+        conn.executemany("INSERT INTO top_prefix VALUES (?, ?)", (
+            (prefix, array("I", ids).tobytes()) for prefix, ids in index._top_by_prefix.items()
+        ))
+        conn.executemany("INSERT INTO trigrams VALUES (?, ?, ?)", (
+            (gram, len(ids), ids.tobytes()) for gram, ids in index._trigrams.items()
+        ))
+        conn.executemany("INSERT INTO short_substrings VALUES (?, ?)", (
+            (gram, ids.tobytes()) for gram, ids in index._short_substrings.items()
+        ))
+        conn.executemany("INSERT INTO geo VALUES (?, ?)", index.geo.to_blobs().items())
+        conn.commit()
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+
+class LocationStore:
+    """
+    Read-only, memory-mapped location database produced by build_location_db.
+
+    Only countries, popular cities, aliases and the GeoIndex arrays are read
+    at open; states and cities are loaded per country/state on first use. search() mirrors
+    LocationIndex.search but reads prefix keys and trigram postings from the
+    mapped file, so a world-sized dataset costs each worker almost no private
+    memory.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(f"file:{path}?mode=ro&immutable=1", uri=True, check_same_thread=False)
+        self._conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+
+        # The coordinates JSON is only needed by to_hierarchy(), so leave it on disk
+        meta = dict(self._conn.execute("SELECT key, value FROM meta WHERE key != 'coordinates'"))
+        if int(meta.get("schema_version", 0)) != SCHEMA_VERSION:
+            raise ValueError(f"Unsupported location store schema in {path}; rebuild it with scripts/build_location_db.py")
+        self.version: str = meta["version"]
+        self.countries: Tuple[str, ...] = tuple(json.loads(meta["countries"]))
+        self.popular_cities: Tuple[str, ...] = tuple(json.loads(meta["popular_cities"]))
+        self.aliases: Dict[str, str] = json.loads(meta["aliases"])
+        self._count = int(meta["count"])
+        self._default = array("I", bytes.fromhex(meta["default"]))
+
+        # Popular cities and aliases for the always-on fuzzy tier, as in LocationIndex
+        self._popular_by_initial: Dict[str, List[Tuple[str, int, int]]] = {}
+        popular = [fold(city) for city in self.popular_cities]
+        for folded, entry_id, rank in self._full_name_matches(popular, city_only=True):
+            self._popular_by_initial.setdefault(folded[0], []).append((folded, entry_id, rank))
+        for alias, canonical in self.aliases.items():
+            alias = fold(alias)
+            for _, entry_id, rank in self._full_name_matches([fold(canonical)]):
+                self._popular_by_initial.setdefault(alias[0], []).append((alias, entry_id, rank))
+
+        self.geo = GeoIndex.from_blobs(dict(self._conn.execute("SELECT name, data FROM geo")))
+
+        self.states = lru_cache(maxsize=LAZY_CACHE_SIZE)(self._load_children("state"))
+        self.cities = lru_cache(maxsize=LAZY_CACHE_SIZE)(self._load_children("city"))
+
+    def close(self):
+        self._conn.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _full_name_matches(self, names: List[str], city_only: bool = False):
+        """(folded, id, rank) of entries whose folded name is one of names"""
+        return self._conn.execute(
+            "SELECT p.key, p.id, l.rank FROM prefix_keys p JOIN locations l ON l.id = p.id "
+            "WHERE p.key IN (SELECT value FROM json_each(?)) AND p.match_class = ? AND l.type >= ? "
+            "ORDER BY l.rank",
+            (json.dumps(names), PREFIX_MATCH, 2 if city_only else 0)
+        ).fetchall()
+
+    def _load_children(self, kind: str):
+        type_code = _TYPES.index(kind)
+
+        def load(parent: str) -> Tuple[str, ...]:
+            rows = self._conn.execute(
+                "SELECT value FROM locations WHERE type = ? AND parent = ? ORDER BY value", (type_code, parent)
+            )
+            return tuple(value for value, in rows)
+        return load
+
+    def to_hierarchy(self) -> Dict:
+        """Rebuild the full locations.json structure (for /hierarchy)"""
+        states: Dict[str, List[str]] = {}
+        cities: Dict[str, List[str]] = {}
+        for type_code, value, parent in self._conn.execute("SELECT type, value, parent FROM locations WHERE type > 0 ORDER BY id"):
+            (states if type_code == 1 else cities).setdefault(parent, []).append(value)
+        hierarchy = {
+            "countries": list(self.countries),
+            "states": states,
+            "cities": cities,
+            "popular_cities": list(self.popular_cities),
+        }
+        if self.aliases:
+            hierarchy["aliases"] = self.aliases
+        coordinates = json.loads(self._conn.execute("SELECT value FROM meta WHERE key = 'coordinates'").fetchone()[0])
+        if coordinates:
+            hierarchy["coordinates"] = coordinates
+        return hierarchy
+
+    def _fetch(self, ids) -> List[Dict]:
+        """Result dicts for ids, in the given order"""
+        ids = list(ids)
+        rows = {
+            entry_id: (type_code, value, parent)
+            for entry_id, type_code, value, parent in self._conn.execute(
+                "SELECT id, type, value, parent FROM locations WHERE id IN (SELECT value FROM json_each(?))",
+                (json.dumps(ids),)
+            )
+        }
+        results = []
+        for entry_id in ids:
+            type_code, value, parent = rows[entry_id]
+            if type_code == 0:
+                results.append({"type": "country", "name": value, "value": value})
+            elif type_code == 1:
+                results.append({"type": "state", "name": f"{value}, {parent}", "value": value, "country": parent})
+            else:
+                results.append({"type": "city", "name": f"{value}, {parent}", "value": value, "state": parent})
+        return results
+
+    def _postings(self, q: str) -> Tuple[List[array], bool]:
+        """Trigram postings for q, smallest first, and whether every trigram of q occurs"""
+        grams = trigrams(q)
+        rows = self._conn.execute(
+            "SELECT ids FROM trigrams WHERE gram IN (SELECT value FROM json_each(?)) ORDER BY count",
+            (json.dumps(list(grams)),)
+        ).fetchall()
+        return [array("I", ids) for ids, in rows], len(rows) == len(grams)
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """Ranked top-`limit` locations whose name contains `query` (see LocationIndex.search)"""
+        q = fold(query).strip()
+        limit = max(0, min(limit, MAX_RESULTS))
+        if not q:
+            return self._fetch(self._default[:limit])
+
+        row = self._conn.execute("SELECT ids FROM top_prefix WHERE prefix = ?", (q,)).fetchone()
+        if row and len(row[0]) // 4 >= limit:
+            return self._fetch(array("I", row[0])[:limit])
+
+        count = self._count
+        scores: Dict[int, int] = {}
+
+        def offer(entry_id: int, score: int):
+            if score < scores.get(entry_id, score + 1):
+                scores[entry_id] = score
+
+        if len(q) >= FUZZY_MIN_LENGTH:
+            max_distance = max_edit_distance(q)
+            for name, entry_id, rank in self._popular_by_initial.get(q[0], ()):
+                distance = prefix_edit_distance(q, name, max_distance)
+                if 0 < distance <= max_distance:
+                    match_class = max(PREFIX_MATCH, FUZZY_MATCH + distance - 1 - POPULAR_FUZZY_BOOST)
+                    offer(entry_id, match_class * count + rank)
+
+        # Ranked in SQLite; prefix matches beyond the first `limit` can never make the cut
+        for entry_id, score in self._conn.execute(
+            "SELECT p.id, MIN(p.match_class * ? + l.rank) AS score FROM prefix_keys p "
+            "JOIN locations l ON l.id = p.id WHERE p.key >= ? AND p.key < ? "
+            "GROUP BY p.id ORDER BY score LIMIT ?", (count, q, q + "\uffff", limit)
+        ):
+            offer(entry_id, score)
+
+        postings, complete = self._postings(q) if len(q) >= 3 else ([], False)
+
+        # Mid-word matches only matter when there are not enough prefix matches
+        if len(scores) < limit:
+            if len(q) < 3:
+                row = self._conn.execute("SELECT ids FROM short_substrings WHERE gram = ?", (q,)).fetchone()
+                candidates = array("I", row[0]).tolist() if row else []
+            else:
+                candidates = postings[0].tolist() if complete else []
+            rows = self._conn.execute(
+                "SELECT id, rank FROM locations WHERE id IN (SELECT value FROM json_each(?)) AND instr(folded, ?) > 0",
+                (json.dumps(candidates), q)
+            )
+            for entry_id, rank in rows:
+                if entry_id not in scores:
+                    scores[entry_id] = SUBSTRING_MATCH * count + rank
+
+        # Likewise typo-tolerant matches on the long tail only fill in behind exact ones
+        if len(scores) < limit and len(q) >= FUZZY_MIN_LENGTH:
+            selected = []
+            budget = FUZZY_POSTING_BUDGET
+            for posting in postings:
+                if len(posting) > budget:
+                    break
+                budget -= len(posting)
+                selected.append(posting)
+            candidates = [entry_id for entry_id, _ in Counter(chain.from_iterable(selected)).most_common(FUZZY_CANDIDATES)
+                          if entry_id not in scores]
+            max_distance = max_edit_distance(q)
+            for entry_id, folded, rank in self._conn.execute(
+                "SELECT id, folded, rank FROM locations WHERE id IN (SELECT value FROM json_each(?))",
+                (json.dumps(candidates),)
+            ):
+                distance = prefix_edit_distance(q, folded, max_distance)
+                if distance <= max_distance:
+                    scores[entry_id] = (FUZZY_MATCH + distance - 1) * count + rank
+
+        best = heapq.nsmallest(limit, scores.items(), key=itemgetter(1))
+        return self._fetch(entry_id for entry_id, _ in best)
+
+    def nearby(self, lat: float, lon: float, radius_km: float, limit: int = 10) -> List[Dict]:
+        """Cities within radius_km of (lat, lon), nearest first"""
+        found = self.geo.nearby(lat, lon, radius_km, max(0, min(limit, MAX_RESULTS)))
+        return with_coordinates(found, self._fetch(hit[1] for hit in found))
+
+    def nearest(self, lat: float, lon: float, limit: int = 1, max_km: Optional[float] = None) -> List[Dict]:
+        """The closest cities to (lat, lon), optionally no further than max_km"""
+        limit = max(0, min(limit, MAX_RESULTS))
+        found = self.geo.nearest(lat, lon, limit) if max_km is None else self.geo.nearest(lat, lon, limit, max_km)
+        return with_coordinates(found, self._fetch(hit[1] for hit in found))
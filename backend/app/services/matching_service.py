@@ -0,0 +1,428 @@
+import abc
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.founder_service import founder_service
+from app.services.mentor_service import mentor_service
+from app.services.row_events import subscribe
+from app.services.student_service import student_service
+from app.services.supabase_service import supabase_service
+from app.services.table_codecs import TABLE_CODECS
+from app.services.vendor_service import vendor_service
+from app.services.working_professional_service import working_professional_service
+
+# Score = SECTOR_WEIGHT per shared sector + STAGE_WEIGHT if the mentor takes the
+# founder's stage + PROGRAM_WEIGHT if their programme type fits what the founder
+# needs help with, plus location boosts (a same-city mentor gets both)
+SECTOR_WEIGHT = 3.0
+STAGE_WEIGHT = 2.0
+PROGRAM_WEIGHT = 1.5
+SAME_STATE_BOOST = 1.0
+SAME_CITY_BOOST = 1.0
+_STAGE_WEIGHT, _PROGRAM_WEIGHT, _SAME_STATE_BOOST, _SAME_CITY_BOOST = (
+    np.float32(weight) for weight in (STAGE_WEIGHT, PROGRAM_WEIGHT, SAME_STATE_BOOST, SAME_CITY_BOOST))
+
+# Founder categories and mentor focus areas come from different option lists in
+# the registration forms; both are read into one sector vocabulary
+SECTORS = ["d2c", "saas", "fintech", "edtech", "ai", "climate", "healthtech", "social impact", "blockchain",
+           "e-commerce", "manufacturing", "agriculture", "creator", "gaming", "real estate", "transportation",
+           "food & beverage", "fashion", "entertainment"]
+SECTOR_ALIASES = {"ai/ml": "ai", "health": "healthtech", "clean energy": "climate"}
+IGNORED_TAGS = {"", "other", "others", "sector-specific"}
+
+# Mentors pick from STAGES, founders give their startup_status
+STAGES = ["idea stage", "mvp", "early revenue", "scaling"]
+FOUNDER_STAGES = {"just an idea": "idea stage", "prototype/mvp": "mvp", "paying users": "early revenue",
+                  "raised funding": "scaling"}
+
+# Mentor incubator_type, and which of them serve each kind of help a founder asks for
+PROGRAMS = ["incubator", "accelerator", "grant program", "bootcamp/workshop", "startup studio"]
+HELP_PROGRAMS = {
+    "getting incubated": ["incubator", "accelerator", "startup studio"],
+    "fundraising": ["accelerator", "grant program"],
+    "getting feedback on my idea": ["bootcamp/workshop", "incubator", "startup studio"],
+    "finding a cofounder": ["startup studio"],
+    "finding early team/interns": ["startup studio"],
+}
+
+def normalize_tag(value: Any) -> str:
+    return " ".join(str(value).split()).lower()
+
+def _tags(values: Any) -> List[str]:
+    if not values:
+        return []
+    if isinstance(values, str):
+        values = [values]
+    return [tag for tag in (normalize_tag(value) for value in values) if tag not in IGNORED_TAGS]
+
+class TagVocabulary:
+    """Tag -> bit position; at most 64 tags, so any set of them is one uint64"""
+
+    def __init__(self, tags: Iterable[str], aliases: Optional[Dict[str, str]] = None, grow: bool = True):
+        self.aliases = aliases or {}
+        self.bits: Dict[str, int] = {tag: 1 << position for position, tag in enumerate(tags)}
+        self.grow = grow
+
+    def bit(self, tag: str, grow: bool = True) -> int:
+        """The tag's bit; free-text tags get one while there are bits left, otherwise 0 (never matches)"""
+        tag = self.aliases.get(tag, tag)
+        bit = self.bits.get(tag)
+        if bit is None:
+            if not (grow and self.grow) or len(self.bits) >= 64:
+                return 0
+            bit = self.bits[tag] = 1 << len(self.bits)
+        return bit
+
+    def mask(self, tags: Iterable[str], grow: bool = True) -> int:
+        mask = 0
+        for tag in tags:
+            mask |= self.bit(tag, grow)
+        return mask
+
+    def names(self, mask: int) -> List[str]:
+        return [tag for tag, bit in self.bits.items() if mask & bit]
+
+class FounderQuery(NamedTuple):
+    sectors: np.uint64
+    stage: np.uint64
+    programs: np.uint64
+    city: int
+    state: int
+
+def top_k(scores: np.ndarray, k: int) -> List[Tuple[int, float]]:
+    """(position, score) of the k highest scores, best first; scores of 0 or less are left out"""
+    if k <= 0 or not len(scores):
+        return []
+    # Scores take a few distinct values, and argpartition over long runs of ties is slow:
+    # lower the threshold one score level at a time until k positions clear it, then
+    # argpartition just those
+    threshold = scores.max()
+    if threshold <= 0:
+        return []
+    candidates = np.flatnonzero(scores >= threshold)
+    while len(candidates) < k:
+        threshold = np.max(scores, where=scores < threshold, initial=-np.inf)
+        if threshold <= 0:
+            candidates = np.flatnonzero(scores > 0)
+            break
+        candidates = np.flatnonzero(scores >= threshold)
+    if len(candidates) > k:
+        candidates = candidates[np.argpartition(scores[candidates], len(candidates) - k)[-k:]]
+    candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+    return [(int(position), float(scores[position])) for position in candidates]
+
+class SlotArrays(abc.ABC):
+    """
+    Rows of parallel NumPy arrays, one slot per user_id. Subclasses declare
+    COLUMNS ({attribute: (dtype, empty value)}) and SUMMARY (the row fields
+    kept for responses), and fill the columns in upsert(). Arrays grow by
+    doubling; a removed row's slot is reset to the empty values, so it can
+    never match, and reused.
+    """
+
+    COLUMNS: Dict[str, Tuple[Any, Any]] = {}
+    SUMMARY: Tuple[str, ...] = ()
+
+    def __init__(self, capacity: int = 1024, places: Optional[Dict[str, int]] = None):
+        # Pass the same dict to indexes whose city ids are compared with each other
+        self._places: Dict[str, int] = places if places is not None else {}
+        self._slots: Dict[str, int] = {}
+        self._free: List[int] = []
+        self.size = 0
+        self.capacity = 0
+        self.summaries: List[Optional[Dict[str, Any]]] = []
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int):
+        for name, (dtype, empty) in self.COLUMNS.items():
+            array = np.full(capacity, empty, dtype=dtype)
+            if self.capacity:
+                array[:self.size] = getattr(self, name)[:self.size]
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    @classmethod
+    def from_rows(cls, rows: List[Dict[str, Any]], **kwargs):
+        index = cls(max(1024, len(rows)), **kwargs)
+        for row in rows:
+            index.upsert(row)
+        return index
+
+    def place_id(self, name: Any, grow: bool = True) -> int:
+        """Integer id of a city or state name; -1 when missing (or unknown and grow=False)"""
+        if not name:
+            return -1
+        key = normalize_tag(name)
+        place = self._places.get(key)
+        if place is None:
+            if not grow:
+                return -1
+            place = self._places[key] = len(self._places)
+        return place
+
+    def slot(self, user_id: str) -> Optional[int]:
+        return self._slots.get(user_id)
+
+    def _claim(self, row: Dict[str, Any]) -> Optional[int]:
+        """The row's slot, allocated if new, with its summary stored; None for rows without a user_id"""
+        user_id = row.get("user_id")
+        if not user_id:
+            return None
+        slot = self._slots.get(user_id)
+        if slot is None:
+            if self._free:
+                slot = self._free.pop()
+            else:
+                if self.size == self.capacity:
+                    self._allocate(self.capacity * 2)
+                slot = self.size
+                self.size += 1
+                self.summaries.append(None)
+            self._slots[user_id] = slot
+        self.summaries[slot] = {field: row.get(field) for field in self.SUMMARY}
+        return slot
+
+    @abc.abstractmethod
+    def upsert(self, row: Dict[str, Any]):
+        """Store the row in its slot's columns (see _claim)"""
+
+    def remove(self, user_id: str):
+        slot = self._slots.pop(user_id, None)
+        if slot is not None:
+            for name, (_, empty) in self.COLUMNS.items():
+                getattr(self, name)[slot] = empty
+            self.summaries[slot] = None
+            self._free.append(slot)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+class MentorIndex(SlotArrays):
+    """
+    Every mentor as one row of parallel NumPy arrays: sectors, stages and
+    programme type as uint64 bitsets, city and state as integer ids. Scoring
+    a founder against all mentors is a handful of whole-array operations
+    (AND + popcount for the sector overlap, compares for the rest), and the
+    top k come from argpartition over the highest score levels.
+    """
+
+    COLUMNS = {
+        "sector_bits": (np.uint64, 0),
+        "stage_bits": (np.uint64, 0),
+        "program_bits": (np.uint64, 0),
+        "city_ids": (np.int32, -1),
+        "state_ids": (np.int32, -1),
+    }
+    SUMMARY = ("user_id", "name", "organisation", "city", "state", "incubator_type", "focus_areas",
+               "preferred_startup_stage", "linkedin", "url")
+
+    def __init__(self, capacity: int = 1024):
+        self.sectors = TagVocabulary(SECTORS, SECTOR_ALIASES)
+        self.stages = TagVocabulary(STAGES, grow=False)
+        self.programs = TagVocabulary(PROGRAMS, grow=False)
+        super().__init__(capacity)
+
+    def upsert(self, row: Dict[str, Any]):
+        slot = self._claim(row)
+        if slot is None:
+            return
+        self.sector_bits[slot] = self.sectors.mask(_tags(row.get("focus_areas")))
+        self.stage_bits[slot] = self.stages.mask(_tags(row.get("preferred_startup_stage")))
+        self.program_bits[slot] = self.programs.mask(_tags(row.get("incubator_type")))
+        self.city_ids[slot] = self.place_id(row.get("city"))
+        self.state_ids[slot] = self.place_id(row.get("state"))
+
+    def query(self, founder: Dict[str, Any]) -> FounderQuery:
+        """A founder row as the bitsets and ids it is compared on"""
+        stage = FOUNDER_STAGES.get(normalize_tag(founder.get("startup_status") or ""), "")
+        programs = [program for help in _tags(founder.get("help_needed")) for program in HELP_PROGRAMS.get(help, ())]
+        return FounderQuery(
+            sectors=np.uint64(self.sectors.mask(_tags(founder.get("category")), grow=False)),
+            stage=np.uint64(self.stages.bit(stage, grow=False) if stage else 0),
+            programs=np.uint64(self.programs.mask(programs, grow=False)),
+            city=self.place_id(founder.get("city"), grow=False),
+            state=self.place_id(founder.get("state"), grow=False),
+        )
+
+    def score(self, query: FounderQuery) -> np.ndarray:
+        """Score of every slot for this founder, in one pass per feature"""
+        n = self.size
+        scores = np.bitwise_count(self.sector_bits[:n] & query.sectors).astype(np.float32)
+        scores *= SECTOR_WEIGHT
+        # Boolean arrays times a float32 weight, added in place: no fancy indexing on the hot path
+        if query.stage:
+            scores += ((self.stage_bits[:n] & query.stage) != 0) * _STAGE_WEIGHT
+        if query.programs:
+            scores += ((self.program_bits[:n] & query.programs) != 0) * _PROGRAM_WEIGHT
+        if query.state >= 0:
+            scores += (self.state_ids[:n] == query.state) * _SAME_STATE_BOOST
+        if query.city >= 0:
+            scores += (self.city_ids[:n] == query.city) * _SAME_CITY_BOOST
+        return scores
+
+    def top(self, query: FounderQuery, k: int) -> List[Tuple[int, float]]:
+        """(slot, score) of the k best-scoring mentors, best first; mentors scoring 0 are left out"""
+        return top_k(self.score(query), k)
+
+    def explain(self, slot: int, score: float, query: FounderQuery) -> Dict[str, Any]:
+        return {
+            **self.summaries[slot],
+            "score": round(score, 2),
+            "shared_sectors": self.sectors.names(int(self.sector_bits[slot] & query.sectors)),
+            "stage_match": bool(self.stage_bits[slot] & query.stage),
+            "program_match": bool(self.program_bits[slot] & query.programs),
+            "same_city": query.city >= 0 and int(self.city_ids[slot]) == query.city,
+            "same_state": query.state >= 0 and int(self.state_ids[slot]) == query.state,
+        }
+
+# The services' mock rows, read instead of the tables when Supabase is not configured
+_MOCK_TABLES: Dict[str, Callable[[], Awaitable[List[Dict[str, Any]]]]] = {
+    "landing_founders": founder_service.get_all_founders,
+    "landing_mentors": mentor_service.get_all_mentors,
+    "landing_student": student_service.get_all_students,
+    "landing_vendor": vendor_service.get_all_vendors,
+    "landing_working_professional": working_professional_service.get_all_working_professionals,
+}
+
+# Table reads in progress; index builds running at the same time (the startup warm-up) share them
+_table_reads: Dict[str, asyncio.Task] = {}
+
+def _fetch_table(table: str) -> Optional[List[Dict[str, Any]]]:
+    """Every row of a table, decoded, or None when Supabase is not configured. Blocking"""
+    if not supabase_service.supabase:
+        return None
+    return TABLE_CODECS[table].decode_many(list(supabase_service.iter_table(table)))
+
+async def _read_table(table: str) -> List[Dict[str, Any]]:
+    rows = await asyncio.to_thread(_fetch_table, table)
+    return await _MOCK_TABLES[table]() if rows is None else rows
+
+async def read_table(table: str) -> List[Dict[str, Any]]:
+    """All rows of a landing table, read page by page in a worker thread; raises if a page fails"""
+    task = _table_reads.get(table)
+    if task is None:
+        task = _table_reads[table] = asyncio.create_task(_read_table(table))
+        task.add_done_callback(lambda _: _table_reads.pop(table, None))
+    return await asyncio.shield(task)
+
+class TableIndexService(abc.ABC):
+    """
+    An in-memory index built from landing tables: loaded on first use (or by
+    the startup warm-up), kept current by this worker's writes through
+    row_events, and rebuilt in the background every MATCHING_REFRESH_INTERVAL
+    seconds to pick up writes made through other workers. Subclasses list the
+    tables they read, follow them with self.subscribe and implement build(),
+    which gets every row of each; the reads are paged and run off the event
+    loop (see read_table). Writes made while a load is reading and building
+    reach the old index, so they are kept and replayed onto the new one.
+    """
+
+    name = "index"
+    tables: Tuple[str, ...] = ()
+
+    def __init__(self):
+        self.loaded = False
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+        self._refresh: Optional[asyncio.Task] = None
+        # Row events seen while load() is in flight: (listener, row or user_id)
+        self._missed: Optional[List[Tuple[Callable[[Any], None], Any]]] = None
+
+    def subscribe(self, table: str, on_upsert: Callable[[Dict[str, Any]], None], on_delete: Callable[[str], None]):
+        """row_events.subscribe, keeping the events that arrive during a load to replay after its build"""
+        def follow(listener: Callable[[Any], None]) -> Callable[[Any], None]:
+            def handle(value: Any):
+                if self._missed is not None:
+                    self._missed.append((listener, value))
+                listener(value)
+            return handle
+        subscribe(table, follow(on_upsert), follow(on_delete))
+
+    @abc.abstractmethod
+    async def build(self, rows: Dict[str, List[Dict[str, Any]]]) -> str:
+        """Swap in fresh indexes built from rows (table -> all its rows); returns a summary for the log"""
+
+    async def load(self):
+        start = time.perf_counter()
+        self._missed = []
+        try:
+            tables = await asyncio.gather(*(read_table(table) for table in self.tables))
+            summary = await self.build(dict(zip(self.tables, tables)))
+            # The listeners read the swapped-in indexes, and nothing has awaited since the swap
+            for listener, value in self._missed:
+                try:
+                    listener(value)
+                except Exception as e:
+                    print(f"Error replaying a row event onto {self.name}: {e}")
+        finally:
+            self._missed = None
+        self.loaded, self._loaded_at = True, time.monotonic()
+        print(f"{self.name} built: {summary} in {time.perf_counter() - start:.2f}s")
+
+    async def _refresh_in_background(self):
+        try:
+            await self.load()
+        except Exception as e:
+            # Keep serving the current index; the next request after the interval tries again
+            self._loaded_at = time.monotonic()
+            print(f"Error refreshing {self.name}: {e}")
+
+    async def ensure_loaded(self):
+        if not self.loaded:
+            async with self._lock:
+                if not self.loaded:
+                    await self.load()
+        elif (settings.MATCHING_REFRESH_INTERVAL > 0
+              and time.monotonic() - self._loaded_at > settings.MATCHING_REFRESH_INTERVAL
+              and (self._refresh is None or self._refresh.done())):
+            self._refresh = asyncio.create_task(self._refresh_in_background())
+
+class MatchingService(TableIndexService):
+    """Founder -> mentor recommendations from an in-memory MentorIndex"""
+
+    name = "Mentor matching index"
+    tables = ("landing_mentors", "landing_founders")
+
+    def __init__(self):
+        super().__init__()
+        self.index = MentorIndex()
+        self._founders: Dict[str, Dict[str, Any]] = {}
+        self.subscribe("landing_mentors", lambda row: self.index.upsert(row), lambda user_id: self.index.remove(user_id))
+        self.subscribe("landing_founders", self._founder_upserted, self._founder_deleted)
+
+    def _founder_upserted(self, row: Dict[str, Any]):
+        if row.get("user_id"):
+            self._founders[row["user_id"]] = row
+
+    def _founder_deleted(self, user_id: str):
+        self._founders.pop(user_id, None)
+
+    async def build(self, rows: Dict[str, List[Dict[str, Any]]]) -> str:
+        self.index = await asyncio.to_thread(MentorIndex.from_rows, rows["landing_mentors"])
+        self._founders = {founder["user_id"]: founder for founder in rows["landing_founders"] if founder.get("user_id")}
+        return f"{len(self.index)} mentors, {len(self._founders)} founders"
+
+    async def match_founder(self, user_id: str, limit: int = 10) -> Dict[str, Any]:
+        """The best mentors for a founder, with why each one matched"""
+        await self.ensure_loaded()
+        founder = self._founders.get(user_id) or await founder_service.get_founder(user_id)
+        if not founder:
+            return {"success": False, "error": "Founder not found"}
+        index = self.index
+        start = time.perf_counter()
+        query = index.query(founder)
+        matches = [index.explain(slot, score, query) for slot, score in index.top(query, limit)]
+        return {
+            "success": True,
+            "founder_id": user_id,
+            "matches": matches,
+            "mentors_scored": len(index),
+            "took_ms": round((time.perf_counter() - start) * 1e3, 3),
+        }
+
+# Global instance
+matching_service = MatchingService()
@@ -1,33 +1,37 @@
-from supabase import create_client, Client
-from app.core.config import settings
-from typing import Optional, Dict, Any, List
-import os
+from app.services.supabase_service import supabase_service
+from app.services.row_events import row_deleted, row_upserted
+from app.services.table_codecs import TABLE_CODECS
+from typing import TYPE_CHECKING, Optional, Dict, Any, List
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 class MentorService:
     def __init__(self):
-        # Use placeholder values if environment variables are not set
-        supabase_url = settings.SUPABASE_URL if settings.SUPABASE_URL != "your-supabase-project-url" else "https://placeholder.supabase.co"
-        supabase_key = settings.SUPABASE_SERVICE_ROLE_KEY
-        
-        try:
-            self.supabase: Client = create_client(supabase_url, supabase_key)
-        except Exception as e:
-            print(f"Warning: Could not initialize Supabase client: {e}")
-            self.supabase = None
+        self.codec = TABLE_CODECS["landing_mentors"]
+    
+    @property
+    def supabase(self) -> Optional["Client"]:
+        """The shared client (see SupabaseService), None when Supabase is not configured"""
+        return supabase_service.supabase
     
     async def create_mentor(self, mentor_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new mentor record"""
         if not self.supabase:
             print("Warning: Supabase not initialized, returning mock data")
-            return {
+            return self.codec.decode({
                 **mentor_data,
                 "user_id": "mock-mentor-id",
                 "created_at": "2024-01-01T00:00:00Z"
-            }
+            })
         
         try:
-            response = self.supabase.table("landing_mentors").insert(mentor_data).execute()
-            return response.data[0] if response.data else None
+            response = self.supabase.table("landing_mentors").insert(self.codec.encode(mentor_data)).execute()
+            if not response.data:
+                return None
+            result = self.codec.decode(response.data[0])
+            row_upserted("landing_mentors", result)
+            return result
         except Exception as e:
             print(f"Error creating mentor: {e}")
             raise
@@ -36,7 +40,7 @@ class MentorService:
         """Get mentor by user_id"""
         if not self.supabase:
             print("Warning: Supabase not initialized, returning mock data")
-            return {
+            return self.codec.decode({
                 "user_id": user_id,
                 "name": "Dr. Sarah Johnson",
                 "email": "sarah@mentor.com",
@@ -47,11 +51,11 @@ class MentorService:
                 "city": "San Francisco",
                 "state": "CA",
                 "created_at": "2024-01-01T00:00:00Z"
-            }
+            })
         
         try:
             response = self.supabase.table("landing_mentors").select("*").eq("user_id", user_id).execute()
-            return response.data[0] if response.data else None
+            return self.codec.decode(response.data[0]) if response.data else None
         except Exception as e:
             print(f"Error getting mentor: {e}")
             return None
@@ -60,11 +64,15 @@ class MentorService:
         """Update mentor record"""
         if not self.supabase:
             print("Warning: Supabase not initialized, returning mock data")
-            return {**update_data, "user_id": user_id, "updated_at": "2024-01-01T00:00:00Z"}
+            return self.codec.decode({**update_data, "user_id": user_id, "updated_at": "2024-01-01T00:00:00Z"})
         
         try:
-            response = self.supabase.table("landing_mentors").update(update_data).eq("user_id", user_id).execute()
-            return response.data[0] if response.data else None
+            response = self.supabase.table("landing_mentors").update(self.codec.encode(update_data)).eq("user_id", user_id).execute()
+            if not response.data:
+                return None
+            result = self.codec.decode(response.data[0])
+            row_upserted("landing_mentors", result)
+            return result
         except Exception as e:
             print(f"Error updating mentor: {e}")
             return None
@@ -73,7 +81,7 @@ class MentorService:
         """Get all mentors"""
         if not self.supabase:
             print("Warning: Supabase not initialized, returning mock data")
-            return [
+            return self.codec.decode_many([
                 {
                     "user_id": "mentor-1",
                     "name": "Dr. Sarah Johnson",
@@ -110,11 +118,11 @@ class MentorService:
                     "state": "TX",
                     "created_at": "2024-01-01T00:00:00Z"
                 }
-            ]
+            ])
         
         try:
             response = self.supabase.table("landing_mentors").select("*").order("created_at", desc=True).execute()
-            return response.data
+            return self.codec.decode_many(response.data or [])
         except Exception as e:
             print(f"Error getting all mentors: {e}")
             return []
@@ -127,6 +135,7 @@ class MentorService:
         
         try:
             response = self.supabase.table("landing_mentors").delete().eq("user_id", user_id).execute()
+            row_deleted("landing_mentors", user_id)
             return True
         except Exception as e:
             print(f"Error deleting mentor: {e}")
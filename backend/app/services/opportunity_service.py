@@ -0,0 +1,283 @@
+import asyncio
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from app.services.founder_service import founder_service
+from app.services.matching_service import SlotArrays, TableIndexService, _tags, normalize_tag, top_k
+from app.services.student_service import student_service
+
+# One bit layout for both sides: what a student is looking for and what a startup
+# can offer. Opportunity types in the low bits, functions from bit 16.
+OPPORTUNITIES = ["internship", "project", "job", "side hustle", "cofounder"]
+FUNCTIONS = ["marketing", "product", "tech", "operations", "design"]
+BITS = {name: 1 << position for position, name in enumerate(OPPORTUNITIES)}
+BITS.update({name: 1 << (16 + position) for position, name in enumerate(FUNCTIONS)})
+OPPORTUNITY_MASK = np.uint64(sum(BITS[name] for name in OPPORTUNITIES))
+FUNCTION_MASK = np.uint64(sum(BITS[name] for name in FUNCTIONS))
+
+# Similarity = FUNCTION_WEIGHT per shared function + OPPORTUNITY_WEIGHT per shared
+# opportunity type + SAME_CITY_BOOST
+FUNCTION_WEIGHT = np.float32(3.0)
+OPPORTUNITY_WEIGHT = np.float32(2.0)
+SAME_CITY_BOOST = np.float32(1.0)
+
+# Founder help_needed -> (opportunity types, functions) it opens up for students
+HELP_OFFERS = {
+    "finding early team/interns": (["internship", "project", "job"], []),
+    "finding a cofounder": (["cofounder", "side hustle"], []),
+    "finding vendors (tech, design, branding, etc.)": (["project", "side hustle"], ["tech", "design", "marketing"]),
+}
+# Founder category -> the functions an early team in it needs most
+CATEGORY_FUNCTIONS = {
+    "d2c": ["marketing", "operations", "design"],
+    "saas": ["tech", "product"],
+    "fintech": ["tech", "product", "operations"],
+    "edtech": ["product", "marketing", "tech"],
+    "creator": ["marketing", "design"],
+    "ai": ["tech", "product"],
+    "climate": ["tech", "operations"],
+    "health": ["tech", "operations"],
+    "e-commerce": ["marketing", "operations", "tech"],
+    "gaming": ["tech", "design"],
+    "real estate": ["operations", "marketing"],
+    "transportation": ["operations", "tech"],
+    "food & beverage": ["operations", "marketing"],
+    "fashion": ["design", "marketing"],
+    "entertainment": ["marketing", "design"],
+}
+# Student availability -> the opportunity types that many hours a week allow
+AVAILABILITY_OPPORTUNITIES = {
+    "1-5 hours/week": ["project", "side hustle"],
+    "5-10 hours/week": ["project", "side hustle", "internship"],
+    "10-20 hours/week": ["project", "side hustle", "internship", "cofounder"],
+}
+# Interest levels that mean a student would join (or start) a founding team
+COFOUNDER_INTEREST = {"want to join one", "already tried building one"}
+# Startup statuses that can offer paid work
+PAYING_STATUSES = {"paying users", "raised funding"}
+
+def _mask(names) -> int:
+    mask = 0
+    for name in names:
+        mask |= BITS.get(name, 0)
+    return mask
+
+def _names(mask: int, names: List[str]) -> List[str]:
+    return [name for name in names if mask & BITS[name]]
+
+class StudentQuery(NamedTuple):
+    bits: np.uint64
+    paid_only: bool
+    onsite_only: bool
+    city: int
+
+class StartupQuery(NamedTuple):
+    bits: np.uint64
+    can_pay: bool
+    city: int
+
+def student_features(row: Dict[str, Any]) -> Tuple[int, bool, bool]:
+    """(wanted bits, paid only, on-site only) for a student row"""
+    goals = set(_tags(row.get("career_goals")))
+    if normalize_tag(row.get("interest_level") or "") in COFOUNDER_INTEREST:
+        goals.add("cofounder")
+    allowed = AVAILABILITY_OPPORTUNITIES.get(normalize_tag(row.get("availability") or ""))
+    if allowed is not None:
+        goals.intersection_update(allowed)
+    bits = _mask(goals) | _mask(tag for tag in _tags(row.get("interest_area")) if tag in FUNCTIONS)
+    return (bits, normalize_tag(row.get("payment_terms") or "") == "paid only",
+            normalize_tag(row.get("location_preference") or "") == "on-site only")
+
+def startup_features(row: Dict[str, Any]) -> Tuple[int, bool]:
+    """(offered bits, can pay) for a founder row"""
+    offers, functions = set(), set()
+    for help in _tags(row.get("help_needed")):
+        help_offers, help_functions = HELP_OFFERS.get(help, ((), ()))
+        offers.update(help_offers)
+        functions.update(help_functions)
+    for category in _tags(row.get("category")):
+        functions.update(CATEGORY_FUNCTIONS.get(category, ()))
+    return _mask(offers) | _mask(functions), normalize_tag(row.get("startup_status") or "") in PAYING_STATUSES
+
+class StudentArrays(SlotArrays):
+    COLUMNS = {
+        "bits": (np.uint64, 0),
+        "paid_only": (np.bool_, False),
+        "onsite_only": (np.bool_, False),
+        "city_ids": (np.int32, -1),
+    }
+    SUMMARY = ("user_id", "name", "college", "course", "year", "city", "career_goals", "interest_area",
+               "availability", "payment_terms", "location_preference")
+
+    def upsert(self, row: Dict[str, Any]):
+        slot = self._claim(row)
+        if slot is not None:
+            self.bits[slot], self.paid_only[slot], self.onsite_only[slot] = student_features(row)
+            self.city_ids[slot] = self.place_id(row.get("city"))
+
+    def query(self, slot: int) -> StudentQuery:
+        return StudentQuery(self.bits[slot], bool(self.paid_only[slot]), bool(self.onsite_only[slot]),
+                            int(self.city_ids[slot]))
+
+class StartupArrays(SlotArrays):
+    COLUMNS = {
+        "bits": (np.uint64, 0),
+        "can_pay": (np.bool_, False),
+        "city_ids": (np.int32, -1),
+    }
+    SUMMARY = ("user_id", "name", "startup_name", "startup_status", "startup_url", "category", "help_needed",
+               "city", "state")
+
+    def upsert(self, row: Dict[str, Any]):
+        slot = self._claim(row)
+        if slot is not None:
+            self.bits[slot], self.can_pay[slot] = startup_features(row)
+            self.city_ids[slot] = self.place_id(row.get("city"))
+
+    def query(self, slot: int) -> StartupQuery:
+        return StartupQuery(self.bits[slot], bool(self.can_pay[slot]), int(self.city_ids[slot]))
+
+class OpportunityIndex:
+    """
+    Students and startups (founders) encoded onto the shared bit layout above,
+    in compact arrays. Both directions apply the hard filters first (at least
+    one shared opportunity type, paid-only students only with startups that
+    can pay, on-site-only students only in the same city) and then rank the
+    survivors by popcount of the shared bits.
+    """
+
+    def __init__(self, students: Optional[StudentArrays] = None, startups: Optional[StartupArrays] = None):
+        # Both sides must map cities to the same ids (an empty side is still the one passed in)
+        places = students._places if students is not None else startups._places if startups is not None else {}
+        self.students = students if students is not None else StudentArrays(places=places)
+        self.startups = startups if startups is not None else StartupArrays(places=places)
+
+    @classmethod
+    def from_rows(cls, students: List[Dict[str, Any]], founders: List[Dict[str, Any]]) -> "OpportunityIndex":
+        places: Dict[str, int] = {}
+        return cls(StudentArrays.from_rows(students, places=places), StartupArrays.from_rows(founders, places=places))
+
+    def student_query(self, row: Dict[str, Any]) -> StudentQuery:
+        bits, paid_only, onsite_only = student_features(row)
+        return StudentQuery(np.uint64(bits), paid_only, onsite_only, self.students.place_id(row.get("city"), grow=False))
+
+    def startup_query(self, row: Dict[str, Any]) -> StartupQuery:
+        bits, can_pay = startup_features(row)
+        return StartupQuery(np.uint64(bits), can_pay, self.startups.place_id(row.get("city"), grow=False))
+
+    @staticmethod
+    def _rank(shared: np.ndarray, same_city: Optional[np.ndarray], k: int) -> List[Tuple[int, float]]:
+        scores = np.bitwise_count(shared & FUNCTION_MASK).astype(np.float32)
+        scores *= FUNCTION_WEIGHT
+        scores += np.bitwise_count(shared & OPPORTUNITY_MASK) * OPPORTUNITY_WEIGHT
+        if same_city is not None:
+            scores += same_city * SAME_CITY_BOOST
+        return top_k(scores, k)
+
+    def startups_for(self, student: StudentQuery, k: int) -> List[Tuple[int, float]]:
+        """(startup slot, score) of the k best startups for a student, best first"""
+        startups, n = self.startups, self.startups.size
+        shared = startups.bits[:n] & student.bits
+        eligible = (shared & OPPORTUNITY_MASK) != 0
+        if student.paid_only:
+            eligible &= startups.can_pay[:n]
+        if student.onsite_only:
+            eligible &= startups.city_ids[:n] == student.city if student.city >= 0 else False
+        candidates = np.flatnonzero(eligible)
+        same_city = startups.city_ids[candidates] == student.city if student.city >= 0 else None
+        return [(int(candidates[i]), score) for i, score in self._rank(shared[candidates], same_city, k)]
+
+    def students_for(self, startup: StartupQuery, k: int) -> List[Tuple[int, float]]:
+        """(student slot, score) of the k best students for a startup, best first"""
+        students, n = self.students, self.students.size
+        shared = students.bits[:n] & startup.bits
+        eligible = (shared & OPPORTUNITY_MASK) != 0
+        if not startup.can_pay:
+            eligible &= ~students.paid_only[:n]
+        if startup.city >= 0:
+            eligible &= ~students.onsite_only[:n] | (students.city_ids[:n] == startup.city)
+        else:
+            eligible &= ~students.onsite_only[:n]
+        candidates = np.flatnonzero(eligible)
+        same_city = students.city_ids[candidates] == startup.city if startup.city >= 0 else None
+        return [(int(candidates[i]), score) for i, score in self._rank(shared[candidates], same_city, k)]
+
+    @staticmethod
+    def explain(arrays: SlotArrays, slot: int, score: float, bits: np.uint64, city: int) -> Dict[str, Any]:
+        shared = int(arrays.bits[slot] & bits)
+        return {
+            **arrays.summaries[slot],
+            "score": round(score, 2),
+            "shared_opportunities": _names(shared, OPPORTUNITIES),
+            "shared_functions": _names(shared, FUNCTIONS),
+            "same_city": city >= 0 and int(arrays.city_ids[slot]) == city,
+        }
+
+class OpportunityService(TableIndexService):
+    """Student <-> startup opportunity matching from an in-memory OpportunityIndex"""
+
+    name = "Opportunity index"
+    tables = ("landing_student", "landing_founders")
+
+    def __init__(self):
+        super().__init__()
+        self.index = OpportunityIndex()
+        self.subscribe("landing_student", lambda row: self.index.students.upsert(row),
+                       lambda user_id: self.index.students.remove(user_id))
+        self.subscribe("landing_founders", lambda row: self.index.startups.upsert(row),
+                       lambda user_id: self.index.startups.remove(user_id))
+
+    async def build(self, rows: Dict[str, List[Dict[str, Any]]]) -> str:
+        self.index = await asyncio.to_thread(OpportunityIndex.from_rows, rows["landing_student"], rows["landing_founders"])
+        return f"{len(self.index.students)} students, {len(self.index.startups)} startups"
+
+    async def startups_for_student(self, user_id: str, limit: int = 10) -> Dict[str, Any]:
+        """The best startups for a student, after the student's hard filters"""
+        await self.ensure_loaded()
+        index = self.index
+        slot = index.students.slot(user_id)
+        if slot is not None:
+            query = index.students.query(slot)
+        else:
+            student = await student_service.get_student(user_id)
+            if not student:
+                return {"success": False, "error": "Student not found"}
+            query = index.student_query(student)
+        start = time.perf_counter()
+        matches = [index.explain(index.startups, startup, score, query.bits, query.city)
+                   for startup, score in index.startups_for(query, limit)]
+        return {
+            "success": True,
+            "student_id": user_id,
+            "matches": matches,
+            "startups_indexed": len(index.startups),
+            "took_ms": round((time.perf_counter() - start) * 1e3, 3),
+        }
+
+    async def students_for_founder(self, user_id: str, limit: int = 10) -> Dict[str, Any]:
+        """The best students for a founder's startup, after the students' hard filters"""
+        await self.ensure_loaded()
+        index = self.index
+        slot = index.startups.slot(user_id)
+        if slot is not None:
+            query = index.startups.query(slot)
+        else:
+            founder = await founder_service.get_founder(user_id)
+            if not founder:
+                return {"success": False, "error": "Founder not found"}
+            query = index.startup_query(founder)
+        start = time.perf_counter()
+        matches = [index.explain(index.students, student, score, query.bits, query.city)
+                   for student, score in index.students_for(query, limit)]
+        return {
+            "success": True,
+            "founder_id": user_id,
+            "matches": matches,
+            "students_indexed": len(index.students),
+            "took_ms": round((time.perf_counter() - start) * 1e3, 3),
+        }
+
+# Global instance
+opportunity_service = OpportunityService()
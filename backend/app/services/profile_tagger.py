@@ -0,0 +1,137 @@
+import asyncio
+import json
+import random
+import time
+from typing import Dict, List, Optional
+
+from openai import AsyncOpenAI
+
+from app.services.ai_search_service import ROLE_URLS
+
+# Free-text columns classified per landing table (see SUPABASE_PROFILE_TAGS.sql)
+PROFILE_TEXT_FIELDS = {
+    "landing_student": ["extra_text"],
+    "landing_founders": ["description", "elevator_pitch"],
+    "landing_mentors": ["focus_areas"],
+}
+
+# Interest tags the model may choose from; anything else it returns is dropped
+PROFILE_TAGS = [
+    "fintech", "edtech", "healthtech", "agritech", "climate", "ecommerce", "d2c", "saas", "ai", "deeptech",
+    "gaming", "media", "mobility", "logistics", "social impact", "hardware",
+    "product", "engineering", "design", "marketing", "sales", "operations", "finance", "hr",
+    "fundraising", "hiring", "mentorship", "internships", "networking",
+]
+
+# Longest text sent per row; profile fields are short, this only guards against pasted essays
+MAX_TEXT_CHARS = 2000
+
+TAGGING_PROMPT = f"""You classify profiles on The CoFounder Circle, a startup ecosystem platform.
+Given the free text a user wrote on their profile, reply with a JSON object:
+{{"role": <one of {json.dumps(list(ROLE_URLS))}>, "tags": <up to 5 of the allowed tags>}}
+
+role is what the person mainly is or wants: learning (student), building a startup (founder),
+mentoring or investing (mentor), selling services to startups (vendor), or career growth
+(working professional).
+
+Allowed tags: {", ".join(PROFILE_TAGS)}
+Use only allowed tags, most relevant first. Reply with the JSON object only."""
+
+def profile_text(row: Dict, fields: List[str]) -> str:
+    """The row's free-text fields joined into one input (list columns are comma-joined)"""
+    parts = []
+    for field in fields:
+        value = row.get(field)
+        if isinstance(value, list):
+            value = ", ".join(str(v) for v in value if v)
+        if value and str(value).strip():
+            parts.append(str(value).strip())
+    return "\n".join(parts)[:MAX_TEXT_CHARS]
+
+def parse_tags_response(content: str) -> Dict:
+    """Validate the model's JSON reply into {"role", "tags"}; raises ValueError if unusable"""
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Reply is not JSON: {content[:80]!r}") from e
+    role = str(data.get("role", "")).strip().lower()
+    if role not in ROLE_URLS:
+        raise ValueError(f"Invalid role {role!r}")
+    tags = []
+    for tag in data.get("tags") or []:
+        tag = str(tag).strip().lower()
+        if tag in PROFILE_TAGS and tag not in tags:
+            tags.append(tag)
+    return {"role": role, "tags": tags[:5]}
+
+class RateLimiter:
+    """Token bucket shared by all workers: at most `rate` acquisitions per second, bursting to `burst`"""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                # Holding the lock while sleeping keeps waiters in arrival order
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+class ProfileTagger:
+    """
+    Role and interest tags for profile text from an OpenAI-compatible model.
+
+    Every attempt waits for the shared rate limiter and has its own timeout;
+    failed attempts (errors, timeouts, unusable replies) are retried with
+    exponential backoff and jitter, up to max_retries.
+    """
+
+    def __init__(self, client: AsyncOpenAI, model: str, limiter: RateLimiter, timeout: float = 10.0,
+                 max_retries: int = 3, backoff: float = 0.5):
+        self.client = client
+        self.model = model
+        self.limiter = limiter
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.stats = {"calls": 0, "retries": 0, "failures": 0}
+
+    async def _call(self, text: str) -> Dict:
+        await self.limiter.acquire()
+        self.stats["calls"] += 1
+        response = await asyncio.wait_for(
+            self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": TAGGING_PROMPT},
+                    {"role": "user", "content": text}
+                ],
+                max_tokens=60,
+                temperature=0,
+                response_format={"type": "json_object"}
+            ),
+            self.timeout
+        )
+        return parse_tags_response(response.choices[0].message.content)
+
+    async def tag(self, text: str) -> Dict:
+        """{"role", "tags"} for text; raises the last error once retries are exhausted"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await self._call(text)
+            except Exception:
+                if attempt == self.max_retries:
+                    self.stats["failures"] += 1
+                    raise
+                self.stats["retries"] += 1
+                delay = self.backoff * (2 ** attempt)
+                await asyncio.sleep(delay + random.uniform(0, delay))
@@ -0,0 +1,138 @@
+import json
+import os
+from math import exp, log, sqrt
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.services.ai_search_cache import normalize_input
+
+# Bumped whenever the artifact layout below changes
+ARTIFACT_VERSION = 1
+
+def role_features(normalized: str) -> Dict[str, float]:
+    """Binary word unigrams, bigrams and in-word character trigrams (for typos and plurals)"""
+    words = normalized.split()
+    features = {f"w:{word}": 1.0 for word in words}
+    features.update((f"b:{a} {b}", 1.0) for a, b in zip(words, words[1:]))
+    for word in words:
+        if len(word) > 3:
+            padded = f"<{word}>"
+            features.update((f"c:{padded[i:i + 3]}", 1.0) for i in range(len(padded) - 2))
+    return features
+
+def _softmax(scores: List[float]) -> List[float]:
+    top = max(scores)
+    exps = [exp(s - top) for s in scores]
+    total = sum(exps)
+    return [e / total for e in exps]
+
+class RoleClassifier:
+    """
+    TF-IDF + multinomial logistic regression over role_features.
+
+    Small enough to score an input in microseconds: only the input's own
+    features are looked up. Trained offline by scripts/train_role_classifier.py
+    and loaded from a JSON artifact.
+    """
+
+    def __init__(self, roles: List[str], idf: Dict[str, float], weights: Dict[str, List[float]], bias: List[float]):
+        self.roles = roles
+        self.idf = idf
+        self.weights = weights
+        self.bias = bias
+
+    def _vector(self, text: str) -> Dict[str, float]:
+        idf = self.idf
+        vector = {f: idf[f] for f in role_features(normalize_input(text)) if f in idf}
+        norm = sqrt(sum(v * v for v in vector.values())) or 1.0
+        return {f: v / norm for f, v in vector.items()}
+
+    def probabilities(self, text: str) -> Dict[str, float]:
+        scores = list(self.bias)
+        for feature, value in self._vector(text).items():
+            for i, weight in enumerate(self.weights[feature]):
+                scores[i] += weight * value
+        return dict(zip(self.roles, _softmax(scores)))
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        """Most likely role and its probability"""
+        probabilities = self.probabilities(text)
+        role = max(probabilities, key=probabilities.get)
+        return role, probabilities[role]
+
+    def to_json(self) -> Dict:
+        return {
+            "version": ARTIFACT_VERSION,
+            "roles": self.roles,
+            "idf": self.idf,
+            "weights": self.weights,
+            "bias": self.bias,
+        }
+
+    def save(self, path: str):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_json(), f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "RoleClassifier":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != ARTIFACT_VERSION:
+            raise ValueError(f"Unsupported role classifier artifact in {path}; retrain it with scripts/train_role_classifier.py")
+        return cls(data["roles"], data["idf"], data["weights"], data["bias"])
+
+def load_role_classifier(path: Optional[str]) -> Optional[RoleClassifier]:
+    """The classifier at path, or None (fast path disabled) if it is missing or unreadable"""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        return RoleClassifier.load(path)
+    except Exception as e:
+        print(f"Error loading role classifier, local fast path disabled: {e}")
+        return None
+
+def train_role_classifier(examples: Iterable[Tuple[str, str]], roles: List[str], epochs: int = 500,
+                          learning_rate: float = 4.0, l2: float = 1e-4) -> RoleClassifier:
+    """
+    Fit the classifier on (user_input, role) pairs with full-batch gradient
+    descent on the L2-regularised cross-entropy. Features seen in fewer than
+    two examples are dropped.
+    """
+    examples = [(role_features(normalize_input(text)), roles.index(role)) for text, role in examples]
+    document_frequency: Dict[str, int] = {}
+    for features, _ in examples:
+        for feature in features:
+            document_frequency[feature] = document_frequency.get(feature, 0) + 1
+    count = len(examples)
+    idf = {f: log((1 + count) / (1 + df)) + 1 for f, df in document_frequency.items() if df >= 2}
+
+    model = RoleClassifier(roles, idf, {f: [0.0] * len(roles) for f in idf}, [0.0] * len(roles))
+    vectors = []
+    for features, label in examples:
+        vector = {f: idf[f] for f in features if f in idf}
+        norm = sqrt(sum(v * v for v in vector.values())) or 1.0
+        vectors.append(({f: v / norm for f, v in vector.items()}, label))
+
+    for _ in range(epochs):
+        weight_gradient = {f: [0.0] * len(roles) for f in idf}
+        bias_gradient = [0.0] * len(roles)
+        for vector, label in vectors:
+            scores = list(model.bias)
+            for feature, value in vector.items():
+                for i, weight in enumerate(model.weights[feature]):
+                    scores[i] += weight * value
+            probabilities = _softmax(scores)
+            probabilities[label] -= 1.0
+            for i, error in enumerate(probabilities):
+                bias_gradient[i] += error
+                for feature, value in vector.items():
+                    weight_gradient[feature][i] += error * value
+
+        step = learning_rate / count
+        for feature, gradient in weight_gradient.items():
+            weights = model.weights[feature]
+            for i in range(len(roles)):
+                weights[i] -= step * gradient[i] + learning_rate * l2 * weights[i]
+        model.bias = [b - step * g for b, g in zip(model.bias, bias_gradient)]
+    return model
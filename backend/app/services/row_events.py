@@ -0,0 +1,28 @@
+from collections import defaultdict
+from typing import Any, Callable, Dict, List
+
+# In-memory indexes built from the landing tables subscribe here to stay current
+# with writes made through this worker. Other workers' writes reach them through
+# their periodic rebuilds.
+_upsert_listeners: Dict[str, List[Callable[[Dict[str, Any]], None]]] = defaultdict(list)
+_delete_listeners: Dict[str, List[Callable[[str], None]]] = defaultdict(list)
+
+def subscribe(table: str, on_upsert: Callable[[Dict[str, Any]], None], on_delete: Callable[[str], None]):
+    """Call on_upsert(row) after a row of `table` is created or updated, on_delete(user_id) after a delete"""
+    _upsert_listeners[table].append(on_upsert)
+    _delete_listeners[table].append(on_delete)
+
+def row_upserted(table: str, row: Dict[str, Any]):
+    """Services call this with the decoded row the database returned; listener errors never fail the write"""
+    for listener in _upsert_listeners.get(table, ()):
+        try:
+            listener(row)
+        except Exception as e:
+            print(f"Error updating index for {table} row {row.get('user_id')}: {e}")
+
+def row_deleted(table: str, user_id: str):
+    for listener in _delete_listeners.get(table, ()):
+        try:
+            listener(user_id)
+        except Exception as e:
+            print(f"Error removing {table} row {user_id} from index: {e}")
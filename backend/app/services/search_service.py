@@ -0,0 +1,396 @@
+import asyncio
+import hashlib
+import inspect
+import math
+import multiprocessing
+import os
+import re
+import tempfile
+import time
+from array import array
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import orjson
+
+from app.core.config import settings
+from app.services.matching_service import TableIndexService, top_k
+
+# Profile kinds, their table, the indexed fields with their boosts (short, name-like
+# fields count for more per word than free text) and the field shown as the title
+KINDS = ("founder", "mentor", "student", "working_professional")
+SOURCES = {
+    "landing_founders": ("founder", {"startup_name": 3.0, "elevator_pitch": 1.5, "description": 1.0}, "startup_name"),
+    "landing_mentors": ("mentor", {"organisation": 2.0}, "organisation"),
+    "landing_student": ("student", {"college": 2.0, "course": 1.5}, "college"),
+    "landing_working_professional": ("working_professional", {"role": 2.0, "company": 2.0}, "company"),
+}
+
+# BM25 term-frequency saturation and length normalisation
+K1 = 1.2
+B = 0.75
+SNAPSHOT_VERSION = 2
+# Scored docs sampled per query to find a score the top k must reach
+SAMPLE_SIZE = 2048
+
+TOKEN = re.compile(r"[^\W_]+")
+STOPWORDS = frozenset(
+    "a an and are as at be been but by for from has have in into is it its of on or our that the their this "
+    "to was we were will with you your".split()
+)
+_VOWEL = re.compile(r"[aeiouy]")
+_stems: Dict[str, str] = {}
+
+def stem(word: str) -> str:
+    """
+    A light English stemmer: plurals, -ment/-ness/-ly, -ing/-ed (undoubling
+    the last consonant) and a final -e. Crude, but applied the same way to
+    documents and queries, so "funded", "funding" and "funds" all meet at
+    "fund".
+    """
+    if len(word) <= 3 or not word.isascii() or not word.isalpha():
+        return word
+    if word.endswith("ies") and len(word) > 4:
+        word = word[:-3] + "y"
+    elif word.endswith("sses"):
+        word = word[:-2]
+    elif word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        word = word[:-1]
+    for suffix in ("ment", "ness", "ly"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 4:
+            word = word[:-len(suffix)]
+            break
+    for suffix in ("ing", "ed"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3 and _VOWEL.search(word[:-len(suffix)]):
+            word = word[:-len(suffix)]
+            if len(word) > 3 and word[-1] == word[-2] and word[-1] not in "lsz":
+                word = word[:-1]
+            break
+    if word.endswith("e") and len(word) > 4:
+        word = word[:-1]
+    return word
+
+def tokenize(text: Any) -> List[str]:
+    """Lowercased word tokens without stopwords, stemmed"""
+    if not text or not isinstance(text, str):
+        return []
+    tokens = []
+    for word in TOKEN.findall(text.lower()):
+        if word in STOPWORDS:
+            continue
+        stemmed = _stems.get(word)
+        if stemmed is None:
+            stemmed = stem(word)
+            if len(_stems) < 500_000:
+                _stems[word] = stemmed
+        tokens.append(stemmed)
+    return tokens
+
+def _analysis_hash() -> str:
+    """Changes whenever the tokenizer, stemmer, stopwords, field boosts or BM25 setup would index a row differently"""
+    analysis = [inspect.getsource(tokenize), inspect.getsource(stem), TOKEN.pattern, sorted(STOPWORDS), SOURCES, K1, B]
+    return hashlib.sha256(orjson.dumps(analysis)).hexdigest()[:16]
+
+ANALYSIS_HASH = _analysis_hash()
+
+def weighted_terms(row: Dict[str, Any], fields: Dict[str, float]) -> Tuple[Dict[str, float], float]:
+    """BM25F: each term's frequency summed over fields times the field boost, and the doc length likewise"""
+    tf: Dict[str, float] = defaultdict(float)
+    length = 0.0
+    for field, boost in fields.items():
+        tokens = tokenize(row.get(field))
+        length += boost * len(tokens)
+        for token in tokens:
+            tf[token] += boost
+    return tf, length
+
+def _top(scores: np.ndarray, sample: np.ndarray, k: int) -> List[Tuple[int, float]]:
+    """
+    top_k of scores, after dropping everything below the k-th best score at
+    the (distinct) sample positions: k entries are known to reach it, so the
+    true k best all do too, and top_k only sees a few candidates.
+    """
+    if len(scores) > 4 * len(sample) and len(sample) >= k:
+        sampled = scores[sample]
+        threshold = np.partition(sampled, len(sampled) - k)[len(sampled) - k]
+        if threshold > 0:
+            candidates = np.flatnonzero(scores >= threshold)
+            return [(int(candidates[i]), score) for i, score in top_k(scores[candidates], k)]
+    return top_k(scores, k)
+
+class SearchIndex:
+    """
+    BM25F over profile text. The main segment is immutable and compact: a
+    term dictionary and, per term and kind, a slice of doc ids and impacts
+    (the BM25 term weight without idf, precomputed at build time), so a query
+    term costs one vectorised scatter of its posting. Rows written after the build
+    go to a small delta segment scored with the same formula; an updated or
+    deleted row's old doc is only marked dead. As in most inverted indexes,
+    dead docs keep counting towards document frequencies until the next full
+    rebuild merges everything back into a main segment.
+    """
+
+    def __init__(self, terms: List[str], offsets: np.ndarray, postings: np.ndarray, impacts: np.ndarray,
+                 kinds: np.ndarray, user_ids: List[str], names: List[str], titles: List[str],
+                 avgdl: float, built_at: float):
+        self.terms = {term: term_id for term_id, term in enumerate(terms)}
+        self.offsets, self.postings, self.impacts = offsets, postings, impacts
+        self.kinds = kinds
+        self.user_ids, self.names, self.titles = user_ids, names, titles
+        self.avgdl = avgdl or 1.0
+        self.built_at = built_at
+        self._main_docs = len(user_ids)
+        self._delta: Dict[str, Tuple[array, array]] = {}
+        self._delta_kinds = array("b")
+        self._dead: Set[int] = set()
+        self._docs: Optional[Dict[Tuple[int, str], int]] = None
+
+    @classmethod
+    def empty(cls) -> "SearchIndex":
+        return cls([], np.zeros(1, dtype=np.int64), np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32),
+                   np.empty(0, dtype=np.int8), [], [], [], 1.0, time.time())
+
+    @classmethod
+    def from_tables(cls, tables: Dict[str, Iterable[Dict[str, Any]]]) -> "SearchIndex":
+        """Build a main segment from {table: rows} for the tables in SOURCES"""
+        terms: Dict[str, int] = {}
+        term_ids, doc_ids, frequencies = array("i"), array("i"), array("f")
+        kinds, lengths = array("b"), array("f")
+        user_ids, names, titles = [], [], []
+        for table, rows in tables.items():
+            kind, fields, title = SOURCES[table]
+            for row in rows:
+                if not row.get("user_id"):
+                    continue
+                tf, length = weighted_terms(row, fields)
+                doc = len(user_ids)
+                for term, frequency in tf.items():
+                    term_id = terms.get(term)
+                    if term_id is None:
+                        term_id = terms[term] = len(terms)
+                    term_ids.append(term_id)
+                    doc_ids.append(doc)
+                    frequencies.append(frequency)
+                kinds.append(KINDS.index(kind))
+                lengths.append(length)
+                user_ids.append(row["user_id"])
+                names.append(row.get("name") or "")
+                titles.append(row.get(title) or "")
+
+        # Postings grouped by term, then by kind, so a type filter reads a slice
+        doc_ids = np.frombuffer(doc_ids, dtype=np.int32)
+        kinds = np.frombuffer(kinds, dtype=np.int8).copy()
+        groups = np.frombuffer(term_ids, dtype=np.int32).astype(np.int64) * len(KINDS) + kinds[doc_ids]
+        order = np.argsort(groups, kind="stable")
+        postings = doc_ids[order]
+        frequencies = np.frombuffer(frequencies, dtype=np.float32)[order]
+        offsets = np.zeros(len(terms) * len(KINDS) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(groups, minlength=len(terms) * len(KINDS)), out=offsets[1:])
+        lengths = np.frombuffer(lengths, dtype=np.float32)
+        avgdl = float(lengths.mean()) if len(lengths) else 1.0
+        norms = (K1 * (1 - B + B * lengths / avgdl)).astype(np.float32)
+        impacts = frequencies * np.float32(K1 + 1) / (frequencies + norms[postings])
+        return cls(list(terms), offsets, postings, impacts, kinds, user_ids, names, titles, avgdl, time.time())
+
+    def save(self, path: str):
+        """Write the main segment (not the delta) as an .npz, via a temporary file renamed into place"""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        meta = {"version": SNAPSHOT_VERSION, "analysis": ANALYSIS_HASH, "avgdl": self.avgdl, "built_at": self.built_at,
+                "k1": K1, "b": B}
+        strings = orjson.dumps([list(self.terms), self.user_ids[:self._main_docs],
+                                self.names[:self._main_docs], self.titles[:self._main_docs]])
+        with open(tmp_path, "wb") as f:
+            np.savez(f, offsets=self.offsets, postings=self.postings, impacts=self.impacts,
+                     kinds=self.kinds, strings=np.frombuffer(strings, dtype=np.uint8),
+                     meta=np.frombuffer(orjson.dumps(meta), dtype=np.uint8))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["SearchIndex"]:
+        """The snapshot at path, or None when it is missing or from another version or analysis (ANALYSIS_HASH)"""
+        if not path or not os.path.exists(path):
+            return None
+        with np.load(path) as snapshot:
+            meta = orjson.loads(snapshot["meta"].tobytes())
+            if (meta.get("version"), meta.get("analysis")) != (SNAPSHOT_VERSION, ANALYSIS_HASH):
+                return None
+            terms, user_ids, names, titles = orjson.loads(snapshot["strings"].tobytes())
+            return cls(terms, snapshot["offsets"], snapshot["postings"], snapshot["impacts"], snapshot["kinds"],
+                       user_ids, names, titles, meta["avgdl"], meta["built_at"])
+
+    def __len__(self) -> int:
+        return len(self.user_ids) - len(self._dead)
+
+    def _locate(self, kind: int, user_id: str) -> Optional[int]:
+        if self._docs is None:
+            # Only needed once rows change, so not built (or snapshotted) up front
+            kinds = self.kinds.tolist() + self._delta_kinds.tolist()
+            self._docs = {(kinds[doc], uid): doc for doc, uid in enumerate(self.user_ids) if doc not in self._dead}
+        return self._docs.get((kind, user_id))
+
+    def upsert(self, table: str, row: Dict[str, Any]):
+        kind_name, fields, title = SOURCES[table]
+        user_id = row.get("user_id")
+        if not user_id:
+            return
+        kind = KINDS.index(kind_name)
+        self.remove(table, user_id)
+        tf, length = weighted_terms(row, fields)
+        doc = len(self.user_ids)
+        norm = K1 * (1 - B + B * length / self.avgdl)
+        for term, frequency in tf.items():
+            postings = self._delta.get(term)
+            if postings is None:
+                postings = self._delta[term] = (array("i"), array("f"))
+            docs, impacts = postings
+            docs.append(doc)
+            impacts.append(frequency * (K1 + 1) / (frequency + norm))
+        self._delta_kinds.append(kind)
+        self.user_ids.append(user_id)
+        self.names.append(row.get("name") or "")
+        self.titles.append(row.get(title) or "")
+        self._docs[(kind, user_id)] = doc
+
+    def remove(self, table: str, user_id: str):
+        kind = KINDS.index(SOURCES[table][0])
+        doc = self._locate(kind, user_id)
+        if doc is not None:
+            self._dead.add(doc)
+            del self._docs[(kind, user_id)]
+
+    def kind(self, doc: int) -> str:
+        return KINDS[self.kinds[doc] if doc < self._main_docs else self._delta_kinds[doc - self._main_docs]]
+
+    def search(self, query: str, k: int, kind: Optional[str] = None) -> List[Tuple[int, float]]:
+        """(doc, score) of the k best live docs for the query terms (any of them), best first"""
+        n = len(self.user_ids)
+        live = max(1, len(self))
+        kind_id = KINDS.index(kind) if kind else None
+        hits: List[Tuple[np.ndarray, np.ndarray]] = []
+        for term in dict.fromkeys(tokenize(query)):
+            parts = []
+            df = 0
+            term_id = self.terms.get(term)
+            if term_id is not None:
+                group = term_id * len(KINDS)
+                df += int(self.offsets[group + len(KINDS)] - self.offsets[group])
+                if kind_id is not None:
+                    group += kind_id
+                start, end = self.offsets[group], self.offsets[group + (1 if kind_id is not None else len(KINDS))]
+                parts.append((self.postings[start:end], self.impacts[start:end]))
+            delta = self._delta.get(term)
+            if delta:
+                docs, impacts = np.frombuffer(delta[0], dtype=np.int32), np.frombuffer(delta[1], dtype=np.float32)
+                df += len(docs)
+                if kind_id is not None:
+                    keep = np.frombuffer(self._delta_kinds, dtype=np.int8)[docs - self._main_docs] == kind_id
+                    docs, impacts = docs[keep], impacts[keep]
+                parts.append((docs, impacts))
+            if not df:
+                continue
+            idf = np.float32(math.log(1 + (live - df + 0.5) / (df + 0.5)))
+            docs = parts[0][0] if len(parts) == 1 else np.concatenate([docs for docs, _ in parts])
+            impacts = parts[0][1] if len(parts) == 1 else np.concatenate([impacts for _, impacts in parts])
+            hits.append((docs, impacts * idf))
+        if not hits or not any(len(docs) for docs, _ in hits):
+            return []
+        dead = np.fromiter(self._dead, dtype=np.int32, count=len(self._dead))
+
+        if len(hits) == 1 or sum(len(docs) for docs, _ in hits) * 8 < n:
+            # Few postings: score just the docs they touch
+            docs = np.concatenate([docs for docs, _ in hits])
+            weights = np.concatenate([weights for _, weights in hits])
+            if len(hits) > 1:
+                docs, inverse = np.unique(docs, return_inverse=True)
+                weights = np.bincount(inverse, weights=weights).astype(np.float32)
+            if len(dead):
+                weights[np.isin(docs, dead)] = 0
+            sample = np.arange(0, len(weights), max(1, len(weights) // SAMPLE_SIZE))
+            return [(int(docs[i]), score) for i, score in _top(weights, sample, k)]
+
+        scores = np.zeros(n, dtype=np.float32)
+        for docs, weights in hits:
+            scores[docs] += weights
+        scores[dead] = 0
+        sample = np.unique(np.concatenate([docs[:SAMPLE_SIZE] for docs, _ in hits]))
+        return _top(scores, sample, k)
+
+def _build_snapshot(tables: Dict[str, List[Dict[str, Any]]], path: str):
+    """SearchIndex.from_tables(tables) saved to path; what SearchService.build runs in a forked process"""
+    SearchIndex.from_tables(tables).save(path)
+
+class SearchService(TableIndexService):
+    """Full-text search over profiles from an in-memory SearchIndex, snapshotted to SEARCH_SNAPSHOT_PATH"""
+
+    name = "Search index"
+    tables = tuple(SOURCES)
+
+    def __init__(self):
+        super().__init__()
+        self.index = SearchIndex.empty()
+        for table in SOURCES:
+            self.subscribe(table, lambda row, table=table: self.index.upsert(table, row),
+                           lambda user_id, table=table: self.index.remove(table, user_id))
+
+    async def load(self):
+        if not self.loaded and settings.SEARCH_SNAPSHOT_PATH:
+            start = time.perf_counter()
+            try:
+                index = await asyncio.to_thread(SearchIndex.load, settings.SEARCH_SNAPSHOT_PATH)
+            except Exception as e:
+                print(f"Error loading search snapshot: {e}")
+                index = None
+            if index is not None:
+                # Serve the snapshot now and rebuild from the tables behind it, whatever the refresh interval
+                self.index, self.loaded, self._loaded_at = index, True, time.monotonic()
+                print(f"{self.name} loaded from snapshot: {len(index)} docs in {time.perf_counter() - start:.2f}s")
+                self._refresh = asyncio.create_task(self._refresh_in_background())
+                return
+        await super().load()
+
+    async def build(self, rows: Dict[str, List[Dict[str, Any]]]) -> str:
+        # Building is pure Python, so it runs in a forked process to keep it off this worker's
+        # GIL (and search latency); the child inherits the rows rather than being sent them,
+        # and the index comes back as a snapshot, which then replaces SEARCH_SNAPSHOT_PATH
+        directory = os.path.dirname(settings.SEARCH_SNAPSHOT_PATH) if settings.SEARCH_SNAPSHOT_PATH else None
+        fd, path = tempfile.mkstemp(suffix=".npz", dir=directory if directory and os.path.isdir(directory) else None)
+        os.close(fd)
+        try:
+            process = multiprocessing.get_context("fork").Process(target=_build_snapshot, args=(rows, path), daemon=True)
+            process.start()
+            await asyncio.to_thread(process.join)
+            if process.exitcode != 0:
+                raise RuntimeError(f"search index build exited with code {process.exitcode}")
+            index = await asyncio.to_thread(SearchIndex.load, path)
+            if index is None:
+                raise RuntimeError("the rebuilt search snapshot could not be loaded")
+            self.index = index
+            if settings.SEARCH_SNAPSHOT_PATH:
+                try:
+                    os.replace(path, settings.SEARCH_SNAPSHOT_PATH)
+                except Exception as e:
+                    print(f"Error saving search snapshot: {e}")
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+        return f"{len(index)} docs, {len(index.terms)} terms"
+
+    async def search(self, query: str, limit: int = 20, kind: Optional[str] = None) -> Dict[str, Any]:
+        await self.ensure_loaded()
+        index = self.index
+        start = time.perf_counter()
+        results = [
+            {"type": index.kind(doc), "user_id": index.user_ids[doc], "name": index.names[doc],
+             "title": index.titles[doc], "score": round(score, 4)}
+            for doc, score in index.search(query, limit, kind)
+        ]
+        return {
+            "query": query,
+            "results": results,
+            "docs_indexed": len(index),
+            "took_ms": round((time.perf_counter() - start) * 1e3, 3),
+        }
+
+# Global instance
+search_service = SearchService()
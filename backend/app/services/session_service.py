@@ -1,8 +1,46 @@
+import base64
 import uuid
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 from app.services.supabase_service import supabase_service
 from app.core.config import settings
+from app.core.user_agent import parse_user_agent
+
+# Columns callers may project from user_sessions
+SESSION_COLUMNS = (
+    "id", "user_id", "session_token", "login_time", "logout_time", "ip_address",
+    "user_agent", "device_info", "browser", "os", "device_class", "device_fingerprint",
+    "is_active", "created_at", "updated_at"
+)
+
+MAX_HISTORY_PAGE_SIZE = 500
+
+def encode_history_cursor(login_time: str, session_id: str) -> str:
+    """Encode the (login_time, id) of the last row of a page as an opaque cursor"""
+    raw = f"{login_time}|{session_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_history_cursor(cursor: str) -> Tuple[str, str]:
+    """Decode a cursor produced by encode_history_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        login_time, session_id = base64.urlsafe_b64decode(padded).decode("utf-8").split("|", 1)
+        uuid.UUID(session_id)
+        datetime.fromisoformat(login_time.replace("Z", "+00:00"))
+    except Exception:
+        raise ValueError("Invalid history cursor")
+    return login_time, session_id
+
+def history_select_columns(columns: Optional[List[str]] = None) -> str:
+    """Build the select list for history queries, always keeping the cursor keys"""
+    if not columns:
+        return ",".join(SESSION_COLUMNS)
+    
+    unknown = [c for c in columns if c not in SESSION_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown session columns: {', '.join(unknown)}")
+    
+    return ",".join(c for c in SESSION_COLUMNS if c in columns or c in ("id", "login_time"))
 
 class SessionService:
     def __init__(self):
@@ -12,6 +50,10 @@ class SessionService:
                       user_agent: Optional[str] = None, device_info: Optional[str] = None) -> Dict[str, Any]:
         """
         Create a new session for a user
+
+        The device is stored as enum-coded browser/os/device_class columns plus a
+        device_fingerprint hash parsed from the user agent. device_info is only
+        written when a caller passes an explicit description.
         """
         try:
             session_token = str(uuid.uuid4())
@@ -23,7 +65,8 @@ class SessionService:
                 "user_agent": user_agent,
                 "device_info": device_info,
                 "is_active": True,
-                "login_time": datetime.utcnow().isoformat()
+                "login_time": datetime.utcnow().isoformat(),
+                **parse_user_agent(user_agent).to_row()
             }
             
             if not self.supabase.supabase:
@@ -103,10 +146,20 @@ class SessionService:
             print(f"Error getting active sessions: {e}")
             return {"success": False, "error": str(e)}
 
-    def get_session_history(self, user_id: str, limit: int = 10) -> Dict[str, Any]:
+    def get_session_history(self, user_id: str, limit: int = 10, cursor: Optional[str] = None,
+                            start_time: Optional[str] = None, end_time: Optional[str] = None,
+                            ip_address: Optional[str] = None, is_active: Optional[bool] = None,
+                            columns: Optional[List[str]] = None) -> Dict[str, Any]:
         """
-        Get session history for a user
+        Get one page of session history for a user, newest first.
+
+        Pages are keyed on (login_time, id) so each page is a single index range
+        scan regardless of how deep the caller has paged. Pass the returned
+        next_cursor back in to fetch the following page. Raises ValueError for
+        an invalid cursor or column list.
         """
+        after = decode_history_cursor(cursor) if cursor else None
+        select_columns = history_select_columns(columns)
         try:
             if not self.supabase.supabase:
                 print("Warning: Supabase not initialized, returning mock history")
@@ -119,20 +172,82 @@ class SessionService:
                         "is_active": False,
                         "login_time": datetime.utcnow().isoformat(),
                         "logout_time": datetime.utcnow().isoformat()
-                    }]
+                    }],
+                    "next_cursor": None
                 }
             
-            result = self.supabase.supabase.table("user_sessions").select("*").eq("user_id", user_id).order("login_time", desc=True).limit(limit).execute()
+            limit = max(1, min(limit, MAX_HISTORY_PAGE_SIZE))
+            
+            # Fetch one extra row to know whether another page exists
+            query = self._history_query(user_id, select_columns, start_time,
+                                        end_time, ip_address, is_active, after)
+            result = query.limit(limit + 1).execute()
+            rows = result.data or []
+            
+            next_cursor = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                next_cursor = encode_history_cursor(rows[-1]["login_time"], rows[-1]["id"])
             
             return {
                 "success": True,
-                "sessions": result.data
+                "sessions": rows,
+                "next_cursor": next_cursor
             }
                 
         except Exception as e:
             print(f"Error getting session history: {e}")
             return {"success": False, "error": str(e)}
 
+    def iter_session_history(self, user_id: str, start_time: Optional[str] = None,
+                             end_time: Optional[str] = None, ip_address: Optional[str] = None,
+                             is_active: Optional[bool] = None, columns: Optional[List[str]] = None,
+                             page_size: int = MAX_HISTORY_PAGE_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        Yield every matching session for a user, newest first.
+
+        Only one page is held in memory at a time, so exporting a long history
+        costs O(page_size) rather than O(n).
+        """
+        if not self.supabase.supabase:
+            print("Warning: Supabase not initialized, returning mock history")
+            yield from self.get_session_history(user_id)["sessions"]
+            return
+        
+        select_columns = history_select_columns(columns)
+        after = None
+        while True:
+            query = self._history_query(user_id, select_columns, start_time, end_time,
+                                        ip_address, is_active, after)
+            rows = query.limit(page_size).execute().data or []
+            yield from rows
+            if len(rows) < page_size:
+                return
+            after = (rows[-1]["login_time"], rows[-1]["id"])
+
+    def _history_query(self, user_id: str, select_columns: str, start_time: Optional[str],
+                       end_time: Optional[str], ip_address: Optional[str],
+                       is_active: Optional[bool], after: Optional[Tuple[str, str]]):
+        """Build the filtered, keyset-ordered history query for a user"""
+        query = self.supabase.supabase.table("user_sessions").select(select_columns).eq("user_id", user_id)
+        
+        if start_time:
+            query = query.gte("login_time", start_time)
+        if end_time:
+            query = query.lt("login_time", end_time)
+        if ip_address:
+            query = query.eq("ip_address", ip_address)
+        if is_active is not None:
+            query = query.eq("is_active", is_active)
+        if after:
+            login_time, session_id = after
+            query = query.or_(
+                f'login_time.lt."{login_time}",'
+                f'and(login_time.eq."{login_time}",id.lt.{session_id})'
+            )
+        
+        return query.order("login_time", desc=True).order("id", desc=True)
+
     def validate_session(self, session_token: str) -> Dict[str, Any]:
         """
         Validate if a session is active
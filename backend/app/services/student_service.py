@@ -1,32 +1,31 @@
 from app.services.supabase_service import supabase_service
+from app.services.row_events import row_deleted, row_upserted
+from app.services.table_codecs import TABLE_CODECS
 from typing import Optional, Dict, Any, List
 
 class StudentService:
     def __init__(self):
         self.supabase = supabase_service
+        self.codec = TABLE_CODECS["landing_student"]
     
     async def create_student(self, student_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new student record"""
         if not self.supabase.supabase:
             print("Warning: Supabase not initialized, returning mock data")
-            return {
+            return self.codec.decode({
                 **student_data,
                 "user_id": "mock-student-id",
                 "created_at": "2024-01-01T00:00:00Z"
-            }
+            })
         
         try:
             print(f"Creating student record in Supabase: {student_data}")
-            response = self.supabase.supabase.table("landing_student").insert(student_data).execute()
+            response = self.supabase.supabase.table("landing_student").insert(self.codec.encode(student_data)).execute()
             
             if response.data:
-                result = response.data[0]
+                result = self.codec.decode(response.data[0])
                 print(f"Successfully created student with ID: {result.get('id')}")
-                
-                # Convert phone back to string for the response
-                if 'phone' in result and isinstance(result['phone'], int):
-                    result['phone'] = str(result['phone'])
-                
+                row_upserted("landing_student", result)
                 return result
             else:
                 print("No data returned from insert")
@@ -40,7 +39,7 @@ class StudentService:
         """Get student by user_id"""
         if not self.supabase.supabase:
             print("Warning: Supabase not initialized, returning mock data")
-            return {
+            return self.codec.decode({
                 "user_id": user_id,
                 "name": "Mock Student",
                 "email": "mock@student.com",
@@ -53,16 +52,12 @@ class StudentService:
                 "interest_area": ["Tech", "Product"],
                 "interest_level": "Curious",
                 "created_at": "2024-01-01T00:00:00Z"
-            }
+            })
         
         try:
             response = self.supabase.supabase.table("landing_student").select("*").eq("user_id", user_id).execute()
             if response.data:
-                result = response.data[0]
-                # Convert phone back to string for the response
-                if 'phone' in result and isinstance(result['phone'], int):
-                    result['phone'] = str(result['phone'])
-                return result
+                return self.codec.decode(response.data[0])
             return None
         except Exception as e:
             print(f"Error getting student: {e}")
@@ -72,15 +67,13 @@ class StudentService:
         """Update student record"""
         if not self.supabase.supabase:
             print("Warning: Supabase not initialized, returning mock data")
-            return {**update_data, "user_id": user_id, "updated_at": "2024-01-01T00:00:00Z"}
+            return self.codec.decode({**update_data, "user_id": user_id, "updated_at": "2024-01-01T00:00:00Z"})
         
         try:
-            response = self.supabase.supabase.table("landing_student").update(update_data).eq("user_id", user_id).execute()
+            response = self.supabase.supabase.table("landing_student").update(self.codec.encode(update_data)).eq("user_id", user_id).execute()
             if response.data:
-                result = response.data[0]
-                # Convert phone back to string for the response
-                if 'phone' in result and isinstance(result['phone'], int):
-                    result['phone'] = str(result['phone'])
+                result = self.codec.decode(response.data[0])
+                row_upserted("landing_student", result)
                 return result
             return None
         except Exception as e:
@@ -91,7 +84,7 @@ class StudentService:
         """Get all students"""
         if not self.supabase.supabase:
             print("Warning: Supabase not initialized, returning mock data")
-            return [
+            return self.codec.decode_many([
                 {
                     "user_id": "student-1",
                     "name": "John Student",
@@ -120,15 +113,11 @@ class StudentService:
                     "interest_level": "Want to join one",
                     "created_at": "2024-01-01T00:00:00Z"
                 }
-            ]
+            ])
         
         try:
             response = self.supabase.supabase.table("landing_student").select("*").order("created_at", desc=True).execute()
-            # Convert phone back to string for all results
-            for result in response.data:
-                if 'phone' in result and isinstance(result['phone'], int):
-                    result['phone'] = str(result['phone'])
-            return response.data
+            return self.codec.decode_many(response.data or [])
         except Exception as e:
             print(f"Error getting all students: {e}")
             return []
@@ -141,6 +130,7 @@ class StudentService:
         
         try:
             self.supabase.supabase.table("landing_student").delete().eq("user_id", user_id).execute()
+            row_deleted("landing_student", user_id)
             return True
         except Exception as e:
             print(f"Error deleting student: {e}")
@@ -1,25 +1,43 @@
-from supabase import create_client, Client
 from app.core.config import settings
-from typing import Optional, Dict, Any
-import os
+from typing import TYPE_CHECKING, Optional, Dict, Any, Iterator
+import threading
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+# Rows per request when reading a whole table; PostgREST caps a response at 1000 rows
+TABLE_PAGE_SIZE = 1000
 
 class SupabaseService:
+    """
+    The one Supabase client the backend uses, shared by every service.
+    Created on first use (or by the startup warm-up), not at import.
+    """
+    
     def __init__(self):
+        self._client: Optional["Client"] = None
+        self._initialized = False
+        self._lock = threading.Lock()
+    
+    @property
+    def supabase(self) -> Optional["Client"]:
+        """The client, or None when Supabase is not configured"""
+        if not self._initialized:
+            with self._lock:
+                if not self._initialized:
+                    self._client = self._create_client()
+                    self._initialized = True
+        return self._client
+    
+    def _create_client(self) -> Optional["Client"]:
         # Use service role key for backend operations
         supabase_url = settings.SUPABASE_URL
         supabase_key = settings.SUPABASE_SERVICE_ROLE_KEY
         
-        print(f"Initializing Supabase with URL: {supabase_url}")
-        
         # Check if environment variables are set
         if not supabase_key:
             print("Warning: SUPABASE_SERVICE_ROLE_KEY not set")
-            self.supabase = None
-            return
-            
-        print(f"API Key length: {len(supabase_key)}")
-        print(f"API Key starts with: {supabase_key[:50]}...")
-        print(f"API Key ends with: ...{supabase_key[-20:]}")
+            return None
         
         # Verify this is a service role key
         import base64
@@ -37,11 +55,41 @@ class SupabaseService:
             print(f"Warning: Could not parse service role key: {e}")
         
         try:
-            self.supabase: Client = create_client(supabase_url, supabase_key)
-            print("Supabase client initialized successfully")
+            from supabase import create_client
+            client = create_client(supabase_url, supabase_key)
+            print(f"Supabase client initialized for {supabase_url}")
+            return client
         except Exception as e:
             print(f"Warning: Could not initialize Supabase client: {e}")
-            self.supabase = None
+            return None
+
+    def close(self):
+        """Close the client's pooled connections (on shutdown); a later use creates a new client"""
+        with self._lock:
+            client, self._client, self._initialized = self._client, None, False
+        if client is not None:
+            try:
+                client.postgrest.aclose()
+            except Exception as e:
+                print(f"Warning: Could not close Supabase client: {e}")
+
+    def iter_table(self, table: str, columns: str = "*", page_size: int = TABLE_PAGE_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        Yield every row of a table in user_id order, one keyset page at a time,
+        so tables larger than the PostgREST row cap are read in full. Blocking:
+        call it from a worker thread, never the event loop.
+        """
+        after = None
+        while True:
+            query = self.supabase.table(table).select(columns)
+            if after is not None:
+                query = query.gt("user_id", after)
+            rows = query.order("user_id").limit(page_size).execute().data or []
+            # A server row cap below page_size returns short pages, so only an empty one ends the table
+            if not rows:
+                return
+            yield from rows
+            after = rows[-1]["user_id"]
     
     async def create_user_profile(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a user profile in the user_profiles table"""
@@ -0,0 +1,150 @@
+import json
+import re
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+_NON_DIGITS = re.compile(r"\D")
+
+def normalize_phone(value: Any) -> Optional[str]:
+    """Digits, keeping a leading "+" ("+91 98765-43210" -> "+919876543210"); None if there are none"""
+    text = str(value).strip()
+    digits = _NON_DIGITS.sub("", text)
+    if not digits:
+        return None
+    return f"+{digits}" if text.startswith("+") else digits
+
+def _phone_int(value: Any) -> Optional[int]:
+    digits = _NON_DIGITS.sub("", str(value))
+    return int(digits) if digits else None
+
+def _integer(value: Any) -> Optional[int]:
+    if isinstance(value, str):
+        value = value.strip()
+        return int(value) if value else None
+    return int(value)
+
+def _timestamp(value: Any) -> Any:
+    """ISO 8601 text; datetimes and epoch seconds are converted, strings are checked and kept"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, timezone.utc).isoformat()
+    datetime.fromisoformat(value)
+    return value
+
+def _parse_array(value: Any) -> List:
+    if isinstance(value, str):
+        value = value.strip()
+        if value.startswith("["):
+            return json.loads(value)
+        # Postgres array literal, as text columns migrated from arrays hold them: {a,"b c"}
+        if value.startswith("{") and value.endswith("}"):
+            value = value[1:-1]
+        return [part.strip().strip('"') for part in value.split(",") if part.strip()]
+    return list(value)
+
+def _format_array(value: Any) -> List:
+    if isinstance(value, str):
+        return [value]
+    return list(value)
+
+class Column(NamedTuple):
+    """How one column is read (decode) and written (encode)"""
+    type: type
+    decode: Callable[[Any], Any]
+    encode: Callable[[Any], Any]
+    # Value a NULL reads as; None keeps it NULL
+    null: Optional[Callable[[], Any]] = None
+
+PHONE_INT = Column(int, _phone_int, _phone_int)
+PHONE_TEXT = Column(str, normalize_phone, normalize_phone)
+INTEGER = Column(int, _integer, _integer)
+# Read as ISO text: the response schemas parse it once, in pydantic-core
+TIMESTAMP = Column(str, _timestamp, _timestamp)
+TEXT_ARRAY = Column(list, _parse_array, _format_array)
+TEXT_ARRAY_NOT_NULL = TEXT_ARRAY._replace(null=list)
+
+class TableCodec:
+    """
+    Column conversions for one table, declared once and applied in a single
+    pass on every read and write. Reads only touch values that are not
+    already of the column's type, so rows Supabase returns in the right
+    shape cost one type check per declared column. Lists are decoded column
+    by column.
+    """
+
+    def __init__(self, table: str, columns: Dict[str, Column]):
+        self.table = table
+        self.columns = columns
+        self._columns = list(columns.items())
+
+    def decode(self, row: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Row from the database to the shape the API schemas expect (in place)"""
+        if row is not None:
+            self.decode_many([row])
+        return row
+
+    def decode_many(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        for name, column in self._columns:
+            kind, decode, null = column.type, column.decode, column.null
+            for row in rows:
+                value = row.get(name)
+                if value is None:
+                    if null is not None and name in row:
+                        row[name] = null()
+                elif value.__class__ is not kind:
+                    row[name] = decode(value)
+        return rows
+
+    def encode(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Row from the API to what the table stores; returns a copy, only columns present are touched"""
+        row = dict(row)
+        for name, column in self._columns:
+            value = row.get(name)
+            if value is not None:
+                row[name] = column.encode(value)
+        return row
+
+_TIMESTAMPS = {"created_at": TIMESTAMP, "updated_at": TIMESTAMP}
+
+# One spec per landing table; phone is bigint for students and founders, text for the others
+TABLE_CODECS: Dict[str, TableCodec] = {
+    codec.table: codec for codec in [
+        TableCodec("landing_student", {
+            "phone": PHONE_INT,
+            "year": INTEGER,
+            "career_goals": TEXT_ARRAY_NOT_NULL,
+            "interest_area": TEXT_ARRAY_NOT_NULL,
+            **_TIMESTAMPS,
+        }),
+        TableCodec("landing_founders", {
+            "phone": PHONE_INT,
+            "years_of_experience": INTEGER,
+            "help_needed": TEXT_ARRAY,
+            "category": TEXT_ARRAY,
+            **_TIMESTAMPS,
+        }),
+        TableCodec("landing_mentors", {
+            "phone": PHONE_TEXT,
+            "focus_areas": TEXT_ARRAY,
+            "preferred_startup_stage": TEXT_ARRAY,
+            **_TIMESTAMPS,
+        }),
+        TableCodec("landing_vendor", {
+            "years_of_experience": INTEGER,
+            "category": TEXT_ARRAY,
+            "locations": TEXT_ARRAY,
+            **_TIMESTAMPS,
+        }),
+        TableCodec("landing_working_professional", {
+            "phone": PHONE_TEXT,
+            "years_of_experience": INTEGER,
+            "startup_interest": TEXT_ARRAY,
+            "startup_exposure": TEXT_ARRAY,
+            "functional_expertise": TEXT_ARRAY,
+            "industry_knowledge": TEXT_ARRAY,
+            "stage_preference": TEXT_ARRAY,
+            **_TIMESTAMPS,
+        }),
+    ]
+}
@@ -0,0 +1,310 @@
+import asyncio
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.matching_service import TableIndexService, normalize_tag
+
+# Vendor fields the index filters and counts on; category and locations are lists
+FACETS = ("category", "locations", "team_size")
+# years_of_experience of vendors that didn't give one
+MISSING_YEARS = np.iinfo(np.int32).min
+
+def _values(value: Any) -> List[str]:
+    if not value:
+        return []
+    return [item for item in (value if isinstance(value, list) else [value]) if isinstance(item, str) and item.strip()]
+
+class Posting:
+    """A sorted list of doc ids in a growable int32 array"""
+
+    __slots__ = ("ids", "size")
+
+    def __init__(self, ids: Optional[List[int]] = None):
+        ids = ids or []
+        self.ids = np.empty(max(8, len(ids)), dtype=np.int32)
+        self.ids[:len(ids)] = ids
+        self.size = len(ids)
+
+    def view(self) -> np.ndarray:
+        return self.ids[:self.size]
+
+    def add(self, doc: int):
+        if self.size == len(self.ids):
+            ids = np.empty(len(self.ids) * 2, dtype=np.int32)
+            ids[:self.size] = self.ids[:self.size]
+            self.ids = ids
+        # New vendors get the highest doc id, so this is an append unless an update adds a value
+        at = self.size if not self.size or self.ids[self.size - 1] < doc else int(np.searchsorted(self.view(), doc))
+        self.ids[at + 1:self.size + 1] = self.ids[at:self.size]
+        self.ids[at] = doc
+        self.size += 1
+
+    def discard(self, doc: int):
+        at = int(np.searchsorted(self.view(), doc))
+        if at == self.size or self.ids[at] != doc:
+            return
+        self.ids[at:self.size - 1] = self.ids[at + 1:self.size]
+        self.size -= 1
+
+def _union(arrays: List[np.ndarray], disjoint: bool = False) -> np.ndarray:
+    if not arrays:
+        return np.empty(0, dtype=np.int32)
+    if len(arrays) == 1:
+        return arrays[0]
+    ids = np.sort(np.concatenate(arrays), kind="stable")
+    if disjoint:
+        return ids
+    return ids[np.concatenate(([True], ids[1:] != ids[:-1]))]
+
+class VendorIndex:
+    """
+    Inverted index over vendors: every category, location, team size and
+    years_of_experience value maps to a Posting, the sorted ids of the vendor
+    docs that have it. Doc ids increase with created_at (and with every later
+    create), so results page newest first by reading the matches backwards.
+
+    A search ORs the values selected within a facet and ANDs across facets:
+    the most selective filter's postings give the candidates and the other
+    filters are intersected with them through per-doc value columns, so its
+    cost follows the smallest posting involved rather than the table. A
+    value's facet count is the size of its posting intersected with the other
+    facets' matches (so selecting a category still counts the other
+    categories); those come from the same pass over the candidates as the
+    results, and all of a facet's counts from one bincount over the value ids
+    of its matches.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._next_doc = 0
+        self._docs: Dict[int, Dict[str, Any]] = {}
+        self._doc_ids: Dict[str, int] = {}
+        self._doc_keys: Dict[int, List[Tuple[str, Any]]] = {}
+        self._all = Posting()
+        self._postings: Dict[str, Dict[Any, Posting]] = {facet: {} for facet in (*FACETS, "years")}
+        # Per facet: value -> value id, the display label of every value id (the first
+        # spelling seen), and each doc's value ids as columns by doc id: column j holds
+        # every doc's j-th value id, -1 past its last value
+        self._value_ids: Dict[str, Dict[str, int]] = {facet: {} for facet in FACETS}
+        self._labels: Dict[str, List[str]] = {facet: [] for facet in FACETS}
+        self._capacity = capacity
+        self._doc_values: Dict[str, List[np.ndarray]] = {facet: [np.full(capacity, -1, dtype=np.int32)] for facet in FACETS}
+        self._doc_years = np.full(capacity, MISSING_YEARS, dtype=np.int32)
+
+    @classmethod
+    def from_rows(cls, rows: List[Dict[str, Any]]) -> "VendorIndex":
+        index = cls(max(1024, len(rows)))
+        postings = defaultdict(list)
+        for row in sorted(rows, key=lambda row: str(row.get("created_at") or "")):
+            if row.get("user_id") and row["user_id"] not in index._doc_ids:
+                doc = index._new_doc(row["user_id"])
+                for key in index._store(doc, row):
+                    postings[key].append(doc)
+        index._all = Posting(list(index._docs))
+        for (field, key), docs in postings.items():
+            index._postings[field][key] = Posting(docs)
+        return index
+
+    def _new_doc(self, user_id: str) -> int:
+        doc = self._doc_ids[user_id] = self._next_doc
+        self._next_doc += 1
+        if doc == self._capacity:
+            def grow(column: np.ndarray, empty: int) -> np.ndarray:
+                grown = np.full(self._capacity * 2, empty, dtype=np.int32)
+                grown[:self._capacity] = column
+                return grown
+            for columns in self._doc_values.values():
+                columns[:] = [grow(column, -1) for column in columns]
+            self._doc_years = grow(self._doc_years, MISSING_YEARS)
+            self._capacity *= 2
+        return doc
+
+    def _store(self, doc: int, row: Dict[str, Any]) -> List[Tuple[str, Any]]:
+        """Keep the row and its facet value ids; returns its (field, key) posting keys"""
+        keys = []
+        for facet in FACETS:
+            value_ids = self._value_ids[facet]
+            ids = []
+            for value in _values(row.get(facet)):
+                key = normalize_tag(value)
+                if key not in value_ids:
+                    value_ids[key] = len(self._labels[facet])
+                    self._labels[facet].append(value.strip())
+                if (facet, key) not in keys:
+                    keys.append((facet, key))
+                    ids.append(value_ids[key])
+            columns = self._doc_values[facet]
+            while len(columns) < len(ids):
+                columns.append(np.full(self._capacity, -1, dtype=np.int32))
+            for j, column in enumerate(columns):
+                column[doc] = ids[j] if j < len(ids) else -1
+        years = row.get("years_of_experience")
+        if isinstance(years, int):
+            keys.append(("years", years))
+        self._doc_years[doc] = years if isinstance(years, int) else MISSING_YEARS
+        self._docs[doc] = row
+        self._doc_keys[doc] = keys
+        return keys
+
+    def upsert(self, row: Dict[str, Any]):
+        user_id = row.get("user_id")
+        if not user_id:
+            return
+        doc = self._doc_ids.get(user_id)
+        if doc is None:
+            doc = self._new_doc(user_id)
+            self._all.add(doc)
+            old_keys = set()
+        else:
+            old_keys = set(self._doc_keys[doc])
+        keys = set(self._store(doc, row))
+        for field, key in old_keys - keys:
+            self._postings[field][key].discard(doc)
+        for field, key in keys - old_keys:
+            self._postings[field].setdefault(key, Posting()).add(doc)
+
+    def remove(self, user_id: str):
+        doc = self._doc_ids.pop(user_id, None)
+        if doc is None:
+            return
+        for field, key in self._doc_keys.pop(doc):
+            self._postings[field][key].discard(doc)
+        for columns in self._doc_values.values():
+            for column in columns:
+                column[doc] = -1
+        self._doc_years[doc] = MISSING_YEARS
+        self._all.discard(doc)
+        del self._docs[doc]
+
+    def __len__(self) -> int:
+        return self._all.size
+
+    def _filters(self, selected: Dict[str, List[str]], min_years: Optional[int],
+                 max_years: Optional[int]) -> Dict[str, Tuple[List[Posting], Any]]:
+        """Active filters: name -> (postings it ORs, what its predicate needs)"""
+        filters = {}
+        for facet in FACETS:
+            if selected.get(facet):
+                keys = {normalize_tag(value) for value in selected[facet]}
+                postings = [self._postings[facet][key] for key in keys if key in self._postings[facet]]
+                # Indexed by a doc's value ids; the extra last entry is what -1 (no value) reads
+                lookup = np.zeros(len(self._labels[facet]) + 1, dtype=bool)
+                lookup[[self._value_ids[facet][key] for key in keys if key in self._value_ids[facet]]] = True
+                filters[facet] = (postings, lookup)
+        if min_years is not None or max_years is not None:
+            low = MISSING_YEARS + 1 if min_years is None else min_years
+            high = np.iinfo(np.int32).max if max_years is None else max_years
+            filters["years"] = ([posting for years, posting in self._postings["years"].items() if low <= years <= high],
+                                (low, high))
+        return filters
+
+    def _base(self, filters: Dict[str, Tuple[List[Posting], Any]], names: List[str]) -> Tuple[str, np.ndarray]:
+        """The named filter with the fewest docs, and those docs read from its postings"""
+        base = min(names, key=lambda name: sum(posting.size for posting in filters[name][0]))
+        return base, _union([posting.view() for posting in filters[base][0]], disjoint=base == "years")
+
+    def _keep(self, filters: Dict[str, Tuple[List[Posting], Any]], name: str, docs: np.ndarray) -> np.ndarray:
+        """Which of docs pass the named filter, checked against their own values"""
+        if name == "years":
+            low, high = filters[name][1]
+            years = self._doc_years[docs]
+            return (years >= low) & (years <= high)
+        lookup = filters[name][1]
+        keep = np.zeros(len(docs), dtype=bool)
+        for column in self._doc_values[name]:
+            keep |= lookup[column.take(docs)]
+        return keep
+
+    def _match(self, filters: Dict[str, Tuple[List[Posting], Any]], names: List[str]) -> Optional[np.ndarray]:
+        """
+        Docs passing every named filter, None (every doc) for no filters. Only
+        the filter with the fewest docs is read from its postings; the others
+        are checked against those candidates' own values.
+        """
+        if not names:
+            return None
+        base, docs = self._base(filters, names)
+        for name in names:
+            if name != base and len(docs):
+                docs = docs[self._keep(filters, name, docs)]
+        return docs
+
+    def _matches(self, filters: Dict[str, Tuple[List[Posting], Any]]) -> Tuple[Optional[np.ndarray], Dict[str, Optional[np.ndarray]]]:
+        """
+        Docs passing every filter, and for each selected facet the docs passing
+        all the other filters. Every filter but the base is checked once over
+        the base's candidates and a facet's matches AND the other filters'
+        results, so only the base facet needs a _match of its own.
+        """
+        if not filters:
+            return None, {}
+        names = list(filters)
+        base, docs = self._base(filters, names)
+        keeps = {name: self._keep(filters, name, docs) for name in names if name != base}
+
+        def passing(skip: Optional[str]) -> np.ndarray:
+            keep = np.ones(len(docs), dtype=bool)
+            for name, passed in keeps.items():
+                if name != skip:
+                    keep &= passed
+            return docs[keep]
+
+        others = {facet: self._match(filters, [name for name in names if name != base]) if facet == base else passing(facet)
+                  for facet in FACETS if facet in filters}
+        return passing(None), others
+
+    def _facet_counts(self, facet: str, others: Optional[np.ndarray]) -> List[Dict[str, Any]]:
+        labels = self._labels[facet]
+        if others is None:
+            counts = [(labels[self._value_ids[facet][key]], posting.size)
+                      for key, posting in self._postings[facet].items() if posting.size]
+        else:
+            value_ids = np.concatenate([column.take(others) for column in self._doc_values[facet]])
+            tally = np.bincount(value_ids[value_ids >= 0], minlength=len(labels))
+            counts = [(labels[value_id], int(tally[value_id])) for value_id in np.flatnonzero(tally)]
+        counts.sort(key=lambda item: (-item[1], item[0]))
+        return [{"value": label, "count": count} for label, count in counts]
+
+    def search(self, selected: Dict[str, List[str]], min_years: Optional[int] = None, max_years: Optional[int] = None,
+               offset: int = 0, limit: int = 20) -> Dict[str, Any]:
+        """One page of matching vendors (newest first), the total, and facet counts"""
+        filters = self._filters(selected, min_years, max_years)
+        filtered, others = self._matches(filters)
+        matched = self._all.view() if filtered is None else filtered
+
+        total = len(matched)
+        page = matched[max(0, total - offset - limit):max(0, total - offset)][::-1]
+        facets = {}
+        for facet in FACETS:
+            # A facet's counts ignore its own selection; without one they are over the matches
+            facets[facet] = self._facet_counts(facet, others.get(facet, filtered))
+        return {"total": total, "vendors": [self._docs[int(doc)] for doc in page], "facets": facets}
+
+class VendorSearchService(TableIndexService):
+    """Faceted vendor search from an in-memory VendorIndex"""
+
+    name = "Vendor index"
+    tables = ("landing_vendor",)
+
+    def __init__(self):
+        super().__init__()
+        self.index = VendorIndex()
+        self.subscribe("landing_vendor", lambda row: self.index.upsert(row), lambda user_id: self.index.remove(user_id))
+
+    async def build(self, rows: Dict[str, List[Dict[str, Any]]]) -> str:
+        self.index = await asyncio.to_thread(VendorIndex.from_rows, rows["landing_vendor"])
+        return f"{len(self.index)} vendors"
+
+    async def search(self, category: List[str], locations: List[str], team_size: List[str],
+                     min_years: Optional[int] = None, max_years: Optional[int] = None,
+                     offset: int = 0, limit: int = 20) -> Dict[str, Any]:
+        await self.ensure_loaded()
+        start = time.perf_counter()
+        result = self.index.search({"category": category, "locations": locations, "team_size": team_size},
+                                   min_years, max_years, offset, limit)
+        return {**result, "offset": offset, "limit": limit, "took_ms": round((time.perf_counter() - start) * 1e3, 3)}
+
+# Global instance
+vendor_search_service = VendorSearchService()
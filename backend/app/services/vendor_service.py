@@ -1,33 +1,37 @@
-from supabase import create_client, Client
-from app.core.config import settings
-from typing import Optional, Dict, Any, List
-import os
+from app.services.supabase_service import supabase_service
+from app.services.row_events import row_deleted, row_upserted
+from app.services.table_codecs import TABLE_CODECS
+from typing import TYPE_CHECKING, Optional, Dict, Any, List
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 class VendorService:
     def __init__(self):
-        # Use placeholder values if environment variables are not set
-        supabase_url = settings.SUPABASE_URL if settings.SUPABASE_URL != "your-supabase-project-url" else "https://placeholder.supabase.co"
-        supabase_key = settings.SUPABASE_SERVICE_ROLE_KEY
-        
-        try:
-            self.supabase: Client = create_client(supabase_url, supabase_key)
-        except Exception as e:
-            print(f"Warning: Could not initialize Supabase client: {e}")
-            self.supabase = None
+        self.codec = TABLE_CODECS["landing_vendor"]
+    
+    @property
+    def supabase(self) -> Optional["Client"]:
+        """The shared client (see SupabaseService), None when Supabase is not configured"""
+        return supabase_service.supabase
     
     async def create_vendor(self, vendor_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new vendor record"""
         if not self.supabase:
             print("Warning: Supabase not initialized, returning mock data")
-            return {
+            return self.codec.decode({
                 **vendor_data,
                 "user_id": "mock-vendor-id",
                 "created_at": "2024-01-01T00:00:00Z"
-            }
+            })
         
         try:
-            response = self.supabase.table("landing_vendor").insert(vendor_data).execute()
-            return response.data[0] if response.data else None
+            response = self.supabase.table("landing_vendor").insert(self.codec.encode(vendor_data)).execute()
+            if not response.data:
+                return None
+            result = self.codec.decode(response.data[0])
+            row_upserted("landing_vendor", result)
+            return result
         except Exception as e:
             print(f"Error creating vendor: {e}")
             raise
@@ -36,7 +40,7 @@ class VendorService:
         """Get vendor by user_id"""
         if not self.supabase:
             print("Warning: Supabase not initialized, returning mock data")
-            return {
+            return self.codec.decode({
                 "user_id": user_id,
                 "business_name": "TechSolutions Pro",
                 "url": "https://techsolutionspro.com",
@@ -45,11 +49,11 @@ class VendorService:
                 "locations": ["San Francisco", "New York", "Austin"],
                 "team_size": "50-100",
                 "created_at": "2024-01-01T00:00:00Z"
-            }
+            })
         
         try:
             response = self.supabase.table("landing_vendor").select("*").eq("user_id", user_id).execute()
-            return response.data[0] if response.data else None
+            return self.codec.decode(response.data[0]) if response.data else None
         except Exception as e:
             print(f"Error getting vendor: {e}")
             return None
@@ -58,11 +62,15 @@ class VendorService:
         """Update vendor record"""
         if not self.supabase:
             print("Warning: Supabase not initialized, returning mock data")
-            return {**update_data, "user_id": user_id, "updated_at": "2024-01-01T00:00:00Z"}
+            return self.codec.decode({**update_data, "user_id": user_id, "updated_at": "2024-01-01T00:00:00Z"})
         
         try:
-            response = self.supabase.table("landing_vendor").update(update_data).eq("user_id", user_id).execute()
-            return response.data[0] if response.data else None
+            response = self.supabase.table("landing_vendor").update(self.codec.encode(update_data)).eq("user_id", user_id).execute()
+            if not response.data:
+                return None
+            result = self.codec.decode(response.data[0])
+            row_upserted("landing_vendor", result)
+            return result
         except Exception as e:
             print(f"Error updating vendor: {e}")
             return None
@@ -71,7 +79,7 @@ class VendorService:
         """Get all vendors"""
         if not self.supabase:
             print("Warning: Supabase not initialized, returning mock data")
-            return [
+            return self.codec.decode_many([
                 {
                     "user_id": "vendor-1",
                     "business_name": "TechSolutions Pro",
@@ -102,11 +110,11 @@ class VendorService:
                     "team_size": "25-50",
                     "created_at": "2024-01-01T00:00:00Z"
                 }
-            ]
+            ])
         
         try:
             response = self.supabase.table("landing_vendor").select("*").order("created_at", desc=True).execute()
-            return response.data
+            return self.codec.decode_many(response.data or [])
         except Exception as e:
             print(f"Error getting all vendors: {e}")
             return []
@@ -119,6 +127,7 @@ class VendorService:
         
         try:
             response = self.supabase.table("landing_vendor").delete().eq("user_id", user_id).execute()
+            row_deleted("landing_vendor", user_id)
             return True
         except Exception as e:
             print(f"Error deleting vendor: {e}")
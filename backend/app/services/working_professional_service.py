@@ -1,33 +1,37 @@
-from supabase import create_client, Client
-from app.core.config import settings
-from typing import Optional, Dict, Any, List
-import os
+from app.services.supabase_service import supabase_service
+from app.services.row_events import row_deleted, row_upserted
+from app.services.table_codecs import TABLE_CODECS
+from typing import TYPE_CHECKING, Optional, Dict, Any, List
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 class WorkingProfessionalService:
     def __init__(self):
-        # Use placeholder values if environment variables are not set
-        supabase_url = settings.SUPABASE_URL if settings.SUPABASE_URL != "your-supabase-project-url" else "https://placeholder.supabase.co"
-        supabase_key = settings.SUPABASE_SERVICE_ROLE_KEY
-        
-        try:
-            self.supabase: Client = create_client(supabase_url, supabase_key)
-        except Exception as e:
-            print(f"Warning: Could not initialize Supabase client: {e}")
-            self.supabase = None
+        self.codec = TABLE_CODECS["landing_working_professional"]
+    
+    @property
+    def supabase(self) -> Optional["Client"]:
+        """The shared client (see SupabaseService), None when Supabase is not configured"""
+        return supabase_service.supabase
     
     async def create_working_professional(self, professional_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new working professional record"""
         if not self.supabase:
             print("Warning: Supabase not initialized, returning mock data")
-            return {
+            return self.codec.decode({
                 **professional_data,
                 "user_id": "mock-professional-id",
                 "created_at": "2024-01-01T00:00:00Z"
-            }
+            })
         
         try:
-            response = self.supabase.table("landing_working_professional").insert(professional_data).execute()
-            return response.data[0] if response.data else None
+            response = self.supabase.table("landing_working_professional").insert(self.codec.encode(professional_data)).execute()
+            if not response.data:
+                return None
+            result = self.codec.decode(response.data[0])
+            row_upserted("landing_working_professional", result)
+            return result
         except Exception as e:
             print(f"Error creating working professional: {e}")
             raise
@@ -36,7 +40,7 @@ class WorkingProfessionalService:
         """Get working professional by user_id"""
         if not self.supabase:
             print("Warning: Supabase not initialized, returning mock data")
-            return {
+            return self.codec.decode({
                 "user_id": user_id,
                 "name": "Sarah Johnson",
                 "email": "sarah@techcompany.com",
@@ -48,11 +52,11 @@ class WorkingProfessionalService:
                 "company": "TechCorp Inc.",
                 "linkedin": "https://linkedin.com/in/sarahjohnson",
                 "created_at": "2024-01-01T00:00:00Z"
-            }
+            })
         
         try:
             response = self.supabase.table("landing_working_professional").select("*").eq("user_id", user_id).execute()
-            return response.data[0] if response.data else None
+            return self.codec.decode(response.data[0]) if response.data else None
         except Exception as e:
             print(f"Error getting working professional: {e}")
             return None
@@ -61,11 +65,15 @@ class WorkingProfessionalService:
         """Update working professional record"""
         if not self.supabase:
             print("Warning: Supabase not initialized, returning mock data")
-            return {**update_data, "user_id": user_id, "updated_at": "2024-01-01T00:00:00Z"}
+            return self.codec.decode({**update_data, "user_id": user_id, "updated_at": "2024-01-01T00:00:00Z"})
         
         try:
-            response = self.supabase.table("landing_working_professional").update(update_data).eq("user_id", user_id).execute()
-            return response.data[0] if response.data else None
+            response = self.supabase.table("landing_working_professional").update(self.codec.encode(update_data)).eq("user_id", user_id).execute()
+            if not response.data:
+                return None
+            result = self.codec.decode(response.data[0])
+            row_upserted("landing_working_professional", result)
+            return result
         except Exception as e:
             print(f"Error updating working professional: {e}")
             return None
@@ -74,7 +82,7 @@ class WorkingProfessionalService:
         """Get all working professionals"""
         if not self.supabase:
             print("Warning: Supabase not initialized, returning mock data")
-            return [
+            return self.codec.decode_many([
                 {
                     "user_id": "professional-1",
                     "name": "Sarah Johnson",
@@ -114,11 +122,11 @@ class WorkingProfessionalService:
                     "linkedin": "https://linkedin.com/in/lisarodriguez",
                     "created_at": "2024-01-01T00:00:00Z"
                 }
-            ]
+            ])
         
         try:
             response = self.supabase.table("landing_working_professional").select("*").order("created_at", desc=True).execute()
-            return response.data
+            return self.codec.decode_many(response.data or [])
         except Exception as e:
             print(f"Error getting all working professionals: {e}")
             return []
@@ -131,6 +139,7 @@ class WorkingProfessionalService:
         
         try:
             response = self.supabase.table("landing_working_professional").delete().eq("user_id", user_id).execute()
+            row_deleted("landing_working_professional", user_id)
             return True
         except Exception as e:
             print(f"Error deleting working professional: {e}")
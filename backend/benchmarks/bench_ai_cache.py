@@ -0,0 +1,107 @@
+"""Hit rate and lookup cost of the AI search classification cache.
+
+Fills a ClassificationCache with templated landing-page inputs, then looks
+up a repetitive workload: exact repeats, near-duplicate rephrasings
+(punctuation, case, plurals, small typos) and unseen inputs. Reports hit
+rates per kind and per-lookup latency. Then replays the labelled inputs in
+benchmarks/ai_search_eval.jsonl, which include one-word negations and role
+swaps ('I want to hire a mentor...' / 'I want to be a mentor...'): each is
+looked up in a cache holding all the others, and any near hit serving another
+role fails the run. No network or OpenAI client needed. Run from the backend
+directory:
+
+    python -m benchmarks.bench_ai_cache
+"""
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+from app.core.config import settings
+from app.services.ai_search_cache import ClassificationCache, normalize_input
+from app.services.role_classifier import load_role_classifier
+
+EVAL_PATH = os.path.join(os.path.dirname(__file__), "ai_search_eval.jsonl")
+
+SUBJECTS = ["I'm a", "I am a", "im a", "As a", "I work as a", "Currently a", "I'm an aspiring"]
+ROLES = ["student", "final year student", "software engineer", "founder", "startup founder", "angel investor",
+         "mentor", "designer", "marketing agency", "freelancer", "product manager", "data scientist"]
+GOALS = ["looking for an internship", "looking for investors", "looking for a co-founder", "want to mentor founders",
+         "providing services to startups", "looking for a new job", "want to learn about startups",
+         "building a fintech startup", "searching for clients", "hoping to switch careers", "raising a seed round"]
+CITIES = ["", " in Bangalore", " in Mumbai", " from Delhi", " based in Pune", " in Hyderabad"]
+
+def _phrase(rng: random.Random) -> str:
+    return f"{rng.choice(SUBJECTS)} {rng.choice(ROLES)} {rng.choice(GOALS)}{rng.choice(CITIES)}"
+
+def _variant(rng: random.Random, text: str) -> str:
+    kind = rng.choice(("case", "punctuation", "plural", "typo"))
+    if kind == "case":
+        return text.upper() if rng.random() < 0.5 else text.title()
+    if kind == "punctuation":
+        return text.replace(" ", "  ", 1) + rng.choice(("!", "!!", "...", "?", " :)"))
+    if kind == "plural":
+        return text + "s" if not text.endswith("s") else text[:-1]
+    i = rng.randrange(1, len(text) - 1)
+    return text[:i] + text[i + 1:]
+
+def eval_near_hits(rows, confirm=None):
+    """(near hits, near hits with another role) looking up each labelled input among all the others"""
+    near = wrong = 0
+    for row in rows:
+        key = normalize_input(row["user_input"])
+        cache = ClassificationCache(len(rows), ttl=3600, similarity=settings.AI_CACHE_SIMILARITY)
+        for other in rows:
+            if normalize_input(other["user_input"]) != key:
+                cache.put(normalize_input(other["user_input"]), {"role": other["role"]})
+        hit = cache.get(key, confirm=confirm and (lambda result: confirm(row["user_input"], result)))
+        if hit is not None:
+            near += 1
+            wrong += hit.result["role"] != row["role"]
+    return near, wrong
+
+def main():
+    rng = random.Random(5)
+    cache = ClassificationCache(settings.AI_CACHE_SIZE, ttl=3600, similarity=settings.AI_CACHE_SIMILARITY)
+    cached_inputs = list({_phrase(rng) for _ in range(settings.AI_CACHE_SIZE * 2)})[:settings.AI_CACHE_SIZE]
+    start = time.perf_counter()
+    for text in cached_inputs:
+        cache.put(normalize_input(text), {"role": "student", "redirect_url": "/student", "confidence": 0.9})
+    print(f"Filled {len(cache):,} entries in {time.perf_counter() - start:.2f}s")
+
+    workloads = {
+        "exact repeat": [rng.choice(cached_inputs) for _ in range(2000)],
+        "near duplicate": [_variant(rng, rng.choice(cached_inputs)) for _ in range(2000)],
+        "unseen": [f"{_phrase(rng)} and {rng.choice(GOALS)}" for _ in range(2000)],
+    }
+    for name, inputs in workloads.items():
+        hits = 0
+        latencies = []
+        for text in inputs:
+            begin = time.perf_counter()
+            hits += cache.get(normalize_input(text)) is not None
+            latencies.append(time.perf_counter() - begin)
+        latencies.sort()
+        print(f"  {name:<15} hit rate {hits / len(inputs):6.1%}  p50 {statistics.median(latencies) * 1e6:6.0f}us  "
+              f"p99 {latencies[int(len(latencies) * 0.99)] * 1e6:6.0f}us")
+    print(f"Overall: {cache.metrics()}")
+
+    with open(EVAL_PATH, "r", encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    classifier = load_role_classifier(settings.AI_CLASSIFIER_PATH)
+    checks = [("spelling variants only", None)]
+    if classifier is not None:
+        checks.append(("+ classifier agrees", lambda text, result: classifier.predict(text)[0] == result["role"]))
+    failed = False
+    for name, confirm in checks:
+        near, wrong = eval_near_hits(rows, confirm)
+        print(f"  labelled eval ({len(rows)} inputs), {name}: {near} near hits, {wrong} with the wrong role")
+        failed |= wrong > 0
+    if failed:
+        print("FAILED: a near hit served another role")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
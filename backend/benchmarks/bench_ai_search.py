@@ -0,0 +1,87 @@
+"""Latency, deadline and event-loop responsiveness of AI search against the local stub.
+
+Starts benchmarks.openai_stub in-process, points the AI search service at it
+and fires bursts of concurrent classifications under three upstream
+conditions: healthy, slower than the deadline, and saturated (more requests
+than the concurrency limit can serve in time), plus a viral-link burst of
+identical inputs that single-flight coalescing should serve with one call. A ticker task measures how
+late the event loop runs, which would be the full upstream round trip if
+any call blocked it. The local classifier is disabled so every input goes
+upstream. Needs the openai and httpx packages; no network access
+or API key. Run from the backend directory:
+
+    python -m benchmarks.bench_ai_search
+"""
+import asyncio
+import statistics
+import time
+
+from app.core.config import settings
+from app.services.ai_search_service import AISearchService
+from benchmarks.openai_stub import OpenAIStub
+
+INPUTS = [
+    "I'm a student looking for an internship",
+    "I'm building a startup and need investors",
+    "I want to mentor early-stage founders",
+    "We provide cloud services to startups",
+    "Looking for a new job in product management",
+]
+
+# (name, stub latency in seconds, requests fired at once, distinct inputs)
+SCENARIOS = [
+    ("healthy upstream", 0.3, settings.AI_SEARCH_MAX_CONCURRENCY * 4, True),
+    ("upstream slower than deadline", settings.AI_SEARCH_TIMEOUT * 2, 100, True),
+    ("saturated", settings.AI_SEARCH_TIMEOUT / 4, 400, True),
+    ("viral link (identical inputs)", 0.3, 400, False),
+]
+
+async def _loop_lag(stop: asyncio.Event, interval: float = 0.01) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - expected)
+    return worst
+
+async def _timed(service: AISearchService, user_input: str):
+    start = time.perf_counter()
+    result = await service.classify(user_input)
+    return time.perf_counter() - start, result
+
+def _input(i: int, distinct: bool) -> str:
+    # Numbered so each request is its own cache and single-flight key
+    return f"{INPUTS[i % len(INPUTS)]} #{i}" if distinct else INPUTS[0]
+
+async def _scenario(name: str, latency: float, requests: int, distinct: bool):
+    stub = OpenAIStub(latency=latency, jitter=latency * 0.2)
+    settings.OPENAI_BASE_URL = await stub.start()
+    settings.OPENAI_API_KEY = "stub"
+    service = AISearchService()
+
+    stop = asyncio.Event()
+    lag = asyncio.create_task(_loop_lag(stop))
+    start = time.perf_counter()
+    timings = await asyncio.gather(*(_timed(service, _input(i, distinct)) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    worst_lag = await lag
+    await service.close()
+    await stub.close()
+
+    latencies = sorted(latency for latency, _ in timings)
+    fallbacks = sum(1 for _, result in timings if result["confidence"] == 0.0)
+    print(f"{name}: {requests} requests, stub latency {latency:.2f}s, "
+          f"concurrency {settings.AI_SEARCH_MAX_CONCURRENCY}, deadline {settings.AI_SEARCH_TIMEOUT}s")
+    print(f"  p50 {statistics.median(latencies) * 1e3:.0f}ms  p99 {latencies[int(len(latencies) * 0.99)] * 1e3:.0f}ms  "
+          f"max {latencies[-1] * 1e3:.0f}ms  wall {elapsed:.2f}s")
+    print(f"  fallbacks {fallbacks}  upstream calls {stub.calls}  stats {service.stats}  "
+          f"worst event-loop lag {worst_lag * 1e3:.1f}ms")
+
+async def main():
+    settings.AI_CLASSIFIER_PATH = None
+    for scenario in SCENARIOS:
+        await _scenario(*scenario)
+
+if __name__ == "__main__":
+    asyncio.run(main())
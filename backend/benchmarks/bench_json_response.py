@@ -0,0 +1,74 @@
+"""Per-row JSON serialisation cost: stdlib JSONResponse vs the orjson default response class.
+
+For each of the five role list endpoints, validates synthetic rows
+(benchmarks/profile_rows.py) against the route's response_model and times
+the two ways a response body gets rendered:
+
+  - what FastAPI hands the response class after response_model
+    serialisation (JSON-compatible dicts), rendered by starlette's
+    JSONResponse (stdlib json) and by ORJSONResponse;
+  - Pydantic model instances returned without a response_model: FastAPI
+    (0.104) always runs jsonable_encoder on them first, then renders with
+    JSONResponse or ORJSONResponse, so only the rendering step differs.
+
+Also times encoding /api/locations/hierarchy, which happens once per data
+load (requests are served from the pre-encoded bytes). Run from the backend
+directory:
+
+    python -m benchmarks.bench_json_response [--rows 2000]
+"""
+import argparse
+import json
+import time
+from typing import Callable, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.core.performance import ORJSONResponse
+from app.services.location_service import location_service
+from benchmarks.profile_rows import ROLE_ENDPOINTS, synthetic_rows
+
+def _best_of(fn: Callable, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    stdlib = JSONResponse(None)
+    fast = ORJSONResponse(None)
+    print(f"{args.rows} rows per endpoint, best of {args.repeat}; microseconds per row")
+    print(f"{'endpoint':<30} {'json':>8} {'orjson':>8} {'speedup':>8}   {'models: encoder+json':>21} {'encoder+orjson':>14} {'speedup':>8}")
+    for name, (path, model) in ROLE_ENDPOINTS.items():
+        adapter = TypeAdapter(List[model])
+        models = adapter.validate_python(synthetic_rows(model, args.rows))
+        content = adapter.dump_python(models, mode="json")
+        assert json.loads(stdlib.render(content)) == json.loads(fast.render(models))
+
+        json_time = _best_of(lambda: stdlib.render(content), args.repeat)
+        orjson_time = _best_of(lambda: fast.render(content), args.repeat)
+        encoder_time = _best_of(lambda: stdlib.render(jsonable_encoder(models)), args.repeat)
+        encoder_orjson_time = _best_of(lambda: fast.render(jsonable_encoder(models)), args.repeat)
+        per_row = 1e6 / args.rows
+        print(f"{path:<30} {json_time * per_row:>8.2f} {orjson_time * per_row:>8.2f} {json_time / orjson_time:>7.1f}x"
+              f"   {encoder_time * per_row:>21.2f} {encoder_orjson_time * per_row:>14.2f} {encoder_time / encoder_orjson_time:>7.1f}x")
+
+    hierarchy = location_service._data.cache
+    json_time = _best_of(lambda: stdlib.render(hierarchy), args.repeat)
+    orjson_time = _best_of(lambda: fast.render(hierarchy), args.repeat)
+    body = location_service.get_response("hierarchy").body
+    print(f"\n/api/locations/hierarchy ({len(body) / 1e3:.0f}KB), encoded once per data load: "
+          f"json {json_time * 1e3:.2f}ms, orjson {orjson_time * 1e3:.2f}ms ({json_time / orjson_time:.1f}x); "
+          f"requests serve the pre-encoded bytes")
+
+if __name__ == "__main__":
+    main()
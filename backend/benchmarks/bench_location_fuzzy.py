@@ -0,0 +1,73 @@
+"""Offline accuracy and latency benchmark for typo-tolerant location search.
+
+Uses a hand-labelled set of common misspellings and renamed cities plus
+synthetic single-edit typos of every popular city, searched against the
+world-scale synthetic dataset. Run from the backend directory:
+
+    python -m benchmarks.bench_location_fuzzy
+"""
+import random
+import statistics
+import time
+
+from app.services.location_index import LocationIndex
+from benchmarks.world_locations import build_world_locations
+
+# (what the user typed, expected city)
+LABELLED = [
+    ("Banglore", "Bangalore"), ("Bangalor", "Bangalore"), ("Bengaluru", "Bangalore"),
+    ("Hydrabad", "Hyderabad"), ("Hyderbad", "Hyderabad"), ("Gurugram", "Gurgaon"),
+    ("Chenai", "Chennai"), ("Madras", "Chennai"), ("Kolkatta", "Kolkata"),
+    ("Calcutta", "Kolkata"), ("Bombay", "Mumbai"), ("Mumabi", "Mumbai"),
+    ("Ahmadabad", "Ahmedabad"), ("Jaipr", "Jaipur"), ("Lucknou", "Lucknow"),
+    ("Nagpr", "Nagpur"), ("Vadodra", "Vadodara"), ("Baroda", "Vadodara"),
+    ("Coimbatur", "Coimbatore"), ("Mysuru", "Mysore"), ("Ludhiyana", "Ludhiana"),
+    ("Amritsr", "Amritsar"), ("Prayagraj", "Allahabad"), ("Noidaa", "Noida"),
+    ("Gaziabad", "Ghaziabad"), ("Thiruchirappalli", "Tiruchirappalli"),
+]
+
+def _typo(rng: random.Random, word: str) -> str:
+    i = rng.randrange(1, len(word) - 1)
+    kind = rng.choice(("delete", "swap", "replace", "insert"))
+    if kind == "delete":
+        return word[:i] + word[i + 1:]
+    if kind == "swap":
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    letter = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    if kind == "replace":
+        return word[:i] + letter + word[i + 1:]
+    return word[:i] + letter + word[i:]
+
+def main():
+    data = build_world_locations()
+    index = LocationIndex(data)
+
+    rng = random.Random(3)
+    known_cities = {city for cities in data["cities"].values() for city in cities}
+    synthetic = [(_typo(rng, city), city) for city in data["popular_cities"] if city in known_cities and len(city) >= 5]
+    cases = LABELLED + synthetic
+
+    top1 = top5 = 0
+    latencies = []
+    misses = []
+    for query, expected in cases:
+        start = time.perf_counter()
+        results = index.search(query, 10)
+        latencies.append(time.perf_counter() - start)
+        values = [r["value"] for r in results]
+        top1 += bool(values) and values[0] == expected
+        top5 += expected in values[:5]
+        if expected not in values[:5]:
+            misses.append((query, expected, values[:3]))
+
+    latencies.sort()
+    print(f"Dataset: {len(index):,} locations, {len(cases)} queries")
+    print(f"Top-1 accuracy: {top1 / len(cases):.1%}")
+    print(f"Top-5 accuracy: {top5 / len(cases):.1%}")
+    print(f"Latency p50: {statistics.median(latencies) * 1e3:.3f}ms  "
+          f"p99: {latencies[int(len(latencies) * 0.99)] * 1e3:.3f}ms  max: {latencies[-1] * 1e3:.3f}ms")
+    for query, expected, got in misses:
+        print(f"  miss: {query!r} expected {expected!r}, got {got}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Latency of nearby() and reverse geocoding against a linear scan.
+
+Builds the GeoIndex over the world-scale synthetic dataset, checks every
+answer against a brute-force haversine scan and reports per-query latency.
+Query points are half near real cities (dense areas) and half uniform over
+the globe (mostly empty ocean, the worst case for nearest()). Run from the
+backend directory:
+
+    python -m benchmarks.bench_location_geo
+"""
+import heapq
+import random
+import statistics
+import time
+
+from app.services.location_geo import haversine_km
+from app.services.location_index import LocationIndex
+from benchmarks.world_locations import build_world_locations
+
+QUERIES = 400
+RADIUS_KM = 50
+LIMIT = 10
+# Default and maximum max_distance_km of /api/locations/reverse-geocode
+REVERSE_GEOCODE_KM = 100
+MAX_REVERSE_GEOCODE_KM = 500
+
+def linear_nearby(points, lat, lon, radius_km, k):
+    hits = ((haversine_km(lat, lon, p_lat, p_lon), entry_id) for p_lat, p_lon, entry_id in points)
+    return heapq.nsmallest(k, (hit for hit in hits if hit[0] <= radius_km))
+
+def _timed(fn, queries):
+    latencies = []
+    answers = []
+    for lat, lon in queries:
+        start = time.perf_counter()
+        answers.append(fn(lat, lon))
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return answers, latencies
+
+def _report(name, latencies):
+    print(f"  {name:<28} p50 {statistics.median(latencies) * 1e3:8.3f}ms  "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1e3:8.3f}ms")
+
+def main():
+    data = build_world_locations()
+    start = time.perf_counter()
+    index = LocationIndex(data)
+    print(f"Index build (all of LocationIndex): {time.perf_counter() - start:.2f}s, {len(index.geo):,} cities with coordinates")
+
+    coordinates = data["coordinates"]
+    points = [(*coordinates[result["state"]][result["value"]], entry_id) for entry_id, result in enumerate(index._results)
+              if result["type"] == "city" and result["value"] in coordinates.get(result["state"], {})]
+    coordinates = [point for cities in coordinates.values() for point in cities.values()]
+    rng = random.Random(11)
+    queries = [
+        (lat + rng.uniform(-0.3, 0.3), lon + rng.uniform(-0.3, 0.3)) for lat, lon in rng.sample(coordinates, QUERIES // 2)
+    ] + [(rng.uniform(-90, 90), rng.uniform(-180, 180)) for _ in range(QUERIES // 2)]
+
+    grid_nearby, grid_nearby_ms = _timed(lambda lat, lon: index.geo.nearby(lat, lon, RADIUS_KM, LIMIT), queries)
+    grid_nearest, grid_nearest_ms = _timed(lambda lat, lon: index.geo.nearest(lat, lon, 1), queries)
+    _, bounded_ms = _timed(lambda lat, lon: index.geo.nearest(lat, lon, 1, REVERSE_GEOCODE_KM), queries)
+    _, capped_ms = _timed(lambda lat, lon: index.geo.nearest(lat, lon, 1, MAX_REVERSE_GEOCODE_KM), queries)
+    scan_nearby, scan_ms = _timed(lambda lat, lon: linear_nearby(points, lat, lon, RADIUS_KM, LIMIT), queries[:40])
+    scan_nearest = [linear_nearby(points, lat, lon, float("inf"), 1) for lat, lon in queries[:40]]
+
+    # Compare distances rather than ids: ties between equidistant cities may order differently
+    for got, expected in zip(grid_nearby, scan_nearby):
+        assert [round(d, 6) for d, *_ in got] == [round(d, 6) for d, _ in expected], (got, expected)
+    for got, expected in zip(grid_nearest, scan_nearest):
+        assert round(got[0][0], 6) == round(expected[0][0], 6), (got, expected)
+
+    print(f"{QUERIES} queries, results match a linear scan")
+    _report(f"nearby({RADIUS_KM}km, k={LIMIT})", grid_nearby_ms)
+    _report(f"nearest within {REVERSE_GEOCODE_KM}km", bounded_ms)
+    _report(f"nearest within {MAX_REVERSE_GEOCODE_KM}km", capped_ms)
+    _report("nearest, unbounded", grid_nearest_ms)
+    _report("linear scan", scan_ms)
+
+if __name__ == "__main__":
+    main()
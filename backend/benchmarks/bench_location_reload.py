@@ -0,0 +1,89 @@
+"""Search latency while location data is hot-reloaded.
+
+Serves a steady stream of searches from the event loop (one every
+millisecond) while LocationService.reload() rebuilds the world-scale dataset
+in a worker thread, for both the JSON source and the compiled store. Each
+latency is measured from when the request was due to when it finished, so
+time spent waiting for the GIL held by the reload thread is included. Run
+from the backend directory:
+
+    python -m benchmarks.bench_location_reload
+"""
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from app.core.config import settings
+from app.services.location_service import LocationService
+from app.services.location_store import build_location_db
+from benchmarks.world_locations import build_world_locations
+
+QUERIES = ["ban", "Hydrabad", "pur", "new d", "Karnataka", "xq", "lon", "Thiruchirappalli"]
+BASELINE_SECONDS = 2.0
+
+async def _serve(service: LocationService, done) -> list:
+    latencies = []
+    i = 0
+    due = time.perf_counter()
+    while not done():
+        await service.search_locations(QUERIES[i % len(QUERIES)], 10)
+        latencies.append(time.perf_counter() - due)
+        i += 1
+        await asyncio.sleep(0.001)
+        due = time.perf_counter()
+    return latencies
+
+def _report(name: str, latencies: list):
+    latencies = sorted(latencies)
+    print(f"  {name:<16} n={len(latencies):<6} p50 {statistics.median(latencies) * 1e3:7.2f}ms  "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1e3:7.2f}ms  max {latencies[-1] * 1e3:7.2f}ms")
+
+async def _run(service: LocationService, write_update):
+    loop = asyncio.get_running_loop()
+    deadline = time.perf_counter() + BASELINE_SECONDS
+    _report("steady", await _serve(service, lambda: time.perf_counter() > deadline))
+
+    write_update()
+    before = service.data_version
+    reload = loop.run_in_executor(None, service.reload)
+    latencies = await _serve(service, reload.done)
+    result = await reload
+    _report("during reload", latencies)
+    print(f"  reload took {result['seconds']}s, version {before} -> {service.data_version}")
+    assert result["changed"] and service.data_version != before
+
+def main():
+    data = build_world_locations()
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "locations.json")
+        db_path = os.path.join(tmp, "locations.db")
+        settings.LOCATION_DATA_PATH = json_path
+        settings.LOCATION_DB_PATH = db_path
+
+        def write_json():
+            with open(json_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+
+        def add_city_and_write(store: bool):
+            def write():
+                data["cities"]["Karnataka"].append(f"Reloaded {time.time_ns()}")
+                write_json()
+                if store:
+                    build_location_db(data, db_path)
+            return write
+
+        write_json()
+        print("JSON source (index rebuilt in the reload thread):")
+        service = LocationService()
+        asyncio.run(_run(service, add_city_and_write(store=False)))
+
+        build_location_db(data, db_path)
+        print("Compiled store (converter run offline, reload only opens it):")
+        service = LocationService()
+        asyncio.run(_run(service, add_city_and_write(store=True)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Benchmark LocationIndex.search against the original linear scan.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_location_search
+"""
+import statistics
+import time
+
+from app.services.location_index import LocationIndex
+from benchmarks.world_locations import build_world_locations
+
+QUERIES = ["m", "ba", "ban", "bang", "mumbai", "new", "san", "delhi", "pur", "ulo", "zzz", "sao p"]
+
+def linear_scan(data: dict, query: str, limit: int = 10) -> list:
+    """The search_locations implementation this index replaced"""
+    results = []
+    query_lower = query.lower()
+    for country in data.get("countries", []):
+        if query_lower in country.lower():
+            results.append({"type": "country", "name": country, "value": country})
+    for country, states in data.get("states", {}).items():
+        for state in states:
+            if query_lower in state.lower():
+                results.append({"type": "state", "name": f"{state}, {country}", "value": state, "country": country})
+    for state, cities in data.get("cities", {}).items():
+        for city in cities:
+            if query_lower in city.lower():
+                results.append({"type": "city", "name": f"{city}, {state}", "value": city, "state": state})
+    return results[:limit]
+
+def _time_per_query(fn, repeat: int) -> float:
+    samples = []
+    for query in QUERIES:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn(query)
+        samples.append((time.perf_counter() - start) / repeat)
+    return statistics.mean(samples), max(samples)
+
+def main():
+    data = build_world_locations()
+    entries = len(data["countries"]) + sum(map(len, data["states"].values())) + sum(map(len, data["cities"].values()))
+    print(f"Dataset: {entries:,} locations")
+
+    start = time.perf_counter()
+    index = LocationIndex(data)
+    print(f"Index build: {time.perf_counter() - start:.2f}s")
+
+    scan_mean, scan_max = _time_per_query(lambda q: linear_scan(data, q), repeat=3)
+    index_mean, index_max = _time_per_query(lambda q: index.search(q, 10), repeat=200)
+
+    print(f"{'':<14}{'mean':>12}{'worst query':>14}")
+    print(f"{'linear scan':<14}{scan_mean * 1e3:>10.3f}ms{scan_max * 1e3:>12.3f}ms")
+    print(f"{'index':<14}{index_mean * 1e3:>10.3f}ms{index_max * 1e3:>12.3f}ms")
+    print(f"Speed-up: {scan_mean / index_mean:,.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Startup time and per-worker memory: JSON hierarchy vs compiled location store.
+
+Writes the world-scale synthetic dataset to a temp directory as both
+locations.json and locations.db, then starts a fresh interpreter for each
+mode that imports the location service (as a uvicorn worker would), runs a
+few searches and reports import time, RSS and private memory. Private memory
+is what each extra worker costs; mapped store pages are shared. Linux only.
+Run from the backend directory:
+
+    python -m benchmarks.bench_location_startup
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from app.services.location_store import build_location_db
+from benchmarks.world_locations import build_world_locations
+
+_WORKER = r"""
+import json, time
+start = time.perf_counter()
+from app.services.location_service import location_service
+location_service.load()
+loaded = time.perf_counter() - start
+for query in ("ban", "Hydrabad", "pur", "xq", "New Delhi"):
+    location_service._data.index.search(query, 10)
+location_service.get_response("cities", "Karnataka")
+
+def memory():
+    fields = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if parts[0].endswith(":") and len(parts) >= 2 and parts[1].isdigit():
+                fields[parts[0][:-1]] = int(parts[1])
+    return fields["Rss"], fields["Private_Clean"] + fields["Private_Dirty"]
+
+rss, private = memory()
+print(json.dumps({"load": loaded, "rss": rss, "private": private, "version": location_service.data_version}))
+"""
+
+def _run(env: dict) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", _WORKER], env={**os.environ, **env},
+        capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.dirname(__file__)) or "."
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    data = build_world_locations()
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "locations.json")
+        db_path = os.path.join(tmp, "locations.db")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        build_location_db(data, db_path)
+        print(f"locations.json {os.path.getsize(json_path) / 1e6:.1f}MB, locations.db {os.path.getsize(db_path) / 1e6:.1f}MB")
+
+        missing = os.path.join(tmp, "missing")
+        modes = {
+            "baseline (no data)": {"LOCATION_DATA_PATH": missing, "LOCATION_DB_PATH": missing},
+            "json": {"LOCATION_DATA_PATH": json_path, "LOCATION_DB_PATH": missing},
+            "store": {"LOCATION_DATA_PATH": missing, "LOCATION_DB_PATH": db_path},
+        }
+        results = {name: _run(env) for name, env in modes.items()}
+
+    print(f"{'mode':<20} {'startup':>10} {'RSS':>10} {'private':>10}")
+    for name, r in results.items():
+        print(f"{name:<20} {r['load'] * 1e3:>8.0f}ms {r['rss'] / 1024:>8.1f}MB {r['private'] / 1024:>8.1f}MB")
+    if results["json"]["version"] != results["store"]["version"]:
+        print("warning: data_version differs between json and store modes")
+
+if __name__ == "__main__":
+    main()
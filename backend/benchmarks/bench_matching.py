@@ -0,0 +1,141 @@
+"""Founder -> mentor matching: MentorIndex at scale vs scoring rows in Python.
+
+Builds a MentorIndex from --mentors synthetic mentor rows (option values from
+the registration forms, some free-text tags, cities across states) and
+reports:
+
+  - index build time and per-row upsert/remove time;
+  - latency of MatchingService's hot path (query encoding, scoring every
+    mentor, argpartition top-k, explaining the k results) over --founders
+    random founders: p50, p99, max;
+  - the same scores computed row by row in Python, for a few founders, as
+    the reference: checks both pick mentors with the same top-k scores and
+    shows the speedup.
+
+Exits non-zero when the p99 is over --budget-ms. Run from the backend directory:
+
+    python -m benchmarks.bench_matching [--mentors 100000] [--founders 2000] [--k 10] [--budget-ms 5]
+"""
+import argparse
+import random
+import sys
+import time
+from typing import Dict, List
+
+from app.services import matching_service as matching
+from app.services.matching_service import MentorIndex, normalize_tag
+
+FOCUS_AREAS = ["D2C", "SaaS", "Climate", "Social Impact", "Fintech", "Healthtech", "EdTech", "AI/ML",
+               "Blockchain", "E-commerce", "Manufacturing", "Agriculture", "Clean Energy"]
+MENTOR_STAGES = ["Idea stage", "MVP", "Early Revenue", "Scaling"]
+INCUBATOR_TYPES = ["Incubator", "Accelerator", "Grant Program", "Bootcamp/Workshop", "Startup Studio", "Other"]
+CATEGORIES = ["D2C", "SaaS", "Fintech", "Edtech", "Creator", "AI", "Climate", "Health", "E-commerce", "Gaming",
+              "Real Estate", "Transportation", "Food & Beverage", "Fashion", "Entertainment"]
+STARTUP_STATUS = ["Just an idea", "Prototype/MVP", "Paying users", "Raised funding"]
+HELP_NEEDED = ["Finding a cofounder", "Finding vendors (tech, design, branding, etc.)", "Finding early team/interns",
+               "Getting feedback on my idea", "Getting incubated", "Fundraising"]
+PLACES = [(f"City {state}-{city}", f"State {state}") for state in range(30) for city in range(20)]
+
+def synthetic_mentor(rng: random.Random, i: int) -> Dict:
+    focus = rng.sample(FOCUS_AREAS, rng.randint(1, 4))
+    if rng.random() < 0.05:
+        focus.append(f"Niche sector {rng.randint(0, 30)}")
+    city, state = rng.choice(PLACES)
+    return {
+        "user_id": f"mentor-{i}",
+        "name": f"Mentor {i}",
+        "organisation": f"Org {i % 5000}",
+        "city": city,
+        "state": state,
+        "incubator_type": rng.choice(INCUBATOR_TYPES),
+        "focus_areas": focus,
+        "preferred_startup_stage": rng.sample(MENTOR_STAGES, rng.randint(1, 2)),
+    }
+
+def synthetic_founder(rng: random.Random, i: int) -> Dict:
+    city, state = rng.choice(PLACES)
+    return {
+        "user_id": f"founder-{i}",
+        "city": city,
+        "state": state,
+        "startup_status": rng.choice(STARTUP_STATUS),
+        "help_needed": rng.sample(HELP_NEEDED, rng.randint(1, 3)),
+        "category": rng.sample(CATEGORIES, rng.randint(1, 3)),
+    }
+
+def python_scores(mentors: List[Dict], founder: Dict) -> List[float]:
+    """The MentorIndex score, one mentor row at a time"""
+    def sectors(values):
+        tags = {normalize_tag(value) for value in values or []}
+        return {matching.SECTOR_ALIASES.get(tag, tag) for tag in tags} - matching.IGNORED_TAGS
+    stage = matching.FOUNDER_STAGES.get(normalize_tag(founder["startup_status"]))
+    programs = {program for help in founder["help_needed"] for program in matching.HELP_PROGRAMS.get(normalize_tag(help), ())}
+    founder_sectors = sectors(founder["category"])
+    scores = []
+    for mentor in mentors:
+        score = matching.SECTOR_WEIGHT * len(sectors(mentor["focus_areas"]) & founder_sectors)
+        if stage in {normalize_tag(value) for value in mentor["preferred_startup_stage"]}:
+            score += matching.STAGE_WEIGHT
+        if normalize_tag(mentor["incubator_type"]) in programs:
+            score += matching.PROGRAM_WEIGHT
+        if mentor["state"] == founder["state"]:
+            score += matching.SAME_STATE_BOOST
+        if mentor["city"] == founder["city"]:
+            score += matching.SAME_CITY_BOOST
+        scores.append(score)
+    return scores
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mentors", type=int, default=100_000)
+    parser.add_argument("--founders", type=int, default=2000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    mentors = [synthetic_mentor(rng, i) for i in range(args.mentors)]
+    founders = [synthetic_founder(rng, i) for i in range(args.founders)]
+
+    start = time.perf_counter()
+    index = MentorIndex.from_rows(mentors)
+    build = time.perf_counter() - start
+    extra = [synthetic_mentor(rng, args.mentors + i) for i in range(1000)]
+    start = time.perf_counter()
+    for row in extra:
+        index.upsert(row)
+    upsert = (time.perf_counter() - start) / len(extra)
+    start = time.perf_counter()
+    for row in extra:
+        index.remove(row["user_id"])
+    remove = (time.perf_counter() - start) / len(extra)
+    print(f"{len(index):,} mentors: build {build:.2f}s, upsert {upsert * 1e6:.1f}us/row, remove {remove * 1e6:.1f}us/row")
+
+    latencies = []
+    for founder in founders:
+        start = time.perf_counter()
+        query = index.query(founder)
+        [index.explain(slot, score, query) for slot, score in index.top(query, args.k)]
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    p50, p99 = latencies[len(latencies) // 2] * 1e3, latencies[int(len(latencies) * 0.99)] * 1e3
+    print(f"match one founder (k={args.k}), {args.founders} founders: p50 {p50:.2f}ms, p99 {p99:.2f}ms, "
+          f"max {latencies[-1] * 1e3:.2f}ms")
+
+    python_time = 0.0
+    for founder in founders[:5]:
+        start = time.perf_counter()
+        scores = python_scores(mentors, founder)
+        top = sorted(scores, reverse=True)[:args.k]
+        python_time += time.perf_counter() - start
+        vectorised = [score for _, score in index.top(index.query(founder), args.k)]
+        assert [round(score, 3) for score in top if score > 0] == [round(score, 3) for score in vectorised], founder
+    python_ms = python_time / 5 * 1e3
+    print(f"python reference: {python_ms:.1f}ms per founder (same top-{args.k} scores), {python_ms / p50:.0f}x slower than p50")
+
+    if p99 > args.budget_ms:
+        print(f"OVER BUDGET: p99 {p99:.2f}ms > {args.budget_ms:.2f}ms")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
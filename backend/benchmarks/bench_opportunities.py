@@ -0,0 +1,158 @@
+"""Student <-> startup opportunity matching: OpportunityIndex at scale vs Python.
+
+Builds an OpportunityIndex from --students and --founders synthetic rows
+(option values from the registration forms, cities across states) and
+reports:
+
+  - index build time and per-row upsert/remove time on both sides;
+  - latency of both hot paths (top startups for a student, top students for
+    a founder, each including the k explanations): p50, p99, max;
+  - the same filters and scores computed row by row in Python, for a few
+    queries each way, as the reference: checks both pick the same top-k
+    scores and shows the speedup.
+
+Exits non-zero when either p99 is over --budget-ms. Run from the backend directory:
+
+    python -m benchmarks.bench_opportunities [--students 100000] [--founders 20000] [--queries 2000] [--k 10] [--budget-ms 5]
+"""
+import argparse
+import random
+import sys
+import time
+from typing import Dict, List
+
+from benchmarks.bench_matching import PLACES, synthetic_founder
+from app.services import opportunity_service as opportunities
+from app.services.opportunity_service import OpportunityIndex
+
+CAREER_GOALS = ["Internship", "Project", "Job", "Side Hustle"]
+INTEREST_AREAS = ["Marketing", "Product", "Tech", "Operations", "Design", "Other"]
+INTEREST_LEVELS = ["Curious", "Already tried building one", "Want to join one"]
+AVAILABILITY = ["1-5 hours/week", "5-10 hours/week", "10-20 hours/week", "20+ hours/week"]
+PAYMENT_TERMS = ["Paid only", "Unpaid only", "Both paid and unpaid"]
+LOCATION_PREFERENCES = ["Remote only", "On-site only", "Hybrid", "No preference"]
+
+def synthetic_student(rng: random.Random, i: int) -> Dict:
+    city, _ = rng.choice(PLACES)
+    return {
+        "user_id": f"student-{i}",
+        "name": f"Student {i}",
+        "college": f"College {i % 800}",
+        "course": "B.Tech",
+        "year": rng.randint(1, 4),
+        "city": city,
+        "career_goals": rng.sample(CAREER_GOALS, rng.randint(1, 3)),
+        "interest_area": rng.sample(INTEREST_AREAS, rng.randint(1, 3)),
+        "interest_level": rng.choice(INTEREST_LEVELS),
+        "availability": rng.choice(AVAILABILITY),
+        "payment_terms": rng.choice(PAYMENT_TERMS),
+        "location_preference": rng.choice(LOCATION_PREFERENCES),
+    }
+
+def python_scores(students: List[Dict], founders: List[Dict], student: Dict = None, founder: Dict = None) -> List[float]:
+    """The OpportunityIndex filters and score, one row pair at a time"""
+    pairs = [(student, row) for row in founders] if student else [(row, founder) for row in students]
+    scores = []
+    for student_row, founder_row in pairs:
+        wants, paid_only, onsite_only = opportunities.student_features(student_row)
+        offers, can_pay = opportunities.startup_features(founder_row)
+        shared = wants & offers
+        same_city = bool(student_row["city"]) and student_row["city"] == founder_row["city"]
+        if not shared & int(opportunities.OPPORTUNITY_MASK) or (paid_only and not can_pay) or (onsite_only and not same_city):
+            continue
+        scores.append(opportunities.FUNCTION_WEIGHT * bin(shared & int(opportunities.FUNCTION_MASK)).count("1")
+                      + opportunities.OPPORTUNITY_WEIGHT * bin(shared & int(opportunities.OPPORTUNITY_MASK)).count("1")
+                      + opportunities.SAME_CITY_BOOST * same_city)
+    return scores
+
+def latencies_ms(queries, run) -> List[float]:
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        run(query)
+        latencies.append((time.perf_counter() - start) * 1e3)
+    return sorted(latencies)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=100_000)
+    parser.add_argument("--founders", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    students = [synthetic_student(rng, i) for i in range(args.students)]
+    founders = [synthetic_founder(rng, i) for i in range(args.founders)]
+    for i, founder in enumerate(founders):
+        founder["name"] = founder["startup_name"] = f"Startup {i}"
+
+    start = time.perf_counter()
+    index = OpportunityIndex.from_rows(students, founders)
+    build = time.perf_counter() - start
+    print(f"{len(index.students):,} students, {len(index.startups):,} startups: build {build:.2f}s")
+    for arrays, extra in ((index.students, [synthetic_student(rng, args.students + i) for i in range(1000)]),
+                          (index.startups, [synthetic_founder(rng, args.founders + i) for i in range(1000)])):
+        start = time.perf_counter()
+        for row in extra:
+            arrays.upsert(row)
+        upsert = (time.perf_counter() - start) / len(extra)
+        start = time.perf_counter()
+        for row in extra:
+            arrays.remove(row["user_id"])
+        remove = (time.perf_counter() - start) / len(extra)
+        print(f"  {type(arrays).__name__}: upsert {upsert * 1e6:.1f}us/row, remove {remove * 1e6:.1f}us/row")
+
+    def startups_for_student(slot):
+        query = index.students.query(slot)
+        [index.explain(index.startups, startup, score, query.bits, query.city)
+         for startup, score in index.startups_for(query, args.k)]
+
+    def students_for_founder(slot):
+        query = index.startups.query(slot)
+        [index.explain(index.students, student, score, query.bits, query.city)
+         for student, score in index.students_for(query, args.k)]
+
+    over = False
+    for label, run, population in (("startups for a student", startups_for_student, args.students),
+                                   ("students for a founder", students_for_founder, args.founders)):
+        latencies = latencies_ms(rng.sample(range(population), min(args.queries, population)), run)
+        p50, p99 = latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)]
+        print(f"{label} (k={args.k}): p50 {p50:.2f}ms, p99 {p99:.2f}ms, max {latencies[-1]:.2f}ms")
+        over |= p99 > args.budget_ms
+
+    for label, pick in (("student", lambda i: {"student": students[i]}), ("founder", lambda i: {"founder": founders[i]})):
+        python_time = 0.0
+        for i in range(5):
+            query = pick(i)
+            start = time.perf_counter()
+            top = sorted(python_scores(students, founders, **query), reverse=True)[:args.k]
+            python_time += time.perf_counter() - start
+            if "student" in query:
+                matches = index.startups_for(index.students.query(index.students.slot(students[i]["user_id"])), args.k)
+            else:
+                matches = index.students_for(index.startups.query(index.startups.slot(founders[i]["user_id"])), args.k)
+            assert [round(float(score), 3) for score in top] == [round(score, 3) for _, score in matches], query
+        print(f"python reference, per {label}: {python_time / 5 * 1e3:.1f}ms (same top-{args.k} scores)")
+
+    # A fresh deploy builds with no students yet: the ones upserted later must share the startups' city ids
+    late = OpportunityIndex.from_rows([], founders)
+    joined = students[:500]
+    for row in joined:
+        late.students.upsert(row)
+    for i in range(5):
+        matches = late.startups_for(late.students.query(late.students.slot(joined[i]["user_id"])), args.k)
+        top = sorted(python_scores(joined, founders, student=joined[i]), reverse=True)[:args.k]
+        assert [round(float(score), 3) for score in top] == [round(score, 3) for _, score in matches], joined[i]
+        matches = late.students_for(late.startups.query(late.startups.slot(founders[i]["user_id"])), args.k)
+        top = sorted(python_scores(joined, founders, founder=founders[i]), reverse=True)[:args.k]
+        assert [round(float(score), 3) for score in top] == [round(score, 3) for _, score in matches], founders[i]
+    print(f"built with no students, {len(joined)} upserted after: same top-{args.k} scores both ways")
+
+    if over:
+        print(f"OVER BUDGET: a p99 is over {args.budget_ms:.2f}ms")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
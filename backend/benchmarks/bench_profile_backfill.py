@@ -0,0 +1,112 @@
+"""Throughput and resumability of the profile tag back-fill against the local stub.
+
+Generates synthetic landing-table rows into a JSONL file, then runs
+scripts.backfill_profile_tags against benchmarks.openai_stub (latency and
+error injection) with the JSONL store: first interrupted part-way through,
+then resumed from the checkpoint, then a --retry-failed pass over the rows
+that still failed. Reports rows/s, model calls and retries, and checks that
+every row with text was tagged and how many were classified twice across the
+interruption. Needs the openai and httpx packages; no
+network, API key or Supabase. Run from the backend directory:
+
+    python -m benchmarks.bench_profile_backfill [--rows 3000] [--latency 0.1] [--error-rate 0.05]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+
+from benchmarks.openai_stub import OpenAIStub
+from scripts.backfill_profile_tags import Checkpoint, JsonlProfileStore, backfill
+from app.services.profile_tagger import PROFILE_TEXT_FIELDS, ProfileTagger, RateLimiter
+
+TEXTS = [
+    "Building a fintech payments startup, raising our seed round",
+    "Final year student looking for an internship in product design",
+    "I mentor early stage founders on fundraising and hiring",
+    "We run a growth marketing agency for D2C brands",
+    "Backend engineer exploring healthtech and machine learning",
+    "Edtech platform for rural schools, looking for investors",
+    "",
+]
+
+def _write_rows(path: str, count: int, seed: int = 0):
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            table = rng.choice(list(PROFILE_TEXT_FIELDS))
+            text = rng.choice(TEXTS)
+            row = {"table": table, "user_id": f"user-{i:07d}"}
+            if table == "landing_mentors":
+                row["focus_areas"] = [part.strip() for part in text.split(" and ")] if text else []
+            elif table == "landing_founders":
+                row["description"], row["elevator_pitch"] = text, None
+            else:
+                row["extra_text"] = text
+            f.write(json.dumps(row) + "\n")
+
+async def _pass(base_url: str, store, checkpoint_path: str, args, interrupt_after: float = None, retry_failed: bool = False):
+    from openai import AsyncOpenAI
+    client = AsyncOpenAI(api_key="stub", base_url=base_url, max_retries=0)
+    tagger = ProfileTagger(client, "stub", RateLimiter(args.rate), timeout=2.0, max_retries=3, backoff=0.05)
+    job = asyncio.create_task(backfill(store, tagger, Checkpoint(checkpoint_path), list(PROFILE_TEXT_FIELDS),
+                                       args.concurrency, batch_size=100, report_every=3600, retry_failed=retry_failed))
+    try:
+        if interrupt_after is None:
+            return await job
+        done, _ = await asyncio.wait({job}, timeout=interrupt_after)
+        if not done:
+            job.cancel()
+            await asyncio.gather(job, return_exceptions=True)
+            return None
+        return job.result()
+    finally:
+        await client.close()
+
+async def main_async(args):
+    stub = OpenAIStub(latency=args.latency, jitter=args.latency / 2, error_rate=args.error_rate)
+    base_url = await stub.start()
+    with tempfile.TemporaryDirectory() as tmp:
+        rows_path = os.path.join(tmp, "rows.jsonl")
+        tags_path = os.path.join(tmp, "tags.jsonl")
+        checkpoint_path = os.path.join(tmp, "checkpoint.json")
+        _write_rows(rows_path, args.rows)
+        store = JsonlProfileStore(rows_path, tags_path)
+        with_text = sum(1 for line in open(rows_path) if any(v for k, v in json.loads(line).items() if k not in ("table", "user_id")))
+
+        # Roughly the time a full run would take at the configured rate
+        interrupt_after = with_text / min(args.rate, args.concurrency / args.latency) / 2
+        print(f"{args.rows:,} rows ({with_text:,} with text), stub latency {args.latency}s, "
+              f"error rate {args.error_rate:.0%}, concurrency {args.concurrency}, rate {args.rate:g}/s")
+        await _pass(base_url, store, checkpoint_path, args, interrupt_after)
+        with open(checkpoint_path) as f:
+            resume_points = {table: state["after"] for table, state in json.load(f)["tables"].items()}
+        written_before = sum(1 for _ in open(tags_path)) if os.path.exists(tags_path) else 0
+        print(f"interrupted after {interrupt_after:.1f}s: {written_before:,} rows written, resume points {resume_points}")
+
+        result = await _pass(base_url, store, checkpoint_path, args)
+        print(f"resumed: {result['tagged']:,} tagged in {result['seconds']:.1f}s, {result['rows_per_second']:.0f} rows/s, "
+              f"{result['calls']:,} model calls, {result['retries']:,} retries, {result['failed']} failed")
+        if result["still_failed"]:
+            retried = await _pass(base_url, store, checkpoint_path, args, retry_failed=True)
+            print(f"retry failed: {retried['tagged']:,} of {retried['rows']:,} tagged, {retried['still_failed']:,} still failed")
+
+        with open(tags_path) as f:
+            written = [json.loads(line)["user_id"] for line in f]
+        print(f"total written {len(written):,}, distinct rows {len(set(written)):,} of {with_text:,}, "
+              f"classified twice across the interruption {len(written) - len(set(written)):,}")
+    await stub.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=3000)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rate", type=float, default=250.0)
+    asyncio.run(main_async(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
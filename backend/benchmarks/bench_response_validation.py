@@ -0,0 +1,76 @@
+"""Role list and detail responses: double validation vs ResponseCodec.
+
+For each of the five role endpoints, renders synthetic database rows
+(benchmarks/profile_rows.py) into the response body the two ways the routes
+have done it:
+
+  - before: `[Model(**row) for row in rows]` returned from the route, then
+    FastAPI's response_model handling (serialize_response validates the
+    instances again and dumps them) and ORJSONResponse rendering;
+  - after: ResponseCodec.list_response, one TypeAdapter validation (email
+    columns read as str, see trusted_row_model) and a pydantic-core JSON
+    dump, returned as a Response FastAPI does not touch.
+
+Checks both produce the same JSON, then reports microseconds per row, rows/s
+and the speedup for a list of --rows rows and for a single-row detail
+response. Run from the backend directory:
+
+    python -m benchmarks.bench_response_validation [--rows 2000]
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Callable, List
+
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core.performance import ORJSONResponse, ResponseCodec
+from benchmarks.profile_rows import ROLE_ENDPOINTS, synthetic_rows
+
+def _best_of(fn: Callable, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def _double_validation(model, field):
+    """What a route returning Model(**row) costs with response_model set"""
+    loop = asyncio.new_event_loop()
+    renderer = ORJSONResponse(None)
+
+    def render(rows) -> bytes:
+        content = [model(**row) for row in rows] if isinstance(rows, list) else model(**rows)
+        return renderer.render(loop.run_until_complete(serialize_response(field=field, response_content=content)))
+    return render
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{args.rows} rows per list, best of {args.repeat}")
+    print(f"{'endpoint':<30} {'before us/row':>14} {'after us/row':>13} {'rows/s after':>13} {'list':>7} {'detail':>7}")
+    for name, (path, model) in ROLE_ENDPOINTS.items():
+        rows = synthetic_rows(model, args.rows)
+        codec = ResponseCodec(model)
+        before_list = _double_validation(model, create_response_field(name="response", type_=List[model]))
+        before_one = _double_validation(model, create_response_field(name="response", type_=model))
+        assert json.loads(before_list(rows)) == json.loads(codec.list_response(rows).body)
+        assert json.loads(before_one(rows[0])) == json.loads(codec.response(rows[0]).body)
+
+        old = _best_of(lambda: before_list(rows), args.repeat)
+        new = _best_of(lambda: codec.list_response(rows), args.repeat)
+        detail_repeat = args.repeat * 200
+        old_one = _best_of(lambda: before_one(rows[0]), detail_repeat)
+        new_one = _best_of(lambda: codec.response(rows[0]), detail_repeat)
+        per_row = 1e6 / args.rows
+        print(f"{path:<30} {old * per_row:>14.2f} {new * per_row:>13.2f} {args.rows / new:>13,.0f} "
+              f"{old / new:>6.1f}x {old_one / new_one:>6.1f}x")
+
+if __name__ == "__main__":
+    main()
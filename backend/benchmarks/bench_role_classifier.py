@@ -0,0 +1,62 @@
+"""Accuracy, coverage and latency of the local role classifier.
+
+Scores the trained artifact (settings.AI_CLASSIFIER_PATH, built by
+scripts/train_role_classifier.py) on the held-out labelled inputs in
+benchmarks/ai_search_eval.jsonl: overall accuracy, then for each confidence
+threshold the share of inputs answered locally and their accuracy (the rest
+would go to OpenAI), plus per-input inference latency. Run from the backend
+directory:
+
+    python -m benchmarks.bench_role_classifier [--model app/data/role_classifier.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+
+from app.core.config import settings
+from app.services.role_classifier import RoleClassifier
+
+EVAL_PATH = os.path.join(os.path.dirname(__file__), "ai_search_eval.jsonl")
+
+THRESHOLDS = (0.5, 0.6, 0.7, 0.75, 0.8, 0.9)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default=settings.AI_CLASSIFIER_PATH)
+    parser.add_argument("--eval", default=EVAL_PATH)
+    parser.add_argument("--repeat", type=int, default=200, help="timed passes over the eval set")
+    args = parser.parse_args()
+
+    model = RoleClassifier.load(args.model)
+    with open(args.eval, "r", encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+
+    scored = []
+    for row in rows:
+        role, probability = model.predict(row["user_input"])
+        scored.append((probability, role == row["role"]))
+    print(f"{len(rows)} held-out inputs, accuracy {sum(c for _, c in scored) / len(scored):.1%}")
+    print(f"{'threshold':>10} {'answered':>9} {'accuracy':>9}")
+    for threshold in THRESHOLDS:
+        answered = [correct for probability, correct in scored if probability >= threshold]
+        accuracy = sum(answered) / len(answered) if answered else 0.0
+        marker = "  <- AI_CLASSIFIER_THRESHOLD" if threshold == settings.AI_CLASSIFIER_THRESHOLD else ""
+        print(f"{threshold:>10.2f} {len(answered) / len(scored):>9.1%} {accuracy:>9.1%}{marker}")
+
+    texts = [row["user_input"] for row in rows]
+    latencies = []
+    for _ in range(args.repeat):
+        for text in texts:
+            start = time.perf_counter()
+            model.predict(text)
+            latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    print(f"\npredict() over {len(latencies):,} calls: "
+          f"mean {statistics.mean(latencies) * 1e6:.1f}us, "
+          f"p50 {latencies[len(latencies) // 2] * 1e6:.1f}us, "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1e6:.1f}us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""Full-text profile search: SearchIndex (BM25F) at 1M documents.
+
+Generates --docs synthetic profiles in the landing-table shapes (founders
+with a startup name, pitch and description, mentors, students and working
+professionals) over a Zipf-distributed vocabulary, and reports:
+
+  - build time, snapshot size, save and load times;
+  - per-row upsert/remove time (the delta segment);
+  - query latency for rare, common and multi-word queries, with and without
+    a type filter: p50, p99, max;
+  - on a --check-docs index, BM25F scored row by row in Python as the
+    reference: checks both rank the same top-k scores; and that a reloaded
+    snapshot answers exactly like the index it was saved from.
+
+Exits non-zero when a p99 is over --budget-ms. Run from the backend directory:
+
+    python -m benchmarks.bench_search [--docs 1000000] [--queries 500] [--k 20] [--budget-ms 50]
+"""
+import argparse
+import itertools
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from typing import Dict, List
+
+from app.services import search_service as search
+from app.services.search_service import SOURCES, SearchIndex, tokenize
+
+WORDS = ("ai platform saas fintech payments lending edtech learning healthcare diagnostics climate solar energy "
+         "logistics delivery marketplace ecommerce fashion food beverage gaming creator analytics data cloud "
+         "security robotics drones agriculture farmers retail brands customers students teachers hospitals "
+         "clinics insurance banking credit startups founders engineering software hardware mobile app web "
+         "community network hiring talent recruitment manufacturing supply chain sustainable affordable "
+         "automation machine vision language models voice chat commerce travel hospitality real estate "
+         "housing rental mobility electric vehicles batteries water waste recycling media content video "
+         "music sports fitness wellness mental health pets kids parenting seniors rural india tier cities").split()
+COLLEGES = ["IIT Bombay", "IIT Delhi", "BITS Pilani", "NIT Trichy", "Delhi University", "Anna University",
+            "Manipal Institute of Technology", "VIT Vellore", "SRM University", "Christ University"]
+COURSES = ["B.Tech Computer Science", "B.Tech Electronics", "BBA", "B.Com", "MBA Marketing", "M.Tech Data Science",
+           "B.Des Product Design", "BA Economics", "B.Sc Physics", "MBA Finance"]
+ROLES = ["Software Engineer", "Senior Software Engineer", "Product Manager", "Data Scientist", "Designer",
+         "Marketing Manager", "Sales Lead", "Engineering Manager", "Consultant", "Operations Lead"]
+
+class Corpus:
+    """Zipf-distributed words: the startup vocabulary first, then --vocabulary synthetic ones"""
+
+    def __init__(self, rng: random.Random, vocabulary: int):
+        self.rng = rng
+        self.words = WORDS + [f"{rng.choice(WORDS)[:4]}{i}x" for i in range(vocabulary)]
+        self.cum_weights = list(itertools.accumulate(1 / (rank + 1) ** 1.05 for rank in range(len(self.words))))
+
+    def text(self, n: int) -> str:
+        return " ".join(self.rng.choices(self.words, cum_weights=self.cum_weights, k=n))
+
+    def row(self, table: str, i: int) -> Dict:
+        rng = self.rng
+        row = {"user_id": f"{table}-{i}", "name": f"Person {i}"}
+        if table == "landing_founders":
+            row.update(startup_name=self.text(2).title(), elevator_pitch=self.text(rng.randint(8, 25)),
+                       description=self.text(rng.randint(20, 60)))
+        elif table == "landing_mentors":
+            row.update(organisation=f"{self.text(2).title()} Ventures")
+        elif table == "landing_student":
+            row.update(college=rng.choice(COLLEGES), course=rng.choice(COURSES))
+        else:
+            row.update(role=rng.choice(ROLES), company=f"{self.text(1).title()} Labs")
+        return row
+
+    def tables(self, docs: int) -> Dict[str, List[Dict]]:
+        shares = {"landing_founders": 0.3, "landing_mentors": 0.1, "landing_student": 0.4, "landing_working_professional": 0.2}
+        return {table: [self.row(table, i) for i in range(int(docs * share))] for table, share in shares.items()}
+
+def python_top(tables: Dict[str, List[Dict]], query: str, k: int) -> List[float]:
+    """BM25F from the formula, one row at a time"""
+    docs = []
+    for table, rows in tables.items():
+        fields = SOURCES[table][1]
+        for row in rows:
+            tf, length = Counter(), 0.0
+            for field, boost in fields.items():
+                tokens = tokenize(row.get(field))
+                length += boost * len(tokens)
+                for token in tokens:
+                    tf[token] += boost
+            docs.append((tf, length))
+    avgdl = sum(length for _, length in docs) / len(docs)
+    terms = list(dict.fromkeys(tokenize(query)))
+    df = {term: sum(1 for tf, _ in docs if term in tf) for term in terms}
+    scores = []
+    for tf, length in docs:
+        score = 0.0
+        for term in terms:
+            if tf[term]:
+                idf = math.log(1 + (len(docs) - df[term] + 0.5) / (df[term] + 0.5))
+                score += idf * tf[term] * (search.K1 + 1) / (tf[term] + search.K1 * (1 - search.B + search.B * length / avgdl))
+        scores.append(score)
+    return sorted((score for score in scores if score > 0), reverse=True)[:k]
+
+def latencies(index: SearchIndex, queries: List[str], k: int, kind=None) -> List[float]:
+    result = []
+    for query in queries:
+        start = time.perf_counter()
+        hits = index.search(query, k, kind)
+        [(index.kind(doc), index.user_ids[doc], index.names[doc], index.titles[doc]) for doc, _ in hits]
+        result.append((time.perf_counter() - start) * 1e3)
+    return sorted(result)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=1_000_000)
+    parser.add_argument("--vocabulary", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--check-docs", type=int, default=20_000)
+    parser.add_argument("--budget-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    corpus = Corpus(rng, args.vocabulary)
+    start = time.perf_counter()
+    tables = corpus.tables(args.docs)
+    print(f"generated {sum(map(len, tables.values())):,} rows in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    index = SearchIndex.from_tables(tables)
+    print(f"build: {time.perf_counter() - start:.1f}s, {len(index):,} docs, {len(index.terms):,} terms, "
+          f"{len(index.postings):,} postings")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "search_index.npz")
+        start = time.perf_counter()
+        index.save(path)
+        save = time.perf_counter() - start
+        start = time.perf_counter()
+        loaded = SearchIndex.load(path)
+        print(f"snapshot: {os.path.getsize(path) / 1e6:.0f}MB, save {save:.2f}s, load {time.perf_counter() - start:.2f}s")
+
+    common = corpus.words[:30]
+    rare = corpus.words[2000:]
+    shapes = {
+        "rare word": [rng.choice(rare) for _ in range(args.queries)],
+        "common word": [rng.choice(common) for _ in range(args.queries)],
+        "2-3 words": [corpus.text(rng.randint(2, 3)) for _ in range(args.queries)],
+        "college": [rng.choice(COLLEGES) for _ in range(args.queries)],
+    }
+    over = False
+    for label, queries in shapes.items():
+        for kind in (None, "founder"):
+            times = latencies(loaded, queries, args.k, kind)
+            p50, p99 = times[len(times) // 2], times[int(len(times) * 0.99)]
+            print(f"{label:>12}{' (founders)' if kind else '':>11}: p50 {p50:.2f}ms, p99 {p99:.2f}ms, max {times[-1]:.2f}ms")
+            over |= p99 > args.budget_ms
+
+    for query in itertools.chain(*(queries[:5] for queries in shapes.values())):
+        assert index.search(query, args.k) == loaded.search(query, args.k), query
+
+    rows = [corpus.row("landing_founders", args.docs + i) for i in range(1000)]
+    for i, row in enumerate(rows):
+        row["startup_name"] = f"Novel{i}q {row['startup_name']}"
+    start = time.perf_counter()
+    loaded.remove("landing_founders", "missing")
+    print(f"user_id map (built on the first write): {time.perf_counter() - start:.2f}s")
+    start = time.perf_counter()
+    for row in rows:
+        loaded.upsert("landing_founders", row)
+    upsert = (time.perf_counter() - start) / len(rows)
+    found = sum(1 for i, row in enumerate(rows) if [loaded.user_ids[doc] for doc, _ in loaded.search(f"novel{i}q", 5)] == [row["user_id"]])
+    start = time.perf_counter()
+    for row in rows:
+        loaded.remove("landing_founders", row["user_id"])
+    remove = (time.perf_counter() - start) / len(rows)
+    print(f"delta: upsert {upsert * 1e6:.0f}us/row, remove {remove * 1e6:.0f}us/row, "
+          f"{found}/{len(rows)} new founders found by a word of their startup name")
+    times = latencies(loaded, shapes["2-3 words"], args.k)
+    print(f"2-3 words after 1000 upserts and removes: p50 {times[len(times) // 2]:.2f}ms, p99 {times[int(len(times) * 0.99)]:.2f}ms")
+
+    check = Corpus(random.Random(11), args.vocabulary).tables(args.check_docs)
+    check_index = SearchIndex.from_tables(check)
+    for query in [corpus.text(rng.randint(1, 3)) for _ in range(5)] + ["IIT Bombay computer science"]:
+        expected = python_top(check, query, args.k)
+        assert [round(score, 3) for score in expected] == [round(score, 3) for _, score in check_index.search(query, args.k)], query
+    print(f"python reference ({args.check_docs:,} docs): same top-{args.k} scores for 6 queries")
+
+    if over:
+        print(f"OVER BUDGET: a p99 is over {args.budget_ms:.2f}ms")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""Load test: the single-worker uvicorn command PM2 ran vs the gunicorn entrypoint.
+
+Starts each server configuration on a free local port with the app as it is
+(no Supabase key, so role lists serve the mock rows) and waits for /health.
+Then it:
+
+  - drives the server with --connections keep-alive connections, spread over
+    --processes load-generator processes, for --duration seconds, over a mix
+    of /health, /api/locations/countries and /api/students/, and reports
+    requests/s, latency percentiles and errors;
+  - sends SIGTERM while requests are in flight on fresh connections, and
+    counts requests that were accepted but never answered (dropped) against
+    those refused once the listener closed.
+
+The load generator is a minimal asyncio HTTP/1.1 client, so the client side
+stays cheap. It shares the machine with the server, so run it on a host with
+several CPUs. Run from the backend directory:
+
+    python -m benchmarks.bench_server [--duration 10] [--connections 64] [--workers 2 4]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Dict, List, Tuple
+
+PATHS = ["/health", "/api/locations/countries", "/api/students/"]
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+async def _request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, path: str, close: bool = False) -> int:
+    """Send one GET and read the whole response; returns the status code"""
+    connection = "close" if close else "keep-alive"
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: {connection}\r\n\r\n".encode())
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    length = 0
+    for line in head.split(b"\r\n")[1:]:
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+async def _load(port: int, connections: int, duration: float, offset: int) -> Tuple[List[float], int]:
+    latencies: List[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def connection(i: int):
+        nonlocal errors
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        n = i
+        while time.perf_counter() < deadline:
+            path = PATHS[n % len(PATHS)]
+            n += 1
+            start = time.perf_counter()
+            try:
+                status = await _request(reader, writer, path)
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                errors += 1
+                writer.close()
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                continue
+            if status != 200:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+        writer.close()
+
+    await asyncio.gather(*(connection(offset + i) for i in range(connections)))
+    return latencies, errors
+
+async def _drain(port: int, connections: int, duration: float) -> Dict[str, int]:
+    """One request per fresh connection until the server stops accepting"""
+    counts = {"ok": 0, "dropped": 0, "refused": 0}
+    deadline = time.perf_counter() + duration
+
+    async def client(i: int):
+        while time.perf_counter() < deadline:
+            try:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            except OSError:
+                counts["refused"] += 1
+                return
+            try:
+                await _request(reader, writer, PATHS[i % len(PATHS)], close=True)
+                counts["ok"] += 1
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                counts["dropped"] += 1
+            finally:
+                writer.close()
+
+    await asyncio.gather(*(client(i) for i in range(connections)))
+    return counts
+
+def _load_process(args: Tuple) -> Tuple[List[float], int]:
+    return asyncio.run(_load(*args))
+
+def _drain_process(args: Tuple) -> Dict[str, int]:
+    return asyncio.run(_drain(*args))
+
+def _start(command: List[str], env: Dict[str, str], port: int) -> subprocess.Popen:
+    proc = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                            start_new_session=True)
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1).read()
+            return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError(f"server did not start: {' '.join(command)}")
+
+def _percentile(values: List[float], q: float) -> float:
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+def _run(name: str, command: List[str], env: Dict[str, str], port: int, args) -> Dict:
+    proc = _start(command, env, port)
+    per_process = max(1, args.connections // args.processes)
+    with multiprocessing.Pool(args.processes) as pool:
+        # Warm-up pass, so each worker has loaded its data before measuring
+        pool.map(_load_process, [(port, per_process, 1.0, i * per_process) for i in range(args.processes)])
+        results = pool.map(_load_process, [(port, per_process, args.duration, i * per_process) for i in range(args.processes)])
+
+        drain = pool.map_async(_drain_process, [(port, per_process, 10.0)] * args.processes)
+        time.sleep(1.0)
+        stop_started = time.perf_counter()
+        os.killpg(proc.pid, signal.SIGTERM)
+        proc.wait(timeout=60)
+        stopped = time.perf_counter() - stop_started
+        drained = {"ok": 0, "dropped": 0, "refused": 0}
+        for counts in drain.get():
+            for key, value in counts.items():
+                drained[key] += value
+
+    latencies = sorted(latency for process_latencies, _ in results for latency in process_latencies)
+    errors = sum(process_errors for _, process_errors in results)
+    return {
+        "name": name,
+        "rps": len(latencies) / args.duration,
+        "p50": _percentile(latencies, 0.50) * 1e3,
+        "p99": _percentile(latencies, 0.99) * 1e3,
+        "errors": errors,
+        "stop_seconds": stopped,
+        **drained,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--processes", type=int, default=max(1, min(4, os.cpu_count() // 2)))
+    parser.add_argument("--workers", type=int, nargs="+", default=[os.cpu_count()], help="gunicorn worker counts to try")
+    args = parser.parse_args()
+
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=backend)
+    configs = []
+    port = _free_port()
+    configs.append(("uvicorn, 1 worker (before)", [sys.executable, "-m", "uvicorn", "app.main:app",
+                                                   "--host", "127.0.0.1", "--port", str(port)], env, port))
+    for workers in args.workers:
+        port = _free_port()
+        configs.append((f"gunicorn.conf.py, {workers} workers",
+                        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app.main:app",
+                         "--bind", f"127.0.0.1:{port}"],
+                        dict(env, SERVER_WORKERS=str(workers)), port))
+
+    print(f"{os.cpu_count()} CPUs, {args.connections} keep-alive connections from {args.processes} processes, "
+          f"{args.duration:g}s per run; paths {', '.join(PATHS)}")
+    print(f"{'server':<32} {'req/s':>8} {'p50 ms':>7} {'p99 ms':>7} {'errors':>6}   "
+          f"{'SIGTERM: stop s':>15} {'answered':>8} {'dropped':>7} {'refused':>7}")
+    os.chdir(backend)
+    for name, command, config_env, config_port in configs:
+        result = _run(name, command, config_env, config_port, args)
+        print(f"{result['name']:<32} {result['rps']:>8,.0f} {result['p50']:>7.1f} {result['p99']:>7.1f} "
+              f"{result['errors']:>6}   {result['stop_seconds']:>15.1f} {result['ok']:>8} {result['dropped']:>7} "
+              f"{result['refused']:>7}")
+
+if __name__ == "__main__":
+    main()
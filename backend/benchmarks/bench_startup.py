@@ -0,0 +1,120 @@
+"""Worker startup time: imports per module, then the lifespan warm-up steps.
+
+Starts fresh interpreters (as a uvicorn or PM2 worker would) with
+`python -X importtime`, imports app.main, runs the lifespan startup and
+shutdown, and reports:
+
+  - total import time of app.main, and which heavy SDKs it left unimported
+    (openai, supabase, firebase_admin are loaded by the warm-up instead);
+  - the slowest app modules (self time) and third-party packages
+    (cumulative time) from the import-time trace;
+  - each warm-up step's time, from app.core.startup.startup_report():
+    the steps the lifespan waits for, and those it leaves running in the
+    background once the worker is serving.
+
+Best of --runs. Exits non-zero when the import time, or the time until the
+worker is serving (imports plus lifespan startup), is over budget. Run from the backend directory:
+
+    python -m benchmarks.bench_startup [--runs 3] [--budget-import-ms 900] [--budget-ready-ms 1000]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+DEFERRED = ["openai", "supabase", "firebase_admin"]
+
+_WORKER = r"""
+import asyncio, json, sys, time
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter() - start
+deferred = [name for name in %r if name not in sys.modules]
+from app.core.startup import startup_report
+
+async def lifespan():
+    start = time.perf_counter()
+    async with app.main.app.router.lifespan_context(app.main.app):
+        ready = time.perf_counter() - start
+    return ready
+
+ready = asyncio.run(lifespan())
+print(json.dumps({"import": imported, "lifespan": ready, "deferred": deferred, "report": startup_report()}))
+""" % DEFERRED
+
+def _parse_importtime(trace: str) -> Tuple[Dict[str, float], Dict[str, float]]:
+    """(self seconds per app module, cumulative seconds per top-level third-party package)"""
+    app_modules: Dict[str, float] = defaultdict(float)
+    packages: Dict[str, float] = {}
+    for line in trace.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        if not fields[0].strip().isdigit():
+            continue
+        self_us, cumulative_us, name = int(fields[0]), int(fields[1]), fields[2].strip()
+        if name == "app" or name.startswith("app."):
+            app_modules[name] += self_us / 1e6
+        elif "." not in name and not name.startswith("_"):
+            packages[name] = max(packages.get(name, 0.0), cumulative_us / 1e6)
+    return app_modules, packages
+
+def _run_worker() -> Dict:
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=backend)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", _WORKER], cwd=backend, env=env,
+                          capture_output=True, text=True, check=True)
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["app_modules"], result["packages"] = _parse_importtime(proc.stderr)
+    return result
+
+def _top(items: Dict[str, float], count: int) -> List[Tuple[str, float]]:
+    return sorted(items.items(), key=lambda item: item[1], reverse=True)[:count]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=8)
+    parser.add_argument("--budget-import-ms", type=float, default=900.0)
+    parser.add_argument("--budget-ready-ms", type=float, default=1000.0, help="imports plus lifespan startup")
+    args = parser.parse_args()
+
+    runs = [_run_worker() for _ in range(args.runs)]
+    best = min(runs, key=lambda run: run["import"] + run["lifespan"])
+    import_ms = best["import"] * 1e3
+    ready_ms = (best["import"] + best["lifespan"]) * 1e3
+
+    print(f"best of {args.runs}: import app.main {import_ms:.0f}ms, lifespan startup "
+          f"{best['lifespan'] * 1e3:.0f}ms, serving after {ready_ms:.0f}ms")
+    print(f"not imported by app.main: {', '.join(best['deferred']) or 'none'} (of {', '.join(DEFERRED)})")
+    print(f"\nslowest app modules (self time; -X importtime adds overhead)")
+    for name, seconds in _top(best["app_modules"], args.top):
+        print(f"  {name:<45} {seconds * 1e3:>7.1f}ms")
+    print(f"\nslowest third-party packages (cumulative)")
+    for name, seconds in _top(best["packages"], args.top):
+        print(f"  {name:<45} {seconds * 1e3:>7.1f}ms")
+    report = best["report"]
+    print(f"\nwarm-up steps, run concurrently: {(report['warm_up_seconds'] or 0) * 1e3:.0f}ms total")
+    for name, step in report["steps"].items():
+        error = f"  ({step['error']})" if step["error"] else ""
+        print(f"  {name:<45} {step['seconds'] * 1e3:>7.1f}ms{error}")
+    print(f"background warm-up, after the worker is serving")
+    for name, step in report["background"].items():
+        error = f"  ({step['error']})" if step["error"] else ""
+        print(f"  {name:<45} {step['seconds'] * 1e3:>7.1f}ms{error}")
+
+    failures = []
+    if import_ms > args.budget_import_ms:
+        failures.append(f"import {import_ms:.0f}ms > {args.budget_import_ms:.0f}ms")
+    if ready_ms > args.budget_ready_ms:
+        failures.append(f"ready {ready_ms:.0f}ms > {args.budget_ready_ms:.0f}ms")
+    if failures:
+        print(f"\nOVER BUDGET: {'; '.join(failures)}")
+        sys.exit(1)
+    print(f"\nwithin budget (import {args.budget_import_ms:.0f}ms, ready {args.budget_ready_ms:.0f}ms)")
+
+if __name__ == "__main__":
+    main()
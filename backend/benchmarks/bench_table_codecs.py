@@ -0,0 +1,73 @@
+"""Cost of the per-table column codecs on list reads.
+
+For each landing table, decodes --rows synthetic rows shaped as Supabase
+returns them (benchmarks/profile_rows.py: timestamps as ISO strings, phone
+in the column's storage type) with TableCodec.decode_many, and compares it
+with the ResponseCodec validation and dump the list routes run on the same
+rows. Also times the per-row phone loop StudentService used to run, and a
+second decode of already-decoded rows (the type-check-only fast path).
+Run from the backend directory:
+
+    python -m benchmarks.bench_table_codecs [--rows 10000]
+"""
+import argparse
+import copy
+import time
+from typing import Callable
+
+from app.core.performance import ResponseCodec
+from app.services.table_codecs import TABLE_CODECS
+from benchmarks.profile_rows import ROLE_ENDPOINTS, synthetic_rows
+
+TABLES = {
+    "students": "landing_student",
+    "founders": "landing_founders",
+    "mentors": "landing_mentors",
+    "vendors": "landing_vendor",
+    "working_professionals": "landing_working_professional",
+}
+
+def _best_of(make_input: Callable, fn: Callable, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        data = make_input()
+        start = time.perf_counter()
+        fn(data)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def _old_student_phone_loop(rows):
+    for result in rows:
+        if 'phone' in result and isinstance(result['phone'], int):
+            result['phone'] = str(result['phone'])
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    per_row = 1e6 / args.rows
+    print(f"{args.rows} rows per table, best of {args.repeat}; microseconds per row")
+    print(f"{'table':<30} {'columns':>7} {'decode':>7} {'decoded':>8} {'response':>9} {'share':>6}")
+    for name, (_, model) in ROLE_ENDPOINTS.items():
+        codec = TABLE_CODECS[TABLES[name]]
+        rows = synthetic_rows(model, args.rows)
+        fresh = lambda: copy.deepcopy(rows)
+        decoded = codec.decode_many(fresh())
+        response = ResponseCodec(model)
+        assert response.list_response(decoded).body == response.list_response(fresh()).body
+
+        decode_time = _best_of(fresh, codec.decode_many, args.repeat)
+        fast_time = _best_of(lambda: decoded, codec.decode_many, args.repeat)
+        response_time = _best_of(lambda: decoded, response.list_response, args.repeat)
+        print(f"{codec.table:<30} {len(codec.columns):>7} {decode_time * per_row:>7.2f} {fast_time * per_row:>8.2f} "
+              f"{response_time * per_row:>9.2f} {decode_time / (decode_time + response_time):>6.1%}")
+
+    rows = synthetic_rows(ROLE_ENDPOINTS["students"][1], args.rows)
+    old_time = _best_of(lambda: copy.deepcopy(rows), _old_student_phone_loop, args.repeat)
+    print(f"\nprevious StudentService per-row phone loop alone: {old_time * per_row:.2f}us/row")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Vendor search: VendorIndex posting lists vs filtering every row in Python.
+
+Builds a VendorIndex from --vendors synthetic vendors (categories and team
+sizes from the registration form, 1-3 of 600 cities, 0-30 years) and
+reports:
+
+  - index build time and per-row upsert/update/remove time;
+  - search latency (one page plus all facet counts) for query shapes from
+    broad to narrow: p50, p99 and the average number of matches;
+  - the same page, total and facet counts computed by scanning every row,
+    as the reference: checks they agree and shows the speedup.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_vendor_search [--vendors 200000] [--queries 300]
+"""
+import argparse
+import random
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+from app.services.matching_service import normalize_tag
+from app.services.vendor_search_service import FACETS, VendorIndex
+
+CATEGORIES = ["Tech & Development", "Branding / Design", "Legal / Compliance", "Finance / Accounting",
+              "Manufacturing / Sourcing", "Marketing & Growth", "Hiring & HR", "Others"]
+TEAM_SIZES = ["1-5 people", "6-10 people", "11-25 people", "26-50 people", "50+ people"]
+CITIES = [f"City {i}" for i in range(600)]
+
+def synthetic_vendor(rng: random.Random, i: int) -> Dict:
+    return {
+        "user_id": f"vendor-{i}",
+        "business_name": f"Vendor {i}",
+        "category": rng.sample(CATEGORIES, rng.randint(1, 3)),
+        # A few big cities hold most vendors
+        "locations": list({CITIES[min(int(rng.paretovariate(0.8)) - 1, len(CITIES) - 1)] for _ in range(rng.randint(1, 3))}),
+        "team_size": rng.choice(TEAM_SIZES),
+        "years_of_experience": rng.randint(0, 30),
+        "created_at": f"2024-01-01T00:00:{i:09d}",
+    }
+
+def reference(rows: List[Dict], selected: Dict[str, List[str]], min_years: Optional[int], max_years: Optional[int],
+              offset: int, limit: int):
+    """Total, page user_ids and facet counts by checking every row"""
+    def keys(row, facet):
+        value = row.get(facet)
+        return {normalize_tag(item) for item in (value if isinstance(value, list) else [value])}
+
+    def passes(row, skip=None):
+        for facet in FACETS:
+            if facet != skip and selected.get(facet) and not keys(row, facet) & {normalize_tag(v) for v in selected[facet]}:
+                return False
+        years = row["years_of_experience"]
+        return (min_years is None or years >= min_years) and (max_years is None or years <= max_years)
+
+    matched = [row for row in rows if passes(row)]
+    page = [row["user_id"] for row in matched[::-1][offset:offset + limit]]
+    facets = {facet: Counter(key for row in rows if passes(row, facet) for key in keys(row, facet)) for facet in FACETS}
+    return len(matched), page, facets
+
+def random_query(rng: random.Random, shape: str):
+    selected, min_years, max_years = {}, None, None
+    if shape in ("category", "category+city", "narrow"):
+        selected["category"] = rng.sample(CATEGORIES, 1 if shape != "category" else 2)
+    if shape in ("category+city", "narrow"):
+        selected["locations"] = [rng.choice(CITIES[:50])]
+    if shape == "narrow":
+        selected["team_size"] = [rng.choice(TEAM_SIZES)]
+        min_years = rng.randint(5, 15)
+        max_years = min_years + 5
+    return selected, min_years, max_years, rng.choice([0, 0, 0, 20, 100])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vendors", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=300)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    rows = [synthetic_vendor(rng, i) for i in range(args.vendors)]
+    start = time.perf_counter()
+    index = VendorIndex.from_rows(rows)
+    print(f"{len(index):,} vendors: build {time.perf_counter() - start:.2f}s")
+
+    extra = [synthetic_vendor(rng, args.vendors + i) for i in range(1000)]
+    for label, run in (("upsert (new)", lambda row: index.upsert(row)),
+                       ("upsert (changed)", lambda row: index.upsert({**row, "category": rng.sample(CATEGORIES, 2)})),
+                       ("remove", lambda row: index.remove(row["user_id"]))):
+        start = time.perf_counter()
+        for row in extra:
+            run(row)
+        print(f"  {label}: {(time.perf_counter() - start) / len(extra) * 1e6:.1f}us/row")
+
+    for shape in ("all", "category", "category+city", "narrow"):
+        latencies, totals = [], 0
+        for _ in range(args.queries):
+            selected, min_years, max_years, offset = random_query(rng, shape)
+            start = time.perf_counter()
+            result = index.search(selected, min_years, max_years, offset, 20)
+            latencies.append((time.perf_counter() - start) * 1e3)
+            totals += result["total"]
+        latencies.sort()
+        print(f"{shape:>14}: p50 {latencies[len(latencies) // 2]:.2f}ms, p99 {latencies[int(len(latencies) * 0.99)]:.2f}ms, "
+              f"{totals / args.queries:,.0f} matches on average")
+
+    checked, python_time = 0, 0.0
+    for shape in ("all", "category", "category+city", "narrow"):
+        selected, min_years, max_years, offset = random_query(rng, shape)
+        result = index.search(selected, min_years, max_years, offset, 20)
+        start = time.perf_counter()
+        total, page, facets = reference(rows, selected, min_years, max_years, offset, 20)
+        python_time += time.perf_counter() - start
+        assert result["total"] == total and [row["user_id"] for row in result["vendors"]] == page, shape
+        for facet in FACETS:
+            assert {normalize_tag(item["value"]): item["count"] for item in result["facets"][facet]} == dict(facets[facet]), facet
+        checked += 1
+    print(f"python reference: {python_time / checked * 1e3:.0f}ms per search (same page, total and facet counts)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""First requests after a deploy vs steady state, with and without the lifespan warm-up.
+
+For each mode (WARMUP_ENABLED=false, then true) starts a fresh single uvicorn
+worker, waits until /readyz answers 200 (what a load balancer would do), and
+immediately sends --requests requests over --connections keep-alive
+connections, cycling through the role list pages and location endpoints.
+Then it sends the same number again as the steady-state reference. Reports
+p50, p99 and the slowest request for both, per mode.
+
+The role lists serve the mock rows unless SUPABASE_SERVICE_ROLE_KEY is set,
+so the warm-up mostly saves in-process work here; against a real Supabase
+project the first queries also pay for connection setup. Run from the
+backend directory:
+
+    python -m benchmarks.bench_warm_up [--requests 1000] [--connections 16]
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List
+
+from benchmarks.bench_server import _free_port, _percentile, _request
+
+PATHS = [
+    "/api/students/",
+    "/api/founders/",
+    "/api/mentors/",
+    "/api/vendors/",
+    "/api/working-professionals/",
+    "/api/locations/countries",
+    "/api/locations/states?country=India",
+    "/api/locations/popular-cities",
+]
+
+async def _burst(port: int, total: int, connections: int) -> List[float]:
+    latencies: List[float] = []
+    sent = 0
+
+    async def connection(i: int):
+        nonlocal sent
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        n = i
+        while sent < total:
+            sent += 1
+            start = time.perf_counter()
+            await _request(reader, writer, PATHS[n % len(PATHS)])
+            latencies.append(time.perf_counter() - start)
+            n += 1
+        writer.close()
+
+    await asyncio.gather(*(connection(i) for i in range(connections)))
+    return latencies
+
+def _wait_ready(port: int, timeout: float = 60.0) -> float:
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/readyz", timeout=1).read()
+            return time.perf_counter() - start
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.02)
+    raise RuntimeError("server never became ready")
+
+def _summary(latencies: List[float]) -> Dict[str, float]:
+    ordered = sorted(latencies)
+    return {"p50": _percentile(ordered, 0.50) * 1e3, "p99": _percentile(ordered, 0.99) * 1e3, "max": ordered[-1] * 1e3}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--connections", type=int, default=16)
+    args = parser.parse_args()
+
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    print(f"first {args.requests} requests after /readyz vs the next {args.requests}, "
+          f"{args.connections} connections, one uvicorn worker")
+    print(f"{'warm-up':<9} {'ready s':>8} {'first p50':>10} {'first p99':>10} {'first max':>10}   "
+          f"{'steady p50':>10} {'steady p99':>10} {'steady max':>10}")
+    for enabled in ("false", "true"):
+        port = _free_port()
+        env = dict(os.environ, PYTHONPATH=backend, WARMUP_ENABLED=enabled)
+        proc = subprocess.Popen([sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+                                 "--port", str(port), "--log-level", "warning"],
+                                cwd=backend, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            ready = _wait_ready(port)
+            first = _summary(asyncio.run(_burst(port, args.requests, args.connections)))
+            steady = _summary(asyncio.run(_burst(port, args.requests, args.connections)))
+        finally:
+            proc.terminate()
+            proc.wait(timeout=30)
+        print(f"{'on' if enabled == 'true' else 'off':<9} {ready:>8.2f} {first['p50']:>10.2f} {first['p99']:>10.2f} "
+              f"{first['max']:>10.2f}   {steady['p50']:>10.2f} {steady['p99']:>10.2f} {steady['max']:>10.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""Load generator and accuracy check for AI search, fully offline.
+
+Replays the labelled inputs in benchmarks/ai_search_eval.jsonl against the AI
+search service, backed by the local OpenAI stub (benchmarks.openai_stub) with
+configurable latency, errors and stalls, and reports latency percentiles,
+throughput, upstream calls, answer sources and accuracy against the labels.
+The workload is skewed (Zipf over the eval inputs, as landing-page traffic
+is), so repeated inputs exercise the cache and request coalescing.
+
+    python -m benchmarks.load_ai_search --requests 2000 --concurrency 64
+    python -m benchmarks.load_ai_search --matrix            # compare cache/classifier on and off
+    python -m benchmarks.load_ai_search --rate 200 --stall-rate 0.02 --timeout 1.0
+
+By default the service runs in-process. With --url the requests go over HTTP
+to a running API instead (start it with OPENAI_BASE_URL pointing at
+`python -m benchmarks.openai_stub`); upstream calls then come from
+/api/ai-search/stats, which needs --admin-token. --max-p99-ms and --min-accuracy make the run exit
+non-zero when missed, for CI. Stub answers come from keyword rules, so
+accuracy measures the pipeline (cache, local classifier, fallbacks), not GPT.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.ai_search_service import AISearchService, ROLE_URLS
+from benchmarks.openai_stub import OpenAIStub
+
+EVAL_PATH = os.path.join(os.path.dirname(__file__), "ai_search_eval.jsonl")
+
+# (name, cache enabled, local classifier enabled) for --matrix
+MATRIX = [
+    ("openai only", False, False),
+    ("cache", True, False),
+    ("local classifier", False, True),
+    ("cache + local classifier", True, True),
+]
+
+def load_eval_set(path: str = EVAL_PATH) -> List[Tuple[str, str]]:
+    """(user_input, role) pairs"""
+    with open(path, "r", encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    for row in rows:
+        if row["role"] not in ROLE_URLS:
+            raise ValueError(f"Unknown role {row['role']!r} in {path}")
+    return [(row["user_input"], row["role"]) for row in rows]
+
+def build_workload(rows: List[Tuple[str, str]], requests: int, zipf: float, unique: bool, seed: int) -> List[Tuple[str, str]]:
+    """Sample requests from the eval set; zipf=0 is uniform, unique makes every input distinct"""
+    rng = random.Random(seed)
+    ranked = list(rows)
+    rng.shuffle(ranked)
+    weights = [1.0 / (rank ** zipf) for rank in range(1, len(ranked) + 1)]
+    workload = rng.choices(ranked, weights=weights, k=requests)
+    if unique:
+        # Two varying words, so variants are not one-word near duplicates of each other
+        workload = [(f"{text} #{i} {rng.randrange(10 ** 6)}", role) for i, (text, role) in enumerate(workload)]
+    return workload
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+class _Target:
+    """Something to send classifications to: the service in-process, or a running API"""
+
+    async def classify(self, user_input: str) -> Dict:
+        raise NotImplementedError
+
+    async def upstream_calls(self) -> int:
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+class _ServiceTarget(_Target):
+    def __init__(self, stub: OpenAIStub):
+        self.stub = stub
+        self.service = AISearchService()
+
+    async def classify(self, user_input: str) -> Dict:
+        return await self.service.classify(user_input)
+
+    async def upstream_calls(self) -> int:
+        return self.stub.calls
+
+    def stats(self) -> Dict:
+        return self.service.metrics()
+
+    async def close(self):
+        await self.service.close()
+
+class _HTTPTarget(_Target):
+    def __init__(self, url: str, concurrency: int, admin_token: Optional[str] = None):
+        import httpx
+        self.url = url.rstrip("/")
+        self.admin_token = admin_token
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        self.client = httpx.AsyncClient(timeout=60.0, limits=limits)
+
+    async def classify(self, user_input: str) -> Dict:
+        response = await self.client.post(f"{self.url}/api/ai-search", json={"user_input": user_input})
+        response.raise_for_status()
+        return response.json()
+
+    async def upstream_calls(self) -> int:
+        response = await self.client.get(f"{self.url}/api/ai-search/stats", headers={"X-Admin-Token": self.admin_token or ""})
+        response.raise_for_status()
+        return response.json()["upstream_calls"]
+
+    def stats(self) -> Dict:
+        return {}
+
+    async def close(self):
+        await self.client.aclose()
+
+async def run_load(target: _Target, workload: List[Tuple[str, str]], concurrency: int, rate: Optional[float], seed: int) -> Dict:
+    """
+    Send the workload and collect per-request results. Closed loop by default
+    (concurrency workers back to back); with a rate, requests arrive as a
+    Poisson process and latency counts from the scheduled arrival, so a
+    backed-up server is not flattered by a slowed-down client.
+    """
+    records: List[Tuple[float, Optional[Dict], str]] = [None] * len(workload)
+    upstream_before = await target.upstream_calls()
+    start = time.perf_counter()
+
+    async def one(i: int, scheduled: float):
+        text, label = workload[i]
+        try:
+            result = await target.classify(text)
+        except Exception as e:
+            print(f"Request failed: {e}")
+            result = None
+        records[i] = (time.perf_counter() - scheduled, result, label)
+
+    if rate:
+        rng = random.Random(seed)
+        tasks = []
+        arrival = start
+        for i in range(len(workload)):
+            arrival += rng.expovariate(rate)
+            delay = arrival - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(one(i, arrival)))
+        await asyncio.gather(*tasks)
+    else:
+        cursor = iter(range(len(workload)))
+
+        async def worker():
+            for i in cursor:
+                await one(i, time.perf_counter())
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    elapsed = time.perf_counter() - start
+    upstream = await target.upstream_calls() - upstream_before
+    return _summarise(records, elapsed, upstream)
+
+def _summarise(records, elapsed: float, upstream: int) -> Dict:
+    latencies = sorted(latency for latency, _, _ in records)
+    answered = [(result, label) for _, result, label in records if result is not None]
+    fallbacks = sum(1 for result, _ in answered if result.get("confidence") == 0.0)
+    correct = sum(1 for result, label in answered if result["role"] == label)
+    return {
+        "requests": len(records),
+        "failed": len(records) - len(answered),
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(len(records) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(_percentile(latencies, 0.50) * 1e3, 2),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1e3, 2),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1e3, 2),
+        "max_ms": round(latencies[-1] * 1e3, 2),
+        "upstream_calls": upstream,
+        "cached": sum(1 for result, _ in answered if result.get("cached")),
+        "fallbacks": fallbacks,
+        "accuracy": round(correct / len(records), 4),
+    }
+
+def _print_report(name: str, report: Dict, stats: Dict):
+    print(f"{name}: {report['requests']} requests in {report['seconds']:.2f}s, {report['throughput_rps']:.0f} req/s")
+    print(f"  latency p50 {report['p50_ms']:.1f}ms  p95 {report['p95_ms']:.1f}ms  "
+          f"p99 {report['p99_ms']:.1f}ms  max {report['max_ms']:.1f}ms")
+    print(f"  upstream calls {report['upstream_calls']}  cached {report['cached']}  "
+          f"fallbacks {report['fallbacks']}  failed {report['failed']}  accuracy {report['accuracy']:.1%}")
+    if stats:
+        service = {k: v for k, v in stats.items() if k != "cache"}
+        print(f"  service {service}  cache hit rate {stats['cache']['hit_rate']:.1%}")
+
+async def _run_config(args, workload, name: str, cache: bool, classifier: bool) -> Dict:
+    if args.url:
+        target = _HTTPTarget(args.url, args.concurrency, args.admin_token)
+        stub = None
+    else:
+        stub = OpenAIStub(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                          stall_rate=args.stall_rate, seed=args.seed)
+        settings.OPENAI_BASE_URL = await stub.start()
+        settings.OPENAI_API_KEY = "stub"
+        settings.AI_CACHE_SIZE = args.cache_size if cache else 0
+        settings.AI_CLASSIFIER_PATH = args.classifier if classifier else None
+        if args.timeout is not None:
+            settings.AI_SEARCH_TIMEOUT = args.timeout
+        target = _ServiceTarget(stub)
+    try:
+        report = await run_load(target, workload, args.concurrency, args.rate, args.seed)
+        _print_report(name, report, target.stats())
+    finally:
+        await target.close()
+        if stub is not None:
+            await stub.close()
+    return {"name": name, **report}
+
+async def main_async(args) -> List[Dict]:
+    rows = load_eval_set(args.eval)
+    workload = build_workload(rows, args.requests, args.zipf, args.unique, args.seed)
+    print(f"{len(workload)} requests over {len(set(text for text, _ in workload))} distinct inputs, "
+          f"{'rate %g/s' % args.rate if args.rate else 'concurrency %d' % args.concurrency}")
+    if not args.url:
+        print(f"stub latency {args.latency}s (+{args.jitter}s jitter), error rate {args.error_rate:.0%}, "
+              f"stall rate {args.stall_rate:.0%}")
+    print()
+
+    if args.matrix and not args.url:
+        configs = MATRIX
+    else:
+        configs = [("ai search", not args.no_cache, not args.no_classifier)]
+    reports = []
+    for name, cache, classifier in configs:
+        reports.append(await _run_config(args, workload, name, cache, classifier))
+    return reports
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32, help="closed-loop workers (ignored with --rate)")
+    parser.add_argument("--rate", type=float, help="open-loop arrivals per second instead of closed loop")
+    parser.add_argument("--zipf", type=float, default=1.0, help="workload skew over eval inputs (0 = uniform)")
+    parser.add_argument("--unique", action="store_true", help="make every input distinct (defeats cache and coalescing)")
+    parser.add_argument("--eval", default=EVAL_PATH, help="labelled inputs (JSONL)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--url", help="load a running API at this base URL instead of the in-process service")
+    parser.add_argument("--admin-token", default=os.getenv("LOCATION_ADMIN_TOKEN"),
+                        help="X-Admin-Token for /api/ai-search/stats with --url (default: $LOCATION_ADMIN_TOKEN)")
+    stub = parser.add_argument_group("in-process stub and service")
+    stub.add_argument("--latency", type=float, default=0.3, help="stub seconds per completion")
+    stub.add_argument("--jitter", type=float, default=0.1)
+    stub.add_argument("--error-rate", type=float, default=0.0)
+    stub.add_argument("--stall-rate", type=float, default=0.0)
+    stub.add_argument("--timeout", type=float, help="override AI_SEARCH_TIMEOUT")
+    stub.add_argument("--cache-size", type=int, default=settings.AI_CACHE_SIZE)
+    stub.add_argument("--classifier", default=settings.AI_CLASSIFIER_PATH, help="local classifier artifact")
+    stub.add_argument("--no-cache", action="store_true")
+    stub.add_argument("--no-classifier", action="store_true")
+    stub.add_argument("--matrix", action="store_true", help="run with cache and classifier each on and off")
+    gates = parser.add_argument_group("CI gates (checked on every configuration run)")
+    gates.add_argument("--max-p99-ms", type=float)
+    gates.add_argument("--min-accuracy", type=float)
+    gates.add_argument("--json", help="also write the reports to this file")
+    args = parser.parse_args()
+
+    reports = asyncio.run(main_async(args))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2)
+
+    failures = []
+    for report in reports:
+        if args.max_p99_ms is not None and report["p99_ms"] > args.max_p99_ms:
+            failures.append(f"{report['name']}: p99 {report['p99_ms']}ms > {args.max_p99_ms}ms")
+        if args.min_accuracy is not None and report["accuracy"] < args.min_accuracy:
+            failures.append(f"{report['name']}: accuracy {report['accuracy']:.1%} < {args.min_accuracy:.1%}")
+    if failures:
+        print("\nFAILED: " + "; ".join(failures))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""Local OpenAI-compatible stub server for AI search benchmarks.
+
+Implements POST /v1/chat/completions well enough for the openai client:
+after a configurable latency it classifies the last user message by keyword
+into one of the AI search roles (with token logprobs when asked), or, in JSON
+mode, into {"role", "tags"} for the profile tagging back-fill. A
+configurable fraction of calls fails with a 500, and another stalls without
+answering, to exercise client deadlines. Used in-process by the benchmarks,
+or standalone:
+
+    python -m benchmarks.openai_stub --port 8100 --latency 0.3 --error-rate 0.05 --stall-rate 0.01
+
+and then run the API with OPENAI_BASE_URL=http://127.0.0.1:8100/v1 OPENAI_API_KEY=stub.
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+# How long a stalled call hangs before answering; far beyond any client deadline
+STALL_SECONDS = 60.0
+
+# First matching rule wins; anything else is classified as a student
+_RULES = [
+    ("vendor", ("provide", "services", "supplier", "supply", "agency", "clients", "distributor", "sell to")),
+    ("mentor", ("mentor", "invest in", "investor looking", "angel", "expertise", "teach", "guide", "advise")),
+    ("working professional", ("job", "career", "freelanc", "promotion", "switch roles", "engineer at", "network")),
+    ("founder", ("startup", "co-founder", "cofounder", "founder", "business", "funding", "investors", "launch", "building")),
+    ("student", ("student", "learn", "internship", "college", "study", "university")),
+]
+
+_REASONS = {200: "OK", 404: "Not Found", 500: "Internal Server Error"}
+
+def classify(text: str) -> Tuple[str, float]:
+    """Role plus a made-up model probability: high on a keyword match, low for the fallback"""
+    text = text.lower()
+    for role, keywords in _RULES:
+        if any(keyword in text for keyword in keywords):
+            return role, 0.95
+    return "student", 0.55
+
+# Profile tags (app.services.profile_tagger.PROFILE_TAGS) by keyword, for JSON-mode replies
+_TAG_KEYWORDS = {
+    "fintech": ("fintech", "payments", "banking", "lending"),
+    "edtech": ("edtech", "education", "learning platform"),
+    "healthtech": ("health", "medical", "clinic"),
+    "ai": (" ai", "machine learning", "ml ", "llm"),
+    "saas": ("saas", "b2b software"),
+    "ecommerce": ("ecommerce", "e-commerce", "marketplace"),
+    "marketing": ("marketing", "growth", "seo"),
+    "design": ("design", "ui", "ux"),
+    "engineering": ("engineer", "developer", "coding", "backend", "frontend"),
+    "fundraising": ("fundrais", "investors", "seed round", "funding"),
+    "hiring": ("hiring", "recruit", "team"),
+    "mentorship": ("mentor", "guidance", "advice"),
+    "internships": ("internship",),
+}
+
+def _tags(text: str) -> List[str]:
+    text = f" {text.lower()} "
+    return [tag for tag, keywords in _TAG_KEYWORDS.items() if any(k in text for k in keywords)][:5]
+
+def _logprobs(content: str, probability: float) -> Dict:
+    """OpenAI-style per-token logprobs; the first token carries all the uncertainty"""
+    tokens = content.split(" ")
+    tokens = [tokens[0]] + [f" {token}" for token in tokens[1:]]
+    return {"content": [
+        {"token": token, "logprob": math.log(probability) if i == 0 else 0.0, "bytes": None, "top_logprobs": []}
+        for i, token in enumerate(tokens)
+    ]}
+
+class OpenAIStub:
+    """In-process stub server with configurable latency and error injection"""
+
+    def __init__(self, latency: float = 0.2, jitter: float = 0.0, error_rate: float = 0.0,
+                 stall_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.stall_rate = stall_rate
+        self.calls = 0
+        self.errors = 0
+        self.stalls = 0
+        self._rng = random.Random(seed)
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._connections = set()
+        self._closed: Optional[asyncio.Event] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start listening and return the base URL to give the OpenAI client"""
+        self._closed = asyncio.Event()
+        self._server = await asyncio.start_server(self._handle, host, port)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://{host}:{port}/v1"
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            # Hang up on kept-alive clients and release stalled calls so their handlers finish before the loop stops
+            self._closed.set()
+            for writer in list(self._connections):
+                writer.close()
+            await self._server.wait_closed()
+            while self._connections:
+                await asyncio.sleep(0.01)
+            self._server = None
+
+    async def _respond(self, method: str, path: str, body: bytes) -> Tuple[int, Dict]:
+        if method != "POST" or not path.rstrip("/").endswith("/chat/completions"):
+            return 404, {"error": {"message": f"No route for {method} {path}", "type": "invalid_request_error"}}
+
+        self.calls += 1
+        request = json.loads(body or b"{}")
+        roll = self._rng.random()
+        if roll < self.stall_rate:
+            self.stalls += 1
+            try:
+                await asyncio.wait_for(self._closed.wait(), STALL_SECONDS)
+                raise ConnectionError("Stub closed during a stalled call")
+            except asyncio.TimeoutError:
+                pass
+        await asyncio.sleep(self.latency + self._rng.uniform(0, self.jitter))
+        if self.stall_rate <= roll < self.stall_rate + self.error_rate:
+            self.errors += 1
+            return 500, {"error": {"message": "Injected stub error", "type": "server_error"}}
+
+        messages = request.get("messages", [])
+        user_input = next((m["content"] for m in reversed(messages) if m.get("role") == "user"), "")
+        role, probability = classify(user_input)
+        json_mode = (request.get("response_format") or {}).get("type") == "json_object"
+        content = json.dumps({"role": role, "tags": _tags(user_input)}) if json_mode else role
+        return 200, {
+            "id": f"chatcmpl-stub-{self.calls}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "logprobs": _logprobs(content, probability) if request.get("logprobs") else None,
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 1, "total_tokens": 1}
+        }
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Minimal HTTP/1.1 with keep-alive, enough for httpx"""
+        self._connections.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                status, payload = await self._respond(method, path, body)
+                data = json.dumps(payload).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+async def _serve(args):
+    stub = OpenAIStub(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, stall_rate=args.stall_rate)
+    base_url = await stub.start(args.host, args.port)
+    print(f"OpenAI stub listening on {base_url} (latency {args.latency}s, "
+          f"error rate {args.error_rate:.0%}, stall rate {args.stall_rate:.0%})")
+    await asyncio.Event().wait()
+
+def main():
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per completion")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random latency, up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls answered with a 500")
+    parser.add_argument("--stall-rate", type=float, default=0.0, help=f"fraction of calls held for {STALL_SECONDS:.0f}s")
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Synthetic landing-table rows for the role list endpoint benchmarks.
+
+Rows are shaped like Supabase returns them for the five role Response
+schemas: every field filled with plausible values, timestamps as ISO
+strings with an offset.
+"""
+import random
+import typing
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+from app.schemas.founder import FounderResponse
+from app.schemas.mentor import MentorResponse
+from app.schemas.student import StudentResponse
+from app.schemas.vendor import VendorResponse
+from app.schemas.working_professional import WorkingProfessionalResponse
+
+# (list endpoint, Response schema) per role
+ROLE_ENDPOINTS = {
+    "students": ("/api/students/", StudentResponse),
+    "founders": ("/api/founders/", FounderResponse),
+    "mentors": ("/api/mentors/", MentorResponse),
+    "vendors": ("/api/vendors/", VendorResponse),
+    "working_professionals": ("/api/working-professionals/", WorkingProfessionalResponse),
+}
+
+_WORDS = ["Product", "Tech", "Marketing", "Design", "Operations", "Fintech", "Edtech", "SaaS", "Seed", "Series A"]
+_CITIES = ["Bangalore", "Mumbai", "Delhi", "Pune", "Hyderabad", "Chennai"]
+_EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+def _value(name: str, annotation, i: int, rng: random.Random):
+    origin = typing.get_origin(annotation)
+    if origin is typing.Union:
+        annotation = next(a for a in typing.get_args(annotation) if a is not type(None))
+        origin = typing.get_origin(annotation)
+    if origin in (list, List):
+        return rng.sample(_WORDS, rng.randint(1, 4))
+    if annotation is datetime:
+        return (_EPOCH + timedelta(minutes=i * 7)).isoformat()
+    if name == "phone":
+        return 9000000000 + i if annotation is int else str(9000000000 + i)
+    if annotation is int:
+        return rng.randint(1, 20)
+    if name == "email":
+        return f"user{i}@example.com"
+    if name == "user_id":
+        return f"user-{i:07d}"
+    if name.endswith("url") or name in ("linkedin", "url"):
+        return f"https://example.com/{name}/{i}"
+    if name == "city":
+        return rng.choice(_CITIES)
+    if name in ("description", "extra_text"):
+        return " ".join(rng.choice(_WORDS) for _ in range(25))
+    return f"{name.replace('_', ' ').title()} {i}"
+
+def synthetic_rows(model, count: int, seed: int = 0) -> List[Dict]:
+    """count database-shaped rows that validate against model"""
+    rng = random.Random(seed)
+    fields = model.model_fields
+    return [{name: _value(name, field.annotation, i, rng) for name, field in fields.items()} for i in range(count)]
@@ -0,0 +1,63 @@
+"""Synthetic world-scale location hierarchy for the location benchmarks.
+
+Real datasets are not shipped with the repo, so this generates a deterministic
+hierarchy with roughly the shape of a full world dataset (about 250 countries,
+4,000 states and 150,000 cities) on top of the built-in default data. Each
+synthetic city gets coordinates scattered around its state and country, so
+cities cluster the way real ones do.
+"""
+import random
+
+_SYLLABLES = [
+    "ba", "na", "lo", "re", "pur", "ga", "ha", "di", "ko", "ta", "san", "mar", "vel",
+    "ri", "do", "shi", "ka", "ma", "la", "ne", "bad", "gar", "ton", "ville", "burg",
+    "sa", "o", "pa", "ulo", "mu", "ra", "ja", "chen", "li", "an", "zhou", "de", "é",
+]
+
+def _name(rng: random.Random, parts: int) -> str:
+    return "".join(rng.choice(_SYLLABLES) for _ in range(parts)).title()
+
+def build_world_locations(countries: int = 250, states_per_country: int = 16,
+                          cities: int = 150_000, seed: int = 7) -> dict:
+    """Return a hierarchy in the same shape as app/data/locations.json"""
+    from app.services.location_service import LocationService
+
+    rng = random.Random(seed)
+    data = LocationService.__new__(LocationService)._get_default_location_data()
+
+    country_names = list(data["countries"])
+    while len(country_names) < countries:
+        name = _name(rng, rng.randint(2, 4))
+        if name not in country_names:
+            country_names.append(name)
+    data["countries"] = country_names
+
+    state_names = [s for states in data["states"].values() for s in states]
+    for country in country_names:
+        if country in data["states"]:
+            continue
+        states = [f"{_name(rng, rng.randint(2, 3))} {rng.choice(['', 'North', 'East'])}".strip()
+                  for _ in range(states_per_country)]
+        data["states"][country] = states
+        state_names.extend(states)
+
+    # Separate generator so names stay the same whatever the coordinate scheme
+    geo_rng = random.Random(seed + 1)
+    state_centers = {}
+    for country, states in data["states"].items():
+        lat, lon = geo_rng.uniform(-50, 65), geo_rng.uniform(-180, 180)
+        for state in states:
+            state_centers[state] = (lat + geo_rng.uniform(-6, 6), lon + geo_rng.uniform(-6, 6))
+
+    remaining = cities - sum(len(c) for c in data["cities"].values())
+    for i in range(remaining):
+        state = state_names[i % len(state_names)]
+        words = rng.choice((1, 1, 1, 2))
+        city = " ".join(_name(rng, rng.randint(2, 4)) for _ in range(words))
+        data["cities"].setdefault(state, []).append(city)
+        lat, lon = state_centers[state]
+        data["coordinates"].setdefault(state, {}).setdefault(city, [
+            round(max(-89.9, min(89.9, lat + geo_rng.uniform(-1.5, 1.5))), 4),
+            round((lon + geo_rng.uniform(-1.5, 1.5) + 180) % 360 - 180, 4)
+        ])
+    return data
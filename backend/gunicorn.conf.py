@@ -0,0 +1,51 @@
+"""
+Production server: gunicorn supervising uvicorn workers (app.core.server).
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+One worker per CPU unless SERVER_WORKERS (or WEB_CONCURRENCY) says
+otherwise; the other SERVER_* settings are in app/core/config.py. Workers
+are recycled after SERVER_MAX_REQUESTS and replaced when they die. SIGTERM
+(pm2 stop/restart) drains: workers stop accepting, finish in-flight
+requests for up to SERVER_GRACEFUL_TIMEOUT seconds, then exit. The app is
+preloaded in the arbiter, so new code needs a full restart, not a SIGHUP. For
+development use `python -m app.main` (auto-reload) instead.
+"""
+import importlib
+import multiprocessing
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.core.config import settings
+
+bind = f"{settings.HOST}:{settings.PORT}"
+workers = settings.SERVER_WORKERS or multiprocessing.cpu_count()
+worker_class = "app.core.server.ProductionWorker"
+
+backlog = settings.SERVER_BACKLOG
+keepalive = settings.SERVER_KEEPALIVE
+max_requests = settings.SERVER_MAX_REQUESTS
+max_requests_jitter = settings.SERVER_MAX_REQUESTS_JITTER
+graceful_timeout = settings.SERVER_GRACEFUL_TIMEOUT
+timeout = settings.SERVER_TIMEOUT
+
+# Import the app once in the arbiter and fork workers from it: new and recycled workers
+# start in milliseconds. SDK clients are created per worker, after the fork (app/main.py lifespan).
+# The arbiter keeps the code it started with, so SIGHUP (pm2 reload) forks workers running the
+# old code: deploy new code by restarting the arbiter (pm2 restart), see DEPLOYMENT_GUIDE.md.
+preload_app = True
+
+def on_starting(server):
+    # SDKs every worker loads during warm-up (app/core/startup.py); importing them here
+    # once, before the fork, shares them and keeps worker boots and recycling cheap
+    for module in ("openai", "supabase", "firebase_admin"):
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+
+# Requests are logged by PerformanceMiddleware
+accesslog = None
+errorlog = "-"
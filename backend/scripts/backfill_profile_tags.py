@@ -0,0 +1,337 @@
+"""Back-fill AI role and interest tags from profile free text.
+
+Streams rows from the landing tables (student extra_text, founder
+description and elevator_pitch, mentor focus_areas) in user_id order,
+classifies them through a bounded pool of async workers sharing a rate
+limit, and writes results back in bulk with the apply_profile_tags function
+(SUPABASE_PROFILE_TAGS.sql). Run from the backend directory:
+
+    python -m scripts.backfill_profile_tags [--tables landing_founders ...] [--concurrency 16] [--rate 10]
+
+Progress is checkpointed after every bulk write: an interrupted run picks up
+where it stopped (--restart ignores the checkpoint). Rows already tagged are
+skipped unless --retag. Rows whose classification failed are listed in the
+checkpoint; --retry-failed classifies just those again and drops the ones
+that succeed from the list. Offline, with the local stub model
+(python -m benchmarks.openai_stub) and JSONL files instead of Supabase:
+
+    python -m scripts.backfill_profile_tags --base-url http://127.0.0.1:8100/v1 \\
+        --input rows.jsonl --output tags.jsonl
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set
+
+from app.core.config import settings
+from app.services.profile_tagger import PROFILE_TEXT_FIELDS, ProfileTagger, RateLimiter, profile_text
+
+DEFAULT_CHECKPOINT = "profile_tags.checkpoint.json"
+
+# user_ids per fetch_rows call in --retry-failed (they go into the query string)
+RETRY_FETCH_SIZE = 100
+
+class SupabaseProfileStore:
+    """Pages rows from and bulk-writes tags to Supabase. The client is synchronous; called from threads."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def fetch_page(self, table: str, fields: List[str], after: Optional[str], limit: int, retag: bool) -> List[Dict]:
+        query = self.client.table(table).select(",".join(["user_id"] + fields))
+        if after is not None:
+            query = query.gt("user_id", after)
+        if not retag:
+            query = query.is_("ai_tagged_at", "null")
+        return query.order("user_id").limit(limit).execute().data or []
+
+    def fetch_rows(self, table: str, fields: List[str], user_ids: List[str]) -> List[Dict]:
+        return self.client.table(table).select(",".join(["user_id"] + fields)).in_("user_id", user_ids).execute().data or []
+
+    def write(self, table: str, rows: List[Dict]):
+        self.client.rpc("apply_profile_tags", {"target": table, "tags": rows}).execute()
+
+class JsonlProfileStore:
+    """Offline stand-in for Supabase: rows from a JSONL file ({"table", "user_id", ...fields}), tags appended to another"""
+
+    def __init__(self, input_path: str, output_path: str):
+        self.output_path = output_path
+        self._rows: Dict[str, List[Dict]] = {}
+        with open(input_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    row = json.loads(line)
+                    self._rows.setdefault(row["table"], []).append(row)
+        for rows in self._rows.values():
+            rows.sort(key=lambda row: row["user_id"])
+
+    def fetch_page(self, table: str, fields: List[str], after: Optional[str], limit: int, retag: bool) -> List[Dict]:
+        rows = self._rows.get(table, [])
+        start = 0
+        if after is not None:
+            while start < len(rows) and rows[start]["user_id"] <= after:
+                start += 1
+        return rows[start:start + limit]
+
+    def fetch_rows(self, table: str, fields: List[str], user_ids: List[str]) -> List[Dict]:
+        wanted = set(user_ids)
+        return [row for row in self._rows.get(table, []) if row["user_id"] in wanted]
+
+    def write(self, table: str, rows: List[Dict]):
+        with open(self.output_path, "a", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps({"table": table, **row}, ensure_ascii=False) + "\n")
+
+class Checkpoint:
+    """
+    Per-table resume point, saved atomically. `after` only moves past a
+    user_id once it and every row before it are resolved (written, skipped
+    or failed), so a resumed run never misses a row; rows written after the
+    last save are classified again.
+    """
+
+    def __init__(self, path: str, restart: bool = False):
+        self.path = path
+        self.data = {"tables": {}}
+        if not restart and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.data = json.load(f)
+
+    def _table(self, table: str) -> Dict:
+        return self.data["tables"].setdefault(table, {"after": None, "finished": False, "failed": []})
+
+    def after(self, table: str) -> Optional[str]:
+        return self._table(table)["after"]
+
+    def finished(self, table: str) -> bool:
+        return self._table(table)["finished"]
+
+    def advance(self, table: str, user_id: str):
+        self._table(table)["after"] = user_id
+
+    def failed(self, table: str) -> List[str]:
+        return list(self._table(table)["failed"])
+
+    def fail(self, table: str, user_id: str):
+        if user_id not in self._table(table)["failed"]:
+            self._table(table)["failed"].append(user_id)
+
+    def clear_failed(self, table: str, user_ids: List[str]):
+        cleared = set(user_ids)
+        state = self._table(table)
+        state["failed"] = [user_id for user_id in state["failed"] if user_id not in cleared]
+
+    def finish(self, table: str):
+        self._table(table)["finished"] = True
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+class _TableProgress:
+    """user_ids dispatched in scan order, and which of them are resolved"""
+
+    def __init__(self):
+        self.pending: Deque[str] = deque()
+        self.resolved: Set[str] = set()
+        self.exhausted = False
+
+    def watermark(self) -> Optional[str]:
+        """Pop the resolved prefix and return its last user_id"""
+        last = None
+        while self.pending and self.pending[0] in self.resolved:
+            last = self.pending.popleft()
+            self.resolved.discard(last)
+        return last
+
+async def backfill(store, tagger: ProfileTagger, checkpoint: Checkpoint, tables: List[str], concurrency: int = 16,
+                   batch_size: int = 100, page_size: int = 500, retag: bool = False, report_every: float = 5.0,
+                   retry_failed: bool = False) -> Dict:
+    """
+    Run the back-fill over tables; returns the counters. With retry_failed only
+    the rows the checkpoint lists as failed are classified, and the resume
+    points are left alone.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+    progress = {table: _TableProgress() for table in tables}
+    buffers: Dict[str, List[Dict]] = {table: [] for table in tables}
+    write_lock = asyncio.Lock()
+    stats = {"rows": 0, "tagged": 0, "skipped": 0, "failed": 0, "written": 0}
+    start = time.perf_counter()
+
+    def resolve(table: str, user_ids: List[str]):
+        if retry_failed:
+            checkpoint.clear_failed(table, user_ids)
+            return
+        progress[table].resolved.update(user_ids)
+        last = progress[table].watermark()
+        if last is not None:
+            checkpoint.advance(table, last)
+
+    async def flush(table: str):
+        async with write_lock:
+            rows, buffers[table] = buffers[table], []
+            if rows:
+                # A failed write stops the job; the checkpoint still points before these rows
+                await asyncio.to_thread(store.write, table, rows)
+                stats["written"] += len(rows)
+                resolve(table, [row["user_id"] for row in rows])
+            if progress[table].exhausted and not progress[table].pending:
+                checkpoint.finish(table)
+            checkpoint.save()
+
+    async def produce_failed():
+        for table in tables:
+            fields = PROFILE_TEXT_FIELDS[table]
+            failed = checkpoint.failed(table)
+            for i in range(0, len(failed), RETRY_FETCH_SIZE):
+                user_ids = failed[i:i + RETRY_FETCH_SIZE]
+                rows = await asyncio.to_thread(store.fetch_rows, table, fields, user_ids)
+                # Rows deleted since, or without text now, have nothing left to tag
+                found = {row["user_id"] for row in rows}
+                resolve(table, [user_id for user_id in user_ids if user_id not in found])
+                for row in rows:
+                    stats["rows"] += 1
+                    text = profile_text(row, fields)
+                    if text:
+                        await queue.put((table, row["user_id"], text))
+                    else:
+                        stats["skipped"] += 1
+                        resolve(table, [row["user_id"]])
+        for _ in range(concurrency):
+            await queue.put(None)
+
+    async def produce():
+        for table in tables:
+            if checkpoint.finished(table):
+                continue
+            fields = PROFILE_TEXT_FIELDS[table]
+            after = checkpoint.after(table)
+            while True:
+                page = await asyncio.to_thread(store.fetch_page, table, fields, after, page_size, retag)
+                if not page:
+                    break
+                for row in page:
+                    user_id = row["user_id"]
+                    progress[table].pending.append(user_id)
+                    stats["rows"] += 1
+                    text = profile_text(row, fields)
+                    if text:
+                        await queue.put((table, user_id, text))
+                    else:
+                        stats["skipped"] += 1
+                        resolve(table, [user_id])
+                after = page[-1]["user_id"]
+            progress[table].exhausted = True
+        for _ in range(concurrency):
+            await queue.put(None)
+
+    async def work():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            table, user_id, text = item
+            try:
+                result = await tagger.tag(text)
+            except Exception as e:
+                stats["failed"] += 1
+                print(f"Error tagging {table} {user_id}, leaving it untagged: {e}")
+                if not retry_failed:
+                    checkpoint.fail(table, user_id)
+                    resolve(table, [user_id])
+                continue
+            stats["tagged"] += 1
+            buffers[table].append({"user_id": user_id, "ai_role": result["role"], "ai_tags": result["tags"]})
+            if len(buffers[table]) >= batch_size:
+                await flush(table)
+
+    async def report():
+        while True:
+            await asyncio.sleep(report_every)
+            elapsed = time.perf_counter() - start
+            print(f"{stats['rows']:,} rows read, {stats['tagged']:,} tagged, {stats['written']:,} written, "
+                  f"{stats['failed']:,} failed, {stats['tagged'] / elapsed:.1f} rows/s")
+
+    reporter = asyncio.create_task(report())
+    try:
+        await asyncio.gather(produce_failed() if retry_failed else produce(), *(work() for _ in range(concurrency)))
+        for table in tables:
+            await flush(table)
+    finally:
+        reporter.cancel()
+
+    elapsed = time.perf_counter() - start
+    return {
+        **stats,
+        **tagger.stats,
+        "still_failed": sum(len(checkpoint.failed(table)) for table in tables),
+        "seconds": round(elapsed, 2),
+        "rows_per_second": round(stats["tagged"] / elapsed, 1) if elapsed else 0.0,
+    }
+
+def _build_store(args):
+    if args.input:
+        return JsonlProfileStore(args.input, args.output)
+    from app.services.supabase_service import supabase_service
+    if not supabase_service.supabase:
+        raise SystemExit("Supabase is not configured (SUPABASE_SERVICE_ROLE_KEY); use --input/--output to run offline")
+    return SupabaseProfileStore(supabase_service.supabase)
+
+def _build_client(args, concurrency: int):
+    import httpx
+    from openai import AsyncOpenAI
+    api_key = settings.OPENAI_API_KEY or ("stub" if args.base_url else None)
+    if not api_key:
+        raise SystemExit("OPENAI_API_KEY is not set (or pass --base-url for a local stub)")
+    return AsyncOpenAI(
+        api_key=api_key,
+        base_url=args.base_url,
+        # ProfileTagger retries with backoff itself
+        max_retries=0,
+        http_client=httpx.AsyncClient(limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency))
+    )
+
+async def _run(args) -> Dict:
+    store = _build_store(args)
+    client = _build_client(args, args.concurrency)
+    tagger = ProfileTagger(client, args.model, RateLimiter(args.rate), timeout=args.timeout, max_retries=args.retries)
+    checkpoint = Checkpoint(args.checkpoint, restart=args.restart)
+    try:
+        return await backfill(store, tagger, checkpoint, args.tables, args.concurrency, args.batch_size,
+                              args.page_size, args.retag, retry_failed=args.retry_failed)
+    finally:
+        await client.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tables", nargs="+", default=list(PROFILE_TEXT_FIELDS), choices=list(PROFILE_TEXT_FIELDS))
+    parser.add_argument("--concurrency", type=int, default=16, help="model calls in flight")
+    parser.add_argument("--rate", type=float, default=10.0, help="model calls per second, retries included")
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=10.0, help="seconds per model call")
+    parser.add_argument("--batch-size", type=int, default=100, help="rows per bulk update")
+    parser.add_argument("--page-size", type=int, default=500, help="rows per read")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT)
+    parser.add_argument("--restart", action="store_true", help="ignore the existing checkpoint")
+    parser.add_argument("--retag", action="store_true", help="also re-classify rows that already have tags")
+    parser.add_argument("--retry-failed", action="store_true", help="only classify the rows the checkpoint lists as failed")
+    parser.add_argument("--model", default=settings.AI_SEARCH_MODEL)
+    parser.add_argument("--base-url", default=settings.OPENAI_BASE_URL, help="OpenAI-compatible endpoint")
+    parser.add_argument("--input", help="read rows from this JSONL file instead of Supabase")
+    parser.add_argument("--output", default="profile_tags.jsonl", help="with --input, append tags here")
+    args = parser.parse_args()
+
+    result = asyncio.run(_run(args))
+    print(f"Done: {result['tagged']:,} of {result['rows']:,} rows tagged ({result['skipped']:,} without text, "
+          f"{result['failed']:,} failed) in {result['seconds']:.1f}s, {result['rows_per_second']:.1f} rows/s; "
+          f"{result['calls']:,} model calls, {result['retries']:,} retries; "
+          f"{result['still_failed']:,} rows listed as failed in {args.checkpoint}")
+
+if __name__ == "__main__":
+    main()
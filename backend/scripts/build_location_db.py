@@ -0,0 +1,42 @@
+"""Compile a locations.json hierarchy into the memory-mapped location store.
+
+Run from the backend directory:
+
+    python -m scripts.build_location_db [--input app/data/locations.json] [--output app/data/locations.db]
+
+Without an input file the built-in default data is compiled. The API opens
+the output (settings.LOCATION_DB_PATH) instead of the JSON when it exists.
+"""
+import argparse
+import json
+import os
+import time
+
+from app.core.config import settings
+from app.services.location_store import LocationStore, build_location_db
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--input", default=settings.LOCATION_DATA_PATH, help="locations.json to compile")
+    parser.add_argument("--output", default=settings.LOCATION_DB_PATH, help="where to write the store")
+    args = parser.parse_args()
+
+    if os.path.exists(args.input):
+        with open(args.input, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    else:
+        from app.services.location_service import LocationService
+        print(f"{args.input} not found, compiling the built-in default data")
+        data = LocationService.__new__(LocationService)._get_default_location_data()
+
+    start = time.perf_counter()
+    build_location_db(data, args.output)
+    elapsed = time.perf_counter() - start
+
+    store = LocationStore(args.output)
+    print(f"Wrote {args.output}: {len(store):,} locations, version {store.version}, "
+          f"{os.path.getsize(args.output) / 1e6:.1f}MB in {elapsed:.1f}s")
+    store.close()
+
+if __name__ == "__main__":
+    main()
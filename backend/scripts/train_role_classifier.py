@@ -0,0 +1,97 @@
+"""Train the local role classifier that answers confident AI search inputs without OpenAI.
+
+Run from the backend directory:
+
+    python -m scripts.train_role_classifier [--examples app/data/role_examples.jsonl]
+        [--traffic ai_search_log.jsonl ...] [--output app/data/role_classifier.json]
+
+Examples are JSONL rows of {"user_input": ..., "role": ...}. Traffic files are
+the AI_SEARCH_LOG_PATH logs of OpenAI classifications; rows below
+--min-confidence are skipped. The API loads the output
+(settings.AI_CLASSIFIER_PATH) at startup.
+"""
+import argparse
+import json
+import os
+import random
+import time
+from typing import List, Tuple
+
+from app.core.config import settings
+from app.services.ai_search_cache import normalize_input
+from app.services.ai_search_service import ROLE_URLS
+from app.services.role_classifier import train_role_classifier
+
+DEFAULT_EXAMPLES = os.path.join(os.path.dirname(__file__), "..", "app", "data", "role_examples.jsonl")
+
+THRESHOLDS = (0.5, 0.6, 0.7, 0.75, 0.8, 0.9)
+
+def read_examples(path: str, min_confidence: float = 0.0) -> List[Tuple[str, str]]:
+    examples = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            if row.get("role") not in ROLE_URLS:
+                continue
+            if row.get("confidence") is not None and row["confidence"] < min_confidence:
+                continue
+            examples.append((row["user_input"], row["role"]))
+    return examples
+
+def cross_validate(examples: List[Tuple[str, str]], roles: List[str], folds: int, **params):
+    """Held-out (probability, correct) pairs from k-fold cross-validation"""
+    shuffled = list(examples)
+    random.Random(0).shuffle(shuffled)
+    scored = []
+    for fold in range(folds):
+        held_out = shuffled[fold::folds]
+        training = [e for i, e in enumerate(shuffled) if i % folds != fold]
+        model = train_role_classifier(training, roles, **params)
+        for text, role in held_out:
+            predicted, probability = model.predict(text)
+            scored.append((probability, predicted == role))
+    return scored
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--examples", default=DEFAULT_EXAMPLES, help="labelled examples (JSONL)")
+    parser.add_argument("--traffic", nargs="*", default=[], help="logged OpenAI classifications (JSONL)")
+    parser.add_argument("--min-confidence", type=float, default=0.8, help="skip logged rows below this confidence")
+    parser.add_argument("--output", default=settings.AI_CLASSIFIER_PATH, help="where to write the model")
+    parser.add_argument("--folds", type=int, default=5, help="cross-validation folds for the report (0 skips it)")
+    parser.add_argument("--epochs", type=int, default=500)
+    parser.add_argument("--learning-rate", type=float, default=4.0)
+    parser.add_argument("--l2", type=float, default=1e-4)
+    args = parser.parse_args()
+
+    examples = read_examples(args.examples)
+    for path in args.traffic:
+        examples.extend(read_examples(path, args.min_confidence))
+    # Traffic repeats popular inputs; keep one label per normalised input (the latest)
+    examples = list({normalize_input(text): (text, role) for text, role in examples}.values())
+    roles = list(ROLE_URLS)
+    params = {"epochs": args.epochs, "learning_rate": args.learning_rate, "l2": args.l2}
+    counts = ", ".join(f"{role}: {sum(1 for _, r in examples if r == role)}" for role in roles)
+    print(f"{len(examples)} examples ({counts})")
+
+    if args.folds > 1:
+        scored = cross_validate(examples, roles, args.folds, **params)
+        print(f"\n{args.folds}-fold cross-validation, accuracy {sum(c for _, c in scored) / len(scored):.1%}")
+        print(f"{'threshold':>10} {'answered':>9} {'accuracy':>9}")
+        for threshold in THRESHOLDS:
+            answered = [correct for probability, correct in scored if probability >= threshold]
+            accuracy = sum(answered) / len(answered) if answered else 0.0
+            print(f"{threshold:>10.2f} {len(answered) / len(scored):>9.1%} {accuracy:>9.1%}")
+        print(f"(serving threshold is AI_CLASSIFIER_THRESHOLD={settings.AI_CLASSIFIER_THRESHOLD})\n")
+
+    start = time.perf_counter()
+    model = train_role_classifier(examples, roles, **params)
+    elapsed = time.perf_counter() - start
+    model.save(args.output)
+    print(f"Wrote {os.path.normpath(args.output)}: {len(model.idf):,} features, "
+          f"{os.path.getsize(args.output) / 1e3:.0f}KB, trained in {elapsed:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -18,7 +18,8 @@ module.exports = {
       name: 'backend',
       cwd: './backend',
       script: 'python',
-      args: '-m uvicorn app.main:app --host 0.0.0.0 --port 8000',
+      // Workers, keep-alive and recycling are set in backend/gunicorn.conf.py
+      args: '-m gunicorn -c gunicorn.conf.py app.main:app',
       env: {
         PYTHONPATH: './backend',
         VIRTUAL_ENV: './backend/venv'
@@ -27,6 +28,8 @@ module.exports = {
       autorestart: true,
       watch: false,
       max_memory_restart: '1G',
+      // Longer than SERVER_GRACEFUL_TIMEOUT, so in-flight requests drain before PM2 kills the arbiter
+      kill_timeout: 35000,
       interpreter: './venv/bin/python'
     }
   ]
@@ -12,7 +12,7 @@ else
     
     # Kill existing processes
     pkill -f "next dev"
-    pkill -f "uvicorn"
+    pkill -f "gunicorn"
     
     # Start frontend
     cd frontend
@@ -21,7 +21,7 @@ else
     
     # Start backend
     cd ../backend
-    nohup python -m uvicorn app.main:app --host 0.0.0.0 --port 8000 > ../backend.log 2>&1 &
+    nohup python -m gunicorn -c gunicorn.conf.py app.main:app > ../backend.log 2>&1 &
     echo "✅ Backend restarted"
 fi
 
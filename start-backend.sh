@@ -7,4 +7,4 @@ cd /home/ubuntu/cofounder-circle-app/backend
 source venv/bin/activate
 
 # Start the backend
-python -m uvicorn app.main:app --host 0.0.0.0 --port 8000 
\ No newline at end of file
+python -m gunicorn -c gunicorn.conf.py app.main:app 
\ No newline at end of file